@@ -0,0 +1,50 @@
+"""
+Compares the address types supported by `dictparser` when walking wide and
+deep synthetic layouts. Both the time of a full walk and the memory retained
+by the collected addresses are reported.
+
+Run it as a script:
+
+    python benchmarks/bench_address.py
+"""
+import tracemalloc
+from timeit import repeat
+
+from sigmaepsilon.deepdict import Address, dictparser
+
+from bench_traversal import wide_tree, deep_tree
+
+ADDRESS_TYPES = [list, tuple, Address]
+
+
+def walk_time(d: dict, address_type: type, number: int = 3) -> float:
+    def walk():
+        for _ in dictparser(d, address_type=address_type):
+            pass
+
+    return min(repeat(walk, number=number, repeat=3)) / number
+
+
+def retained_memory(d: dict, address_type: type) -> int:
+    tracemalloc.start()
+    addresses = [addr for addr, _ in dictparser(d, address_type=address_type)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del addresses
+    return size
+
+
+def run(label: str, d: dict) -> None:
+    print(label)
+    for address_type in ADDRESS_TYPES:
+        t = walk_time(d, address_type)
+        m = retained_memory(d, address_type) / 2**20
+        print(
+            f"  {address_type.__name__:<8} walk: {t:8.4f} s  "
+            f"retained by the addresses: {m:8.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
+    run("deep tree (100k leaves, depth up to 500)", deep_tree())
@@ -0,0 +1,59 @@
+"""
+Measures how long the event loop is blocked while iterating a large layout,
+with `values` and with `avalues`, along with the total time of the iteration.
+
+Run it as a script:
+
+    python benchmarks/bench_async.py
+"""
+import asyncio
+import time
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+async def blocked(iterate) -> tuple[float, float]:
+    """Returns the total time and the longest gap between two ticks of the loop."""
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await iterate()
+    total = time.perf_counter() - start
+    # lets the ticker record the last gap
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    task.cancel()
+    return total, max(gaps)
+
+
+def run(label: str, d: dict) -> None:
+    dd = DeepDict.wrap(d)
+
+    async def sync():
+        for _ in dd.values(deep=True):
+            pass
+
+    async def asynchronous():
+        async for _ in dd.avalues(deep=True):
+            pass
+
+    print(label)
+    for name, f in (("values", sync), ("avalues", asynchronous)):
+        total, gap = asyncio.run(blocked(f))
+        print(f"  {name:<8} {total:8.4f} s, blocked for {gap * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
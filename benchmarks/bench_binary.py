@@ -0,0 +1,45 @@
+"""
+Compares the binary format of `DeepDict.dump` and `DeepDict.load` with `pickle`
+on a large layout, including the partial load of a single subtree.
+
+Run it as a script:
+
+    python benchmarks/bench_binary.py
+"""
+import io
+import pickle
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+def dumped(dd: DeepDict) -> bytes:
+    file = io.BytesIO()
+    dd.dump(file)
+    return file.getvalue()
+
+
+def run(label: str, d: dict, number: int = 1) -> None:
+    dd = DeepDict.wrap(d)
+    pickled = pickle.dumps(dd, protocol=5)
+    binary = dumped(dd)
+    print(label)
+    print(f"  {'size pickle':<14} {len(pickled) / 2**20:8.2f} MB")
+    print(f"  {'size binary':<14} {len(binary) / 2**20:8.2f} MB")
+
+    cases = [
+        ("dump pickle", lambda: pickle.dumps(dd, protocol=5)),
+        ("dump binary", lambda: dumped(dd)),
+        ("load pickle", lambda: pickle.loads(pickled)),
+        ("load binary", lambda: DeepDict.load(io.BytesIO(binary))),
+        ("load subtree", lambda: DeepDict.load(io.BytesIO(binary), [50, 50])),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<14} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
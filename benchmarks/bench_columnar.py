@@ -0,0 +1,63 @@
+"""
+Compares a `ColumnarTable` with a `DeepDict` holding one nested `DeepDict` per
+record, in terms of memory, reading a field across all the records and
+accessing a single field of a record.
+
+Run it as a script:
+
+    python benchmarks/bench_columnar.py
+"""
+import tracemalloc
+from timeit import repeat
+
+import numpy as np
+
+from sigmaepsilon.deepdict import DeepDict, ColumnarTable
+
+
+def elements(n: int) -> dict:
+    return {i: {"E": 210.0, "nu": 0.3, "A": float(i)} for i in range(n)}
+
+
+def allocated(f) -> tuple:
+    tracemalloc.start()
+    result = f()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def run(n: int, number: int = 3) -> None:
+    d = elements(n)
+    nested, nested_size = allocated(lambda: DeepDict.wrap({"elements": d}))
+    columnar, columnar_size = allocated(
+        lambda: DeepDict(elements=ColumnarTable.from_records(d))
+    )
+
+    print(f"{n} records with 3 fields")
+    print(f"  {'memory nested':<18} {nested_size / 2**20:8.2f} MB")
+    print(f"  {'memory columnar':<18} {columnar_size / 2**20:8.2f} MB")
+
+    cases = [
+        (
+            "column nested",
+            lambda: np.array([r["A"] for r in nested["elements"].values()]),
+        ),
+        ("column columnar", lambda: columnar["elements"].column("A")),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<18} {t * 1e3:8.3f} ms")
+
+    i = n // 2
+    cases = [
+        ("get nested", lambda: nested["elements", i, "A"]),
+        ("get columnar", lambda: columnar["elements", i, "A"]),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=10_000, repeat=3)) / 10_000
+        print(f"  {name:<18} {t * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    run(100_000)
@@ -0,0 +1,43 @@
+"""
+Compares `DeepDict.is_leaf` and `DeepDict.containers` with the scans over
+all the values of the earlier versions of the library, on wide nodes with
+tens of thousands of scalar entries and a few nested dictionaries.
+
+Run it as a script:
+
+    python benchmarks/bench_containers.py
+"""
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict, parsedicts
+
+
+def wide_nodes(width: int = 50_000, branches: int = 5, depth: int = 3) -> dict:
+    """Nodes with `width` scalars and `branches` nested dictionaries on every level."""
+    d = {f"leaf{i}": float(i) for i in range(width)}
+    if depth > 0:
+        for b in range(branches):
+            d[f"branch{b}"] = wide_nodes(width // 10, branches, depth - 1)
+    return d
+
+
+def legacy_is_leaf(dd: DeepDict) -> bool:
+    return not any(list([isinstance(v, DeepDict) for v in dd.values()]))
+
+
+def run(label: str, d: dict, number: int = 10) -> None:
+    dd = DeepDict.wrap(d)
+    cases = [
+        ("legacy is_leaf", lambda: legacy_is_leaf(dd)),
+        ("is_leaf", lambda: dd.is_leaf()),
+        ("legacy containers", lambda: list(parsedicts(dd, dtype=DeepDict))),
+        ("containers", lambda: list(dd.containers())),
+    ]
+    print(label)
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<18} {t * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    run("wide nodes (50k scalars on the top level, 5 branches, depth 3)", wide_nodes())
@@ -0,0 +1,48 @@
+"""
+Compares sending the changes of a large layout as the operations returned by
+`DeepDict.diff` with sending the whole pickled layout, in size and in time.
+
+Run it as a script:
+
+    python benchmarks/bench_diff.py
+"""
+import copy
+import pickle
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+def run(label: str, d: dict, changes: int = 100, number: int = 1) -> None:
+    a = DeepDict.wrap(d)
+    b = DeepDict.wrap(copy.deepcopy(d))
+    for i in range(changes):
+        b[0, i, 0] = -1.0
+
+    # a layout that shares all but the changed subtree with `b`, the subtrees
+    # are inserted directly to keep them in `b`
+    c = DeepDict.wrap(d)
+    for i in range(1, 100):
+        dict.__setitem__(c, i, b[i])
+    ops = a.diff(b)
+    print(label)
+    print(f"  {'operations':<16} {len(ops):8d}")
+    print(f"  {'size pickle':<16} {len(pickle.dumps(b)) / 2**20:8.2f} MB")
+    print(f"  {'size diff':<16} {len(pickle.dumps(ops)) / 2**10:8.2f} kB")
+
+    cases = [
+        ("pickle.dumps", lambda: pickle.dumps(b)),
+        ("diff", lambda: a.diff(b)),
+        ("diff shared", lambda: c.diff(b)),
+        ("wrap", lambda: DeepDict.wrap(d)),
+        ("wrap + patch", lambda: DeepDict.wrap(d).patch(ops)),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<16} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3), 100 changes", wide_tree(100, 2))
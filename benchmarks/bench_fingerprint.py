@@ -0,0 +1,51 @@
+"""
+Measures `DeepDict.fingerprint` on a large layout when it is computed from
+scratch, when nothing has changed and after a single change, and the cost
+of cached fingerprints on item assignment.
+
+Run it as a script:
+
+    python benchmarks/bench_fingerprint.py
+"""
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+def cold(dd: DeepDict) -> str:
+    for c in dd.containers(inclusive=True):
+        c._fingerprint = None
+    return dd.fingerprint()
+
+
+def changed(dd: DeepDict) -> str:
+    dd[50, 50, 50] += 1.0
+    return dd.fingerprint()
+
+
+def run(label: str, d: dict, number: int = 1) -> None:
+    dd = DeepDict.wrap(d)
+    plain = DeepDict.wrap(d)
+    dd.fingerprint()
+
+    def assign(dd: DeepDict) -> None:
+        for i in range(10_000):
+            dd[50, 50, 50] = float(i)
+
+    cases = [
+        ("cold", lambda: cold(dd), number),
+        ("unchanged", lambda: dd.fingerprint(), 10_000),
+        ("one change", lambda: changed(dd), 100),
+        ("assign", lambda: assign(plain), 10),
+        ("assign cached", lambda: assign(dd), 10),
+    ]
+    print(label)
+    for name, f, n in cases:
+        t = min(repeat(f, number=n, repeat=3)) / n
+        print(f"  {name:<14} {t * 1000:10.4f} ms")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
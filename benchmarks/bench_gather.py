@@ -0,0 +1,53 @@
+"""
+Compares `DeepDict.gather` and `DeepDict.scatter` with collecting the numeric
+leaves into a list before converting it into a NumPy array, and with writing
+the values back one by one with item assignment.
+
+Run it as a script:
+
+    python benchmarks/bench_gather.py
+"""
+from timeit import repeat
+
+import numpy as np
+
+from sigmaepsilon.deepdict import DeepDict
+
+
+def model(n: int = 100_000) -> dict:
+    """`n` elements with a few numeric and non-numeric parameters each."""
+    return {
+        "elements": {
+            i: {"E": 210.0, "nu": 0.3, "A": float(i), "label": f"e{i}"}
+            for i in range(n)
+        }
+    }
+
+
+def legacy_gather(dd: DeepDict) -> tuple:
+    items = list(dd.items(deep=True, return_address=True, vtype=float))
+    return np.array([v for _, v in items]), [a for a, _ in items]
+
+
+def legacy_scatter(dd: DeepDict, data: np.ndarray, addresses: list) -> None:
+    for address, value in zip(addresses, data):
+        dd[address] = value
+
+
+def run(label: str, d: dict, number: int = 3) -> None:
+    dd = DeepDict.wrap(d)
+    data, addresses = dd.gather()
+    cases = [
+        ("list + np.array", lambda: legacy_gather(dd)),
+        ("gather", lambda: dd.gather()),
+        ("item assignment", lambda: legacy_scatter(dd, data, addresses)),
+        ("scatter", lambda: dd.scatter(data, addresses)),
+    ]
+    print(label)
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<16} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run("100k elements, 300k numeric leaves", model())
@@ -0,0 +1,87 @@
+"""
+Compares the loop-based multi-level access of `DeepDict` with the recursive
+implementation of the earlier versions of the library on 2-, 8- and 64-level
+addresses.
+
+Run it as a script:
+
+    python benchmarks/bench_getitem.py
+"""
+from timeit import repeat
+from typing import Hashable
+
+from sigmaepsilon.deepdict import DeepDict, Key
+from sigmaepsilon.deepdict.utils import _issequence
+
+
+class LegacyDeepDict(DeepDict):
+    """
+    A `DeepDict` with the recursive multi-level access of earlier versions.
+    """
+
+    def __getitem__(self, key, /):
+        if isinstance(key, Key) or not _issequence(key):
+            _key = key.wrapped if isinstance(key, Key) else key
+            return dict.__getitem__(self, _key)
+        else:
+            item = self.__getitem__(key[0])
+            if len(key) > 1:
+                return item.__getitem__(key[1:])
+            else:
+                return item
+
+    def __setitem__(self, key, value, /):
+        if isinstance(key, Key) or not _issequence(key):
+            super().__setitem__(key, value)
+        elif len(key) == 1:
+            self.__setitem__(key[0], value)
+        else:
+            host = self.__missing__(key[0]) if key[0] not in self else self[key[0]]
+            host.__setitem__(key[1:], value)
+
+    def __contains__(self, item, /):
+        if not _issequence(item):
+            return super().__contains__(item)
+
+        obj = self
+        for subitem in item:
+            if not isinstance(subitem, Hashable):
+                raise TypeError(f"{subitem} is not hashable")
+            else:
+                if obj.__contains__(subitem):
+                    obj = obj.__getitem__(subitem)
+                else:
+                    return False
+        return True
+
+
+def bench(cls: type, depth: int, number: int = 20000) -> tuple[float, float, float]:
+    address = tuple(f"level{i}" for i in range(depth))
+    dd = cls()
+    dd[address] = 0
+
+    def get():
+        return dd[address]
+
+    def set():
+        dd[address] = 1
+
+    def contains():
+        return address in dd
+
+    return tuple(
+        min(repeat(f, number=number, repeat=5)) / number * 1e6
+        for f in (get, set, contains)
+    )
+
+
+if __name__ == "__main__":
+    for depth in (2, 8, 64):
+        old = bench(LegacyDeepDict, depth)
+        new = bench(DeepDict, depth)
+        print(f"{depth}-level address (microseconds per call)")
+        for i, name in enumerate(("__getitem__", "__setitem__", "__contains__")):
+            print(
+                f"  {name:<13} legacy: {old[i]:8.2f}  loop: {new[i]:8.2f}  "
+                f"speedup: {old[i] / new[i]:5.2f}x"
+            )
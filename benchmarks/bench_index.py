@@ -0,0 +1,62 @@
+"""
+Compares multi-level access and prefix queries on an indexed `DeepDict`
+with the same operations on a plain one, and shows the cost of building
+the index and of keeping it up to date on the write path.
+
+Run it as a script:
+
+    python benchmarks/bench_index.py
+"""
+from timeit import repeat, timeit
+
+from sigmaepsilon.deepdict import DeepDict, dictparser
+
+from bench_traversal import deep_tree
+
+
+def run(depth: int, number: int = 100_000) -> None:
+    d = deep_tree(depth=depth, width=10, chains=20)
+    plain = DeepDict.wrap(d)
+    indexed = DeepDict.wrap(d)
+    t_build = timeit(indexed.enable_index, number=1)
+
+    address = (0,) + ("next",) * (depth - 1) + ("leaf5",)
+    prefix = (0,) + ("next",) * (depth // 2)
+    print(f"{depth}-level chains ({len(indexed.index)} addresses)")
+    print(f"  {'enable_index':<18} {t_build:8.4f} s")
+
+    cases = [
+        ("get plain", lambda: plain[address]),
+        ("get indexed", lambda: indexed[address]),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<18} {t * 1e6:8.3f} us")
+
+    def scan() -> list:
+        n = len(prefix)
+        return [item for item in dictparser(plain) if tuple(item[0][:n]) == prefix]
+
+    cases = [
+        ("prefix scan", scan),
+        ("prefix indexed", lambda: list(indexed.index.under(prefix))),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=3, repeat=3)) / 3
+        print(f"  {name:<18} {t * 1e3:8.3f} ms")
+
+    def write(dd: DeepDict) -> None:
+        dd[address] = 1.0
+
+    cases = [
+        ("set plain", lambda: write(plain)),
+        ("set indexed", lambda: write(indexed)),
+    ]
+    for name, f in cases:
+        t = min(repeat(f, number=number // 10, repeat=3)) / (number // 10)
+        print(f"  {name:<18} {t * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    for depth in (2, 8, 64):
+        run(depth)
@@ -0,0 +1,44 @@
+"""
+Compares taking a checkpoint of a large layout after a few edits with the
+changes recorded by a journal, with `DeepDict.diff` against the previous
+checkpoint and with pickling the whole layout, along with the cost of the
+journal on item assignment.
+
+Run it as a script:
+
+    python benchmarks/bench_journal.py
+"""
+import pickle
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+def run(label: str, d: dict, edits: int = 100, number: int = 1) -> None:
+    dd = DeepDict.wrap(d)
+    checkpoint = pickle.loads(pickle.dumps(dd))
+    plain = DeepDict.wrap(d)
+    journal = dd.enable_journal()
+
+    def edit(dd: DeepDict) -> None:
+        for i in range(edits):
+            dd[i % 100, i, 0] = -1.0
+
+    edit(dd)
+    cases = [
+        ("journal", lambda: journal.changes(), number),
+        ("diff", lambda: checkpoint.diff(dd), number),
+        ("pickle", lambda: pickle.dumps(dd), number),
+        ("assign", lambda: edit(plain), 100),
+        ("assign journal", lambda: edit(dd), 100),
+    ]
+    print(label)
+    for name, f, n in cases:
+        t = min(repeat(f, number=n, repeat=3)) / n
+        print(f"  {name:<14} {t * 1000:10.4f} ms")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3), 100 edits", wide_tree(100, 2))
@@ -0,0 +1,65 @@
+"""
+Compares the streaming JSON loader with `json.load` followed by `DeepDict.wrap`
+and the streaming writers with `json.dumps`, both in time and in peak memory,
+which is where the approaches differ most.
+
+Run it as a script:
+
+    python benchmarks/bench_jsonstream.py
+"""
+import json
+import os
+import tempfile
+import tracemalloc
+from timeit import repeat
+from typing import Callable
+
+from sigmaepsilon.deepdict import DeepDict, loadjson, dumpjson, dumpndjson
+
+from bench_traversal import wide_tree
+
+
+def peak(f: Callable) -> float:
+    tracemalloc.start()
+    f()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def json_and_wrap(path: str) -> DeepDict:
+    with open(path, "r", encoding="utf-8") as file:
+        return DeepDict.wrap(json.load(file))
+
+
+def json_dumps(dd: DeepDict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(dd))
+
+
+def run(label: str, d: dict, number: int = 1) -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "data.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(d, file)
+        print(label)
+        print(f"  {'size':<14} {os.path.getsize(path) / 2**20:8.2f} MB")
+
+        cases = [
+            ("json + wrap", lambda: json_and_wrap(path)),
+            ("loadjson", lambda: loadjson(path)),
+        ]
+        dd = loadjson(path)
+        out = os.path.join(folder, "out.json")
+        cases += [
+            ("json.dumps", lambda: json_dumps(dd, out)),
+            ("dumpjson", lambda: dumpjson(dd, out)),
+            ("dumpndjson", lambda: dumpndjson(dd, out)),
+        ]
+        for name, f in cases:
+            t = min(repeat(f, number=number, repeat=3)) / number
+            print(f"  {name:<14} {t:8.4f} s {peak(f):8.2f} MB (peak)")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
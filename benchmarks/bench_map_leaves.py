@@ -0,0 +1,60 @@
+"""
+Compares `DeepDict.map_leaves` with mapping the leaves one by one through their
+addresses, with a cheap function in the calling thread and with an expensive
+function on a pool of processes.
+
+Run it as a script:
+
+    python benchmarks/bench_map_leaves.py
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict, dictparser
+
+from bench_traversal import wide_tree
+
+
+def cheap(x: float) -> float:
+    return x + 1.0
+
+
+def expensive(x: float) -> float:
+    return sum(math.sin(x + i) for i in range(200))
+
+
+def legacy_map(dd: DeepDict, func) -> None:
+    for address, value in list(dictparser(dd, address_type=tuple)):
+        dd[address] = func(value)
+
+
+def run(label: str, d: dict, func, number: int = 1, executor=None) -> None:
+    dd = DeepDict.wrap(d)
+    cases = [
+        ("item assignment", lambda: legacy_map(dd, func)),
+        ("map_leaves", lambda: dd.map_leaves(func)),
+    ]
+    if executor is not None:
+        cases.append(
+            (
+                "map_leaves pool",
+                lambda: dd.map_leaves(func, executor=executor, chunksize=4096),
+            )
+        )
+    print(label)
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<16} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run("cheap function, 1M leaves", wide_tree(100, 2), cheap)
+    with ProcessPoolExecutor(os.cpu_count()) as executor:
+        run(
+            f"expensive function, 100k leaves, {os.cpu_count()} processes",
+            wide_tree(10, 4),
+            expensive,
+            executor=executor,
+        )
@@ -0,0 +1,40 @@
+"""
+Compares pickling a `DeepDict` through the flat node table with the item by
+item reconstruction of the earlier versions of the library, with protocol 5.
+
+Run it as a script:
+
+    python benchmarks/bench_pickle.py
+"""
+import pickle
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+class LegacyDeepDict(DeepDict):
+    """
+    A `DeepDict` with the pickling of earlier versions.
+    """
+
+    def __reduce__(self):
+        return self.__class__, tuple(), None, None, self.items()
+
+
+def run(label: str, d: dict, number: int = 1) -> None:
+    print(label)
+    for name, cls in (("legacy", LegacyDeepDict), ("node table", DeepDict)):
+        dd = cls.wrap(d)
+        data = pickle.dumps(dd, protocol=5)
+        t_dump = min(repeat(lambda: pickle.dumps(dd, protocol=5), number=number, repeat=3))
+        t_load = min(repeat(lambda: pickle.loads(data), number=number, repeat=3))
+        print(
+            f"  {name:<12} dumps {t_dump / number:8.4f} s, "
+            f"loads {t_load / number:8.4f} s, {len(data) / 2**20:6.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
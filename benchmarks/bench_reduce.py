@@ -0,0 +1,43 @@
+"""
+Compares `DeepDict.reduce` with a single pass of `values(deep=True)`, in the
+calling thread, on a thread pool, which is not expected to be faster, and on a
+pool of processes. The time it takes
+to pickle the parts is the share of the work with a process pool that is left
+in the calling process.
+
+Run it as a script:
+
+    python benchmarks/bench_reduce.py
+"""
+import operator
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import reduce
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+def run(label: str, d: dict, number: int = 1) -> None:
+    dd = DeepDict.wrap(d)
+    add = operator.add
+    with ThreadPoolExecutor() as threads, ProcessPoolExecutor() as processes:
+        cases = [
+            ("values", lambda: reduce(add, dd.values(deep=True, vtype=float), 0)),
+            ("serial", lambda: dd.reduce(add, 0, vtype=float)),
+            ("parallel", lambda: dd.reduce(add, 0, vtype=float, parallel=True)),
+            ("threads", lambda: dd.reduce(add, 0, vtype=float, executor=threads)),
+            ("processes", lambda: dd.reduce(add, 0, vtype=float, executor=processes)),
+            ("pickle parts", lambda: [pickle.dumps(part) for part in dd.values()]),
+        ]
+        print(label)
+        for name, f in cases:
+            t = min(repeat(f, number=number, repeat=3)) / number
+            print(f"  {name:<12} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run(f"sum of 1M leaves, {os.cpu_count()} cores", wide_tree(100, 2))
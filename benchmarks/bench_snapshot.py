@@ -0,0 +1,66 @@
+"""
+Compares taking a frozen copy of a large layout with `copy.deepcopy` and
+with `DeepDict.snapshot`, the memory the snapshot needs after a few edits
+of the live layout and the cost of the snapshots on item assignment, also
+when the snapshots are taken of another layout.
+
+Run it as a script:
+
+    python benchmarks/bench_snapshot.py
+"""
+from copy import deepcopy
+from timeit import repeat
+import tracemalloc
+
+from sigmaepsilon.deepdict import DeepDict, Snapshot
+
+from bench_traversal import wide_tree
+
+
+def run(label: str, d: dict, edits: int = 100, number: int = 1) -> None:
+    dd = DeepDict.wrap(d)
+    plain = DeepDict.wrap(d)
+
+    def edit(dd: DeepDict) -> None:
+        for i in range(edits):
+            dd[i % 100, i, 0] = -1.0
+
+    def snapshot_and_edit() -> Snapshot:
+        snapshot = dd.snapshot()
+        edit(dd)
+        return snapshot
+
+    def snapshot_other_and_edit() -> Snapshot:
+        snapshot = dd.snapshot()
+        edit(plain)
+        return snapshot
+
+    cases = [
+        ("deepcopy", lambda: deepcopy(dd), number),
+        ("snapshot", lambda: dd.snapshot(), 1000),
+        ("assign", lambda: edit(plain), 100),
+        ("snapshot + assign", snapshot_and_edit, 100),
+        ("other + assign", snapshot_other_and_edit, 100),
+    ]
+    print(label)
+    for name, f, n in cases:
+        t = min(repeat(f, number=n, repeat=3)) / n
+        print(f"  {name:<18} {t * 1000:10.4f} ms")
+
+    tracemalloc.start()
+    snapshot = snapshot_and_edit()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del snapshot
+    print(f"  {'snapshot memory':<18} {size / 2**20:10.4f} MB")
+
+    tracemalloc.start()
+    frozen = deepcopy(dd)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del frozen
+    print(f"  {'deepcopy memory':<18} {size / 2**20:10.4f} MB")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3), 100 edits", wide_tree(100, 2))
@@ -0,0 +1,43 @@
+"""
+Shows that opening a `SqliteDeepDict` doesn't depend on the size of the stored
+layout, and compares the access of leaves in hot and cold nodes.
+
+Run it as a script:
+
+    python benchmarks/bench_store.py
+"""
+import os
+import tempfile
+from timeit import repeat, timeit
+
+from sigmaepsilon.deepdict import SqliteDeepDict
+
+from bench_traversal import wide_tree
+
+
+def run(width: int, path: str) -> None:
+    with SqliteDeepDict(path) as dd:
+        t_write = timeit(lambda: dd.__setitem__("data", wide_tree(width, 2)), number=1)
+
+    size = os.path.getsize(path) / 2**20
+    print(f"{width ** 3} leaves, {size:.1f} MB on disk")
+    print(f"  {'write':<12} {t_write:10.4f} s")
+
+    t = min(repeat(lambda: SqliteDeepDict(path).close(), number=10, repeat=3)) / 10
+    print(f"  {'open':<12} {t * 1e3:10.4f} ms")
+
+    with SqliteDeepDict(path, cache_size=16) as dd:
+        hot = ("data", 0, 0, 0)
+        dd[hot]
+        t = min(repeat(lambda: dd[hot], number=10_000, repeat=3)) / 10_000
+        print(f"  {'get hot':<12} {t * 1e6:10.3f} us")
+
+        cold = [("data", i, j, 0) for i in range(width) for j in range(width)]
+        t = timeit(lambda: [dd[a] for a in cold], number=1) / len(cold)
+        print(f"  {'get cold':<12} {t * 1e6:10.3f} us")
+
+
+if __name__ == "__main__":
+    for width in (20, 50, 100):
+        with tempfile.TemporaryDirectory() as folder:
+            run(width, os.path.join(folder, "store.db"))
@@ -0,0 +1,86 @@
+"""
+Compares the recursive traversal of the earlier versions of the library
+with the iterative traversal engine of `sigmaepsilon.deepdict.utils` on
+wide and deep synthetic layouts.
+
+Run it as a script:
+
+    python benchmarks/bench_traversal.py
+"""
+from copy import copy
+from timeit import repeat
+
+from sigmaepsilon.deepdict import dictparser, parseitems, parsedicts
+
+
+def legacy_dictparser(d: dict, *, dtype=dict, **_kw):
+    address = _kw.get("_addr", [])
+    for key, value in d.items():
+        subaddress = copy(address)
+        subaddress.append(key)
+        if isinstance(value, dtype):
+            for data in legacy_dictparser(value, dtype=dtype, _addr=subaddress):
+                yield data
+        else:
+            yield subaddress, value
+
+
+def legacy_parseitems(d: dict, *, dtype=dict):
+    for key, value in d.items():
+        if isinstance(value, dtype):
+            for data in legacy_parseitems(value, dtype=dtype):
+                yield data
+        else:
+            yield key, value
+
+
+def legacy_parsedicts(d: dict, *, inclusive=True, dtype=dict, deep=True):
+    if inclusive:
+        if isinstance(d, dtype):
+            yield d
+
+    for value in d.values():
+        if isinstance(value, dtype):
+            yield value
+            if deep:
+                for subvalue in legacy_parsedicts(value, inclusive=False, dtype=dtype):
+                    yield subvalue
+
+
+def wide_tree(width: int = 100, depth: int = 3) -> dict:
+    """A balanced tree with `width ** depth` leaves."""
+    if depth == 0:
+        return {i: float(i) for i in range(width)}
+    return {i: wide_tree(width, depth - 1) for i in range(width)}
+
+
+def deep_tree(depth: int = 500, width: int = 10, chains: int = 20) -> dict:
+    """`chains` chains of nested dictionaries with `width` leaves on every level."""
+    d = {}
+    for c in range(chains):
+        node = d[c] = {}
+        for level in range(depth):
+            node.update({f"leaf{i}": float(i) for i in range(width)})
+            node = node.setdefault("next", {})
+    return d
+
+
+def run(label: str, d: dict, number: int = 3) -> None:
+    cases = [
+        ("dictparser", legacy_dictparser, dictparser),
+        ("parseitems", legacy_parseitems, parseitems),
+        ("parsedicts", legacy_parsedicts, parsedicts),
+    ]
+    print(label)
+    for name, old, new in cases:
+        t_old = min(repeat(lambda: sum(1 for _ in old(d)), number=number, repeat=3))
+        t_new = min(repeat(lambda: sum(1 for _ in new(d)), number=number, repeat=3))
+        print(
+            f"  {name:<12} recursive: {t_old / number:8.4f} s  "
+            f"iterative: {t_new / number:8.4f} s  speedup: {t_old / t_new:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    run("wide tree (100 x 100 x 100 leaves, depth 3)", wide_tree(100, 2))
+    run("deep tree (20 chains, 500 levels, 10 leaves per level)", deep_tree())
@@ -0,0 +1,62 @@
+"""
+Compares deep iteration filtered by the type of the values on a `DeepDict`
+with a leaf type index with the same on a plain one, on layouts where only
+a small fraction of the leaves match.
+
+Run it as a script:
+
+    python benchmarks/bench_type_index.py
+"""
+from timeit import repeat, timeit
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree
+
+
+class Array(list):
+    """Stands for the few array-like leaves of a model tree."""
+
+
+def model_tree(width: int, depth: int, every: int) -> dict:
+    """A balanced tree of floats, with every `every`-th leaf being an `Array`."""
+    d = wide_tree(width, depth)
+    stack = [d]
+    counter = 0
+    while stack:
+        node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict):
+                stack.append(value)
+            else:
+                counter += 1
+                if counter % every == 0:
+                    node[key] = Array([value])
+    return d
+
+
+def run(label: str, d: dict, number: int = 3) -> None:
+    plain = DeepDict.wrap(d)
+    indexed = DeepDict.wrap(d)
+    t_build = timeit(indexed.enable_type_index, number=1)
+
+    cases = [
+        ("plain", lambda: list(plain.values(deep=True, vtype=Array))),
+        ("indexed", lambda: list(indexed.values(deep=True, vtype=Array))),
+    ]
+    print(label)
+    print(f"  {'enable_type_index':<18} {t_build:8.4f} s")
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<18} {t:8.4f} s")
+
+    # once an item is set, the matching leaves are sorted into depth-first order
+    indexed[0, 0, 0] = Array([0.0])
+    f = cases[1][1]
+    t = min(repeat(f, number=number, repeat=3)) / number
+    print(f"  {'indexed, edited':<18} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run("1M leaves, 1% arrays", model_tree(100, 2, 100))
+    run("1M leaves, 0.01% arrays", model_tree(100, 2, 10_000))
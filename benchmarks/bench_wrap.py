@@ -0,0 +1,48 @@
+"""
+Compares the bulk construction of `DeepDict.wrap` with the recursive,
+item-by-item construction of the earlier versions of the library. The time
+of `json.loads` on the same layout is shown for reference.
+
+Run it as a script:
+
+    python benchmarks/bench_wrap.py
+"""
+import json
+from timeit import repeat
+
+from sigmaepsilon.deepdict import DeepDict
+
+from bench_traversal import wide_tree, deep_tree
+
+
+def legacy_wrap(data: dict, wrapper: type, **_kw) -> DeepDict:
+    result = _kw.get("_result", None)
+    if result is None:
+        result = wrapper()
+
+    for key, value in data.items():
+        if isinstance(value, dict):
+            result[key] = wrapper()
+            legacy_wrap(value, wrapper, _result=result[key])
+        else:
+            result[key] = value
+
+    return result
+
+
+def run(label: str, d: dict, number: int = 1) -> None:
+    text = json.dumps(d)
+    cases = [
+        ("json.loads", lambda: json.loads(text)),
+        ("legacy wrap", lambda: legacy_wrap(d, DeepDict)),
+        ("DeepDict.wrap", lambda: DeepDict.wrap(d)),
+    ]
+    print(label)
+    for name, f in cases:
+        t = min(repeat(f, number=number, repeat=3)) / number
+        print(f"  {name:<14} {t:8.4f} s")
+
+
+if __name__ == "__main__":
+    run("wide tree (1M leaves, depth 3)", wide_tree(100, 2))
+    run("deep tree (100k leaves, depth up to 500)", deep_tree())
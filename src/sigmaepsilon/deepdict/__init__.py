@@ -4,7 +4,14 @@ from importlib.metadata import metadata
 from sigmaepsilon.core.config import namespace_package_name
 
 from .deepdict import DeepDict, Key, Value
+from .index import AddressIndex, LeafTypeIndex
+from .journal import Journal
+from .snapshot import Snapshot
+from .columnar import ColumnarTable, ColumnarRecord
+from .store import SqliteDeepDict
+from .jsonstream import loadjson, loadndjson, dumpjson, dumpndjson
 from .utils import (
+    Address,
     dictparser,
     parseaddress,
     parsedicts,
@@ -17,6 +24,18 @@ __all__ = [
     "DeepDict",
     "Key",
     "Value",
+    "Address",
+    "AddressIndex",
+    "LeafTypeIndex",
+    "Journal",
+    "Snapshot",
+    "ColumnarTable",
+    "ColumnarRecord",
+    "SqliteDeepDict",
+    "loadjson",
+    "loadndjson",
+    "dumpjson",
+    "dumpndjson",
     "dictparser",
     "parseaddress",
     "parseitems",
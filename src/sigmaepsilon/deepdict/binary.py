@@ -0,0 +1,194 @@
+"""
+A binary file format for `DeepDict` instances, that can be loaded fast and
+supports loading a part of the layout without deserializing the rest of it.
+
+The file starts with a fixed size header, that holds the offset and the size
+of the node table at the end of the file. Every nested dictionary of the layout
+is a node, stored as a separate pickled block after the header, in depth-first
+order. The node table holds the parent, the key and the location of the block
+of every node, along with the end of its subtree in the table, hence the blocks
+of a subtree form a contiguous region of the file.
+"""
+from typing import Any, Hashable, Sequence, BinaryIO
+from os import PathLike
+import pickle
+import struct
+
+from .deepdict import DeepDict, Key
+from .utils import _issequence
+
+__all__ = ["dump", "load"]
+
+
+MAGIC = b"DEEPDICT"
+VERSION = 1
+
+# magic, version, offset and size of the node table
+_HEADER = struct.Struct("<8sHQQ")
+
+
+def _children(node: DeepDict) -> tuple[list, list, list]:
+    """
+    Returns the items of a node, where the values of nested nodes are
+    `None` and the positions of nested nodes are collected separately.
+    """
+    lazy = node._lazy
+    keys, values, children = [], [], []
+    for i, (key, value) in enumerate(dict.items(node)):
+        keys.append(key)
+        if isinstance(value, DeepDict) or (lazy is not None and key in lazy):
+            children.append((i, value))
+            values.append(None)
+        else:
+            values.append(value)
+    return keys, values, children
+
+
+def dump(dd: DeepDict, file: str | PathLike | BinaryIO) -> None:
+    """
+    Writes a `DeepDict` to a file in binary format.
+
+    Parameters
+    ----------
+    dd: DeepDict
+        The dictionary to write.
+    file: str or PathLike or BinaryIO
+        A path or a file object opened for writing in binary mode.
+    """
+    if not hasattr(file, "write"):
+        with open(file, "wb") as f:
+            return dump(dd, f)
+
+    start = file.tell()
+    file.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+    offset = _HEADER.size
+
+    # parent, key, offset, size and end of the subtree of every node
+    table = []
+    stack = [(dd, -1, None)]
+    while stack:
+        node, parent, key = stack.pop()
+        index = len(table)
+        keys, values, children = _children(node)
+        block = pickle.dumps(
+            (keys, values, [i for i, _ in children], node._name, node._locked),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        file.write(block)
+        table.append([parent, key, offset, len(block), index + 1])
+        offset += len(block)
+
+        # pushed in reverse order, so they are visited in the order of the items
+        for i, child in reversed(children):
+            if not isinstance(child, DeepDict):
+                # a pending dictionary of a lazily wrapped instance
+                child = DeepDict._wrap_lazy(child)
+            stack.append((child, index, keys[i]))
+
+    for index in range(len(table) - 1, 0, -1):
+        parent = table[index][0]
+        table[parent][4] = max(table[parent][4], table[index][4])
+
+    data = pickle.dumps([tuple(row) for row in table], protocol=pickle.HIGHEST_PROTOCOL)
+    file.write(data)
+    end = file.tell()
+    file.seek(start)
+    file.write(_HEADER.pack(MAGIC, VERSION, offset, len(data)))
+    file.seek(end)
+
+
+def _read_table(file: BinaryIO) -> tuple[int, list[tuple]]:
+    start = file.tell()
+    magic, version, offset, size = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("The file is not a DeepDict file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported version: {version}")
+    file.seek(start + offset)
+    return start, pickle.loads(file.read(size))
+
+
+def _build(cls: type, blocks: list[tuple], table: list[tuple], first: int) -> DeepDict:
+    """
+    Builds the nodes `first`, `first + 1`, ... from their blocks.
+    """
+    nodes = [cls() for _ in blocks]
+    children = [[] for _ in blocks]
+    for index in range(first + 1, first + len(blocks)):
+        children[table[index][0] - first].append(index - first)
+
+    setitem = dict.__setitem__
+    for node, block, nested in zip(nodes, blocks, children):
+        keys, values, positions, name, locked = block
+        node._name = name
+        node._locked = locked
+        nested = iter(nested)
+        positions = set(positions)
+        for i, (key, value) in enumerate(zip(keys, values)):
+            if i in positions:
+                node._attach(key, nodes[next(nested)])
+            else:
+                setitem(node, key, value)
+
+    return nodes[0]
+
+
+def load(
+    file: str | PathLike | BinaryIO,
+    address: Sequence[Hashable] | None = None,
+    *,
+    cls: type = DeepDict,
+) -> DeepDict | Any:
+    """
+    Loads a `DeepDict` from a file written by :func:`dump`. If an address is
+    provided, only the item at the address is loaded. Nested dictionaries are
+    returned as new instances without a parent.
+
+    Parameters
+    ----------
+    file: str or PathLike or BinaryIO
+        A path or a file object opened for reading in binary mode.
+    address: Sequence[Hashable], Optional
+        The address of the item to load. Default is None, in which case
+        everything is loaded.
+    cls: type, Optional
+        The class of the created instances. Default is `DeepDict`.
+    """
+    if not hasattr(file, "read"):
+        with open(file, "rb") as f:
+            return load(f, address, cls=cls)
+
+    start, table = _read_table(file)
+
+    index = 0
+    if address is not None:
+        if isinstance(address, Key):
+            address = [address.wrapped]
+        elif not _issequence(address):
+            address = [address]
+        nodes = {(row[0], row[1]): i for i, row in enumerate(table) if i > 0}
+        for i, key in enumerate(address):
+            child = nodes.get((index, key))
+            if child is None:
+                if i < len(address) - 1:
+                    raise KeyError(tuple(address))
+                # the address might point to a leaf
+                _, _, offset, size, _ = table[index]
+                file.seek(start + offset)
+                keys, values, *_ = pickle.loads(file.read(size))
+                for k, v in zip(keys, values):
+                    if k == key:
+                        return v
+                raise KeyError(tuple(address))
+            index = child
+
+    end = table[index][4]
+    offset = table[index][2]
+    last = table[end - 1]
+    file.seek(start + offset)
+    data = memoryview(file.read(last[2] + last[3] - offset))
+    blocks = []
+    for _, _, block_offset, size, _ in table[index:end]:
+        position = block_offset - offset
+        blocks.append(pickle.loads(data[position : position + size]))
+    return _build(cls, blocks, table, index)
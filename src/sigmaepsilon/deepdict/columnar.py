@@ -0,0 +1,237 @@
+from typing import Any, Hashable, Iterable, Iterator, Mapping as MappingType
+from collections.abc import Mapping
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = ["ColumnarTable", "ColumnarRecord"]
+
+
+def _scalar(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ColumnarTable(Mapping):
+    """
+    A table of records with the same fields, where every field is stored as a
+    NumPy column. It is a compact replacement for a `DeepDict` with many child
+    dictionaries of the same layout, and it plugs into the addressing of a
+    `DeepDict`: records and their fields can be accessed and set with addresses
+    like `dd["elements", i, "E"]` and they are visited by the deep iteration
+    of the `items`, `values` and `keys` methods.
+
+    The records are returned as lightweight :class:`ColumnarRecord` views.
+    Reading a field across all records is a single array access with
+    :func:`column`. The number of records is fixed upon creation.
+
+    Parameters
+    ----------
+    columns: Mapping[Hashable, Any]
+        The columns of the table, as array-like objects of the same length.
+    keys: Iterable[Hashable], Optional
+        The keys of the records. Default is None, in which case the records
+        are indexed by their position.
+
+    Notes
+    -----
+    This requires the `numpy` package to be installed.
+
+    Example
+    -------
+    >>> from sigmaepsilon.deepdict import DeepDict, ColumnarTable
+    >>> dd = DeepDict()
+    >>> dd["elements"] = ColumnarTable({"E": [210.0, 70.0], "nu": [0.3, 0.33]})
+    >>> dd["elements", 1, "E"]
+    70.0
+    >>> dd["elements", 1, "E"] = 72.0
+    >>> dd["elements"].column("E").tolist()
+    [210.0, 72.0]
+    >>> list(dd.items(deep=True, return_address=True))
+    [(['elements', 0, 'E'], 210.0), (['elements', 0, 'nu'], 0.3), (['elements', 1, 'E'], 72.0), (['elements', 1, 'nu'], 0.33)]
+    """
+
+    __slots__ = ["_columns", "_keys", "_rows", "_size"]
+
+    def __init__(
+        self,
+        columns: MappingType[Hashable, Any],
+        *,
+        keys: Iterable[Hashable] | None = None,
+    ):
+        if np is None:  # pragma: no cover
+            raise ImportError("This requires the 'numpy' package.")
+
+        self._columns = {name: np.asarray(data) for name, data in columns.items()}
+        sizes = {len(data) for data in self._columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All the columns must have the same length.")
+        self._size = sizes.pop() if sizes else 0
+
+        if keys is None:
+            self._keys = None
+            self._rows = None
+        else:
+            self._keys = list(keys)
+            self._rows = {key: row for row, key in enumerate(self._keys)}
+            if len(self._rows) != len(self._keys):
+                raise ValueError("The keys of the records must be unique.")
+            if len(self._keys) != self._size:
+                raise ValueError("There must be as many keys as records.")
+
+    @classmethod
+    def from_records(
+        cls, records: MappingType[Hashable, MappingType[Hashable, Any]]
+    ) -> "ColumnarTable":
+        """
+        Creates a table from a mapping of records, which must all have the
+        same fields. If the keys of the records are the integers from 0 up,
+        the records are indexed by their position.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import ColumnarTable
+        >>> table = ColumnarTable.from_records({"a": {"x": 1}, "b": {"x": 2}})
+        >>> table["b", "x"]
+        2
+        """
+        keys = list(records)
+        values = list(records.values())
+        fields = list(values[0]) if values else []
+        for record in values:
+            if len(record) != len(fields) or any(f not in record for f in fields):
+                raise ValueError("All the records must have the same fields.")
+
+        columns = {f: [record[f] for record in values] for f in fields}
+        positional = keys == list(range(len(keys)))
+        return cls(columns, keys=None if positional else keys)
+
+    @property
+    def fields(self) -> list[Hashable]:
+        """
+        Returns the names of the fields.
+        """
+        return list(self._columns)
+
+    def column(self, field: Hashable) -> "np.ndarray":
+        """
+        Returns the values of a field of all the records as an array. The array
+        is not a copy, changing it changes the table.
+        """
+        return self._columns[field]
+
+    def copy(self) -> "ColumnarTable":
+        """
+        Returns a copy of the table with copies of the columns.
+        """
+        table = self.__class__.__new__(self.__class__)
+        table._columns = {name: data.copy() for name, data in self._columns.items()}
+        table._keys = None if self._keys is None else list(self._keys)
+        table._rows = None if self._rows is None else dict(self._rows)
+        table._size = self._size
+        return table
+
+    def _row(self, key: Hashable) -> int:
+        if self._rows is None:
+            if (
+                isinstance(key, (int, np.integer))
+                and not isinstance(key, bool)
+                and 0 <= key < self._size
+            ):
+                return int(key)
+            raise KeyError(key)
+        return self._rows[key]
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, tuple):
+            if len(key) == 0:
+                raise KeyError(key)
+            record = ColumnarRecord(self, self._row(key[0]))
+            return record[key[1:]] if len(key) > 1 else record
+        return ColumnarRecord(self, self._row(key))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if isinstance(key, tuple):
+            if len(key) == 0:
+                raise KeyError(key)
+            record = ColumnarRecord(self, self._row(key[0]))
+            if len(key) > 1:
+                record[key[1:]] = value
+                return
+        else:
+            record = ColumnarRecord(self, self._row(key))
+
+        if set(value) != set(self._columns):
+            raise ValueError("The fields of the record must match the fields of the table.")
+        for field, data in value.items():
+            record[field] = data
+
+    def __contains__(self, key: Any) -> bool:
+        try:
+            self._row(key)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(range(self._size) if self._keys is None else self._keys)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def to_dict(self) -> dict:
+        """
+        Returns the records as nested standard dictionaries.
+        """
+        fields = {f: c.tolist() for f, c in self._columns.items()}
+        return {
+            key: {f: values[row] for f, values in fields.items()}
+            for row, key in enumerate(self)
+        }
+
+    def __repr__(self) -> str:
+        fields = ", ".join(map(repr, self._columns))
+        return f"{self.__class__.__name__}({self._size} records, fields: {fields})"
+
+
+class ColumnarRecord(Mapping):
+    """
+    A view of a record of a :class:`ColumnarTable`. Setting a field of the view
+    sets the value in the table.
+    """
+
+    __slots__ = ["_table", "_index"]
+
+    def __init__(self, table: ColumnarTable, index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, field: Any) -> Any:
+        if isinstance(field, tuple):
+            if len(field) != 1:
+                raise KeyError(field)
+            field = field[0]
+        return _scalar(self._table._columns[field][self._index])
+
+    def __setitem__(self, field: Any, value: Any) -> None:
+        if isinstance(field, tuple):
+            if len(field) != 1:
+                raise KeyError(field)
+            field = field[0]
+        self._table._columns[field][self._index] = value
+
+    def __contains__(self, field: Any) -> bool:
+        try:
+            return field in self._table._columns
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._table._columns)
+
+    def __len__(self) -> int:
+        return len(self._table._columns)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)})"
@@ -1,12 +1,42 @@
-from typing import Hashable, Any, TypeVar, Generic, Iterator
+from typing import (
+    TYPE_CHECKING,
+    Hashable,
+    Any,
+    TypeVar,
+    Generic,
+    Iterator,
+    Iterable,
+    AsyncIterator,
+    Sequence,
+    Callable,
+)
 from copy import copy as shallow_copy, deepcopy as deep_copy
+from functools import partial
+from concurrent.futures import Executor, ProcessPoolExecutor
+import functools
+import asyncio
+import inspect
+import pickle
+import weakref
+from hashlib import blake2b
 from types import NoneType
 import warnings
 
 from sigmaepsilon.core import Wrapper
 
-from .utils import dictparser, parseitems, parsedicts, _wrap, _issequence
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .utils import Address, dictparser, parseitems, _issequence, _items, _traverse
 from .exceptions import DeepDictLockedError
+from .columnar import ColumnarTable, ColumnarRecord
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .index import AddressIndex, LeafTypeIndex
+    from .journal import Journal
+    from .snapshot import Snapshot
 
 __all__ = ["DeepDict", "Key", "Value"]
 
@@ -16,6 +46,11 @@ _KT = TypeVar("_KT")
 _VT = TypeVar("_VT")
 _VT1 = TypeVar("_VT1")
 
+_MISSING = object()
+
+# the types of values the deep iteration of a DeepDict goes into
+_DEEP_TYPES = (dict, ColumnarTable, ColumnarRecord)
+
 
 class Key(Wrapper):
     """
@@ -26,6 +61,10 @@ class Key(Wrapper):
         super().__init__(wrap=arg)
 
 
+# keys of these types need special treatment when walking an address
+_SPECIAL_KEY_TYPES = (Key, list, tuple, Address)
+
+
 class Value(Wrapper):
     """
     Helper class for values.
@@ -85,13 +124,61 @@ class DeepDict(dict, Generic[_KT, _VT]):
 
     """
 
-    __slots__ = ["_parent", "_locked", "_key", "_name"]
+    __slots__ = [
+        "_parent",
+        "_locked",
+        "_key",
+        "_name",
+        "_loc",
+        "_lock_generation",
+        "_lock_state",
+        "_lazy",
+        "_observers",
+        "_index",
+        "_leaf_index",
+        "_containers",
+        "_fingerprint",
+        "_journal",
+        "_versions",
+        "_cow_epoch",
+        "_snapshot_epochs",
+    ]
+
+    # bumped every time the effective lock state of an existing instance
+    # might change, invalidating all cached lock states
+    _global_lock_generation: int = 0
+
+    # the number of live lists of observers, the write path only looks for
+    # observers if there are any
+    _observed_roots: int = 0
+
+    # the epoch of the last snapshot and the epochs of the live snapshots,
+    # the write path only looks for snapshots if there are any
+    _snapshot_epoch: int = 0
+    _live_snapshots: set = set()
 
     def __init__(self, *args, **kwargs):
         self._parent = None
         self._locked = None
         self._key = None
         self._name = None
+        self._loc = None
+        self._lock_generation = -1
+        self._lock_state = False
+        self._lazy = None
+        self._observers = None
+        self._index = None
+        self._leaf_index = None
+        self._containers = None
+        self._fingerprint = None
+        self._journal = None
+        # epoch -> the items of the instance before its first change after
+        # the snapshot of that epoch
+        self._versions = None
+        self._cow_epoch = DeepDict._snapshot_epoch
+        # the epochs of the snapshots taken of the instance, or of a layout
+        # it was part of when the snapshots were taken
+        self._snapshot_epochs = None
 
         for k, v in kwargs.items():
             if isinstance(v, DeepDict):
@@ -103,6 +190,9 @@ class DeepDict(dict, Generic[_KT, _VT]):
             k: v for k, v in kwargs.items() if not isinstance(v, DeepDict)
         }
         super().__init__(*args, **not_deepdict_kwargs)
+        if args:
+            containers = {k: v for k, v in dict.items(self) if isinstance(v, DeepDict)}
+            self._containers = containers or None
         for k, v in deepdict_kwargs.items():
             self[k] = v
 
@@ -118,10 +208,7 @@ class DeepDict(dict, Generic[_KT, _VT]):
         """
         Returns the top-level object in a nested layout.
         """
-        if self.parent is None:
-            return self
-        else:
-            return self.parent.root
+        return self._location()[1]
 
     @property
     def name(self) -> str | NoneType:
@@ -151,37 +238,117 @@ class DeepDict(dict, Generic[_KT, _VT]):
     @property
     def locked(self) -> bool:
         """
-        Returns `True` if the object is locked. The property is equpped with a setter.
+        Returns `True` if the object is locked. An instance that is not locked or
+        unlocked explicitly inherits the lock state of its parent.
         """
-        if self.parent is None:
-            return self._locked if isinstance(self._locked, bool) else False
-        else:
-            return (
-                self._locked if isinstance(self._locked, bool) else self.parent.locked
-            )
+        if self._lock_generation == DeepDict._global_lock_generation:
+            return self._lock_state
+        return self._resolve_lock()
+
+    def _resolve_lock(self) -> bool:
+        """
+        Resolves the effective lock state by walking up to the closest instance
+        that is locked or unlocked explicitly or has a valid cached state, and
+        caches the result on every instance along the way.
+        """
+        generation = DeepDict._global_lock_generation
+        chain = []
+        node = self
+        while True:
+            if node._locked is not None:
+                state = node._locked
+                break
+            elif node._lock_generation == generation:
+                state = node._lock_state
+                break
+            elif node._parent is None:
+                state = False
+                break
+            chain.append(node)
+            node = node._parent
+
+        chain.append(node)
+        for node in chain:
+            node._lock_generation = generation
+            node._lock_state = state
+
+        return state
+
+    def _invalidate_lock(self) -> NoneType:
+        """
+        Invalidates the cached lock states if the instance is about to inherit
+        its lock state from another parent. If the instance has no valid cached
+        lock state, none of its children has a valid cached state depending on
+        the parents of the instance.
+        """
+        if (
+            self._locked is None
+            and self._lock_generation == DeepDict._global_lock_generation
+        ):
+            DeepDict._global_lock_generation += 1
 
     @property
     def depth(self) -> int:
         """
         Retuns the depth of the actual instance in a layout, starting from 0.
         """
-        if self.parent is None:
-            return 0
-        else:
-            return self.parent.depth + 1
+        return self._location()[0]
 
     @property
-    def address(self) -> tuple | NoneType:
-        """Returns the address of an item or `None` it has no parent."""
-        if self.is_root():
-            return []
-        else:
-            r = self.parent.address
-            r.append(self.key)
-            return r
+    def address(self) -> list:
+        """
+        Returns the address of the instance, or an empty list if it has no parent.
+        """
+        return self._location()[2].tolist()
+
+    def _location(self: _DT) -> tuple[int, _DT, Address]:
+        """
+        Returns the depth, the root and the address of the instance. The results
+        are cached and the caches of a subtree are cleared when it joins or leaves
+        a parent. The cache of an instance is only set if the caches of all of its
+        parents are set.
+        """
+        location = self._loc
+        if location is None:
+            chain = []
+            node = self
+            while node._loc is None and node._parent is not None:
+                chain.append(node)
+                node = node._parent
+
+            location = node._loc
+            if location is None:
+                location = node._loc = (0, node, Address())
+
+            for node in reversed(chain):
+                depth, root, address = location
+                location = node._loc = (depth + 1, root, address.child(node._key))
+
+        return location
+
+    def _clear_location(self) -> NoneType:
+        """
+        Clears the cached locations of the instance and all of its children.
+        """
+        if self._loc is None:
+            return
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._loc = None
+            for value in dict.values(node):
+                if (
+                    isinstance(value, DeepDict)
+                    and value._loc is not None
+                    and value._parent is node
+                ):
+                    stack.append(value)
 
     @classmethod
-    def wrap(cls, d: dict, copy: bool = False, deepcopy: bool = False) -> _DT:
+    def wrap(
+        cls, d: dict, copy: bool = False, deepcopy: bool = False, lazy: bool = False
+    ) -> _DT:
         """
         Wraps a dictionary with all nested dictionaries and content.
 
@@ -193,6 +360,14 @@ class DeepDict(dict, Generic[_KT, _VT]):
             If `True`, shallow copies of the values are stored. Default is False.
         deepcopy: bool, Optional
             If `True`, deep copies of the values are stored. Default is False.
+        lazy: bool, Optional
+            If `True`, only the top level of the dictionary is wrapped and nested
+            dictionaries are stored as they are. They get wrapped the same way
+            (and replaced in place) when they are first accessed through a
+            `DeepDict`, e.g. with `__getitem__`, `items`, `values` or `containers`.
+            This makes wrapping cheap if only a few branches of a big layout are
+            accessed later on. Cannot be combined with `copy` or `deepcopy`.
+            Default is False.
 
         Example
         -------
@@ -208,10 +383,26 @@ class DeepDict(dict, Generic[_KT, _VT]):
         >>> list(DeepDict.wrap(d).items(deep=True))
         [('aa', 1), ('b', 2), ('ccc', 3)]
 
+        With lazy wrapping, nested dictionaries are wrapped on first access:
+
+        >>> dd = DeepDict.wrap(d, lazy=True)
+        >>> type(dict.__getitem__(dd, "c")).__name__
+        'dict'
+        >>> dd["c", "cc", "ccc"]
+        3
+        >>> type(dict.__getitem__(dd, "c")).__name__
+        'DeepDict'
+
         """
         if copy and deepcopy:
             raise ValueError("Only one of 'copy' and 'deepcopy' can be True.")
 
+        if lazy and (copy or deepcopy):
+            raise ValueError("Lazy wrapping doesn't support 'copy' and 'deepcopy'.")
+
+        if lazy:
+            return cls._wrap_lazy(d)
+
         tr = None
 
         if copy:
@@ -220,7 +411,767 @@ class DeepDict(dict, Generic[_KT, _VT]):
         if deepcopy:
             tr = deep_copy
 
-        return _wrap(d, cls, tr=tr)
+        return cls._wrap(d, tr=tr)
+
+    @classmethod
+    def _wrap(cls, d: dict, tr: Callable | NoneType = None) -> _DT:
+        """
+        Builds a layout from a nested dictionary in bulk.
+
+        The layout is built iteratively. Since the new instances are all fresh
+        (hence unlocked and empty), the items are inserted without validation
+        and the parent and the key of the new instances are set directly. The
+        join hooks are only called if they are overridden by the class.
+        """
+        setitem = dict.__setitem__
+
+        root = cls()
+        stack = [(root, iter(d.items()))]
+        while stack:
+            node, items = stack[-1]
+            for key, value in items:
+                if isinstance(key, _SPECIAL_KEY_TYPES):
+                    # these keys are interpreted by __setitem__
+                    if isinstance(value, dict):
+                        node[key] = cls._wrap(value, tr=tr)
+                    else:
+                        node[key] = value if tr is None else tr(value)
+                elif isinstance(value, dict):
+                    child = cls()
+                    node._attach(key, child)
+                    stack.append((child, iter(value.items())))
+                    break
+                else:
+                    setitem(node, key, value if tr is None else tr(value))
+            else:
+                stack.pop()
+
+        return root
+
+    @classmethod
+    def _wrap_lazy(cls, d: dict) -> _DT:
+        """
+        Wraps the top level of a dictionary. The keys of nested dictionaries are
+        recorded, so that they can be wrapped when they are first accessed.
+        """
+        setitem = dict.__setitem__
+        pending = set()
+
+        node = cls()
+        for key, value in d.items():
+            if isinstance(key, _SPECIAL_KEY_TYPES):
+                # these keys are interpreted by __setitem__
+                node[key] = cls._wrap_lazy(value) if isinstance(value, dict) else value
+            else:
+                setitem(node, key, value)
+                if isinstance(value, dict):
+                    pending.add(key)
+
+        node._lazy = pending or None
+        return node
+
+    def _attach(self: _DT, key: _KT, child: _DT) -> NoneType:
+        """
+        Inserts a fresh instance without validation. The join hooks are only
+        called if they are overridden by the class of the child.
+        """
+        cls = child.__class__
+        if cls.__before_join_parent__ is not DeepDict.__before_join_parent__:
+            child.__before_join_parent__(self, key)
+        dict.__setitem__(self, key, child)
+        if self._containers is None:
+            self._containers = {}
+        self._containers[key] = child
+        if cls.__after_join_parent__ is not DeepDict.__after_join_parent__:
+            child.__after_join_parent__(self, key)
+        else:
+            child._parent = self
+            child._key = key
+
+    def _promote(self: _DT, key: _KT) -> _DT:
+        """
+        Wraps a nested dictionary of a lazily wrapped instance in place.
+        """
+        self._lazy.discard(key)
+        if not self._lazy:
+            self._lazy = None
+        child = self.__class__._wrap_lazy(dict.__getitem__(self, key))
+        # the content of the child is as old as the content of the instance,
+        # so it saves its items for the same snapshots
+        child._cow_epoch = self._cow_epoch
+        self._attach(key, child)
+        if self._fingerprint is not None:
+            # the fingerprints of cached instances are cached for their children too
+            child._digest()
+        if self._lazy is None and len(self._containers) > 1:
+            # the promoted children are registered in the order of promotion
+            self._containers = {
+                k: v for k, v in dict.items(self) if isinstance(v, DeepDict)
+            }
+        return child
+
+    def _promote_all(self) -> NoneType:
+        """
+        Wraps all the nested dictionaries of a lazily wrapped instance in place.
+        """
+        while self._lazy:
+            self._promote(next(iter(self._lazy)))
+
+    def to_dict(
+        self,
+        *,
+        copy: bool = False,
+        deepcopy: bool = False,
+        drop_empty: bool = False,
+    ) -> dict:
+        """
+        Returns the layout as nested standard dictionaries. This is the inverse
+        of :func:`wrap`. Columnar tables are converted to dictionaries of their
+        records with :func:`ColumnarTable.to_dict`.
+
+        Parameters
+        ----------
+        copy: bool, Optional
+            If `True`, shallow copies of the values are stored. Default is False,
+            in which case the values are shared between the instance and the
+            result.
+        deepcopy: bool, Optional
+            If `True`, deep copies of the values are stored. Default is False.
+        drop_empty: bool, Optional
+            If `True`, empty dictionaries are left out of the result, including
+            the ones that only contain empty dictionaries. Default is False.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict()
+        >>> dd["a", "b"] = 1
+        >>> dd["c", "d"] = DeepDict()
+        >>> dd.to_dict()
+        {'a': {'b': 1}, 'c': {'d': {}}}
+        >>> dd.to_dict(drop_empty=True)
+        {'a': {'b': 1}}
+        """
+        result = {}
+        for _, result in self.to_dict_iter(
+            copy=copy, deepcopy=deepcopy, drop_empty=drop_empty
+        ):
+            pass
+        return result
+
+    def unwrap(
+        self,
+        *,
+        copy: bool = False,
+        deepcopy: bool = False,
+        drop_empty: bool = False,
+    ) -> dict:
+        """
+        Returns the layout as nested standard dictionaries. This is the same as
+        :func:`to_dict`.
+        """
+        return self.to_dict(copy=copy, deepcopy=deepcopy, drop_empty=drop_empty)
+
+    def to_dict_iter(
+        self,
+        *,
+        copy: bool = False,
+        deepcopy: bool = False,
+        drop_empty: bool = False,
+    ) -> Iterator[tuple[tuple, dict]]:
+        """
+        Converts the layout to nested standard dictionaries bottom-up and yields
+        every converted dictionary along with its address as soon as it is
+        complete, hence the content of a dictionary is always yielded before
+        the dictionary itself. The last item is the conversion of the instance
+        with an empty address. The arguments are the same as for :func:`to_dict`.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict()
+        >>> dd["a", "b", "c"] = 1
+        >>> dd["d"] = 2
+        >>> for address, d in dd.to_dict_iter():
+        ...     print(address, d)
+        ('a', 'b') {'c': 1}
+        ('a',) {'b': {'c': 1}}
+        () {'a': {'b': {'c': 1}}, 'd': 2}
+        """
+        if copy and deepcopy:
+            raise ValueError("Only one of 'copy' and 'deepcopy' can be True.")
+
+        tr = None
+
+        if copy:
+            tr = shallow_copy
+
+        if deepcopy:
+            tr = partial(deep_copy, memo={})
+
+        path = []
+        stack = [(iter(_items(self)), {})]
+        while stack:
+            items, result = stack[-1]
+            for key, value in items:
+                if isinstance(value, dict):
+                    path.append(key)
+                    stack.append((iter(_items(value)), {}))
+                    break
+                elif isinstance(value, ColumnarTable):
+                    records = value.to_dict()
+                    if records or not drop_empty:
+                        result[key] = records
+                else:
+                    result[key] = value if tr is None else tr(value)
+            else:
+                stack.pop()
+                yield tuple(path), result
+                if path:
+                    key = path.pop()
+                    if result or not drop_empty:
+                        stack[-1][1][key] = result
+
+    def dump(self, file: Any) -> NoneType:
+        """
+        Writes the instance to a file in a binary format, that can be loaded
+        fast, entirely or partially, with :func:`load`.
+
+        Parameters
+        ----------
+        file: str or PathLike or BinaryIO
+            A path or a file object opened for writing in binary mode.
+
+        Example
+        -------
+        >>> import io
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"b": {"c": 1}}, "d": 2})
+        >>> file = io.BytesIO()
+        >>> dd.dump(file)
+        >>> _ = file.seek(0)
+        >>> DeepDict.load(file) == dd
+        True
+        >>> _ = file.seek(0)
+        >>> DeepDict.load(file, address=["a", "b"])
+        DeepDict({'c': 1})
+        """
+        from .binary import dump
+
+        dump(self, file)
+
+    @classmethod
+    def load(cls: type[_DT], file: Any, address: Sequence | NoneType = None) -> _DT | Any:
+        """
+        Loads an instance from a file written by :func:`dump`. If an address is
+        provided, only the item at the address is loaded, without deserializing
+        the rest of the file. Nested dictionaries are returned as new instances
+        without a parent.
+
+        Parameters
+        ----------
+        file: str or PathLike or BinaryIO
+            A path or a file object opened for reading in binary mode.
+        address: Sequence, Optional
+            The address of the item to load. Default is None.
+        """
+        from .binary import load
+
+        return load(file, address, cls=cls)
+
+    def gather(
+        self,
+        vtype: Any = float,
+        *,
+        dtype: Any = float,
+        address_type: type = tuple,
+    ) -> tuple["np.ndarray", list]:
+        """
+        Collects the leaves of type `vtype` into a contiguous NumPy array in one
+        pass over the layout. Returns the array and the addresses of the leaves,
+        which can be used to write the values back with :func:`scatter`.
+
+        Parameters
+        ----------
+        vtype: type or tuple, Optional
+            The type of the leaves to collect, as accepted by :func:`isinstance`.
+            Default is `float`.
+        dtype: Any, Optional
+            The data type of the array. Default is `float`.
+        address_type: type, Optional
+            The type of the addresses. See :func:`items` for the details.
+            Default is `tuple`.
+
+        Notes
+        -----
+        This requires the `numpy` package to be installed.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"E": 210.0, "nu": 0.3}, "b": {"E": 70.0}})
+        >>> data, addresses = dd.gather()
+        >>> data.tolist()
+        [210.0, 0.3, 70.0]
+        >>> addresses
+        [('a', 'E'), ('a', 'nu'), ('b', 'E')]
+        >>> dd.scatter(data * 2, addresses)
+        >>> dd["b", "E"]
+        140.0
+        """
+        if np is None:  # pragma: no cover
+            raise ImportError("This requires the 'numpy' package.")
+
+        items = self.items(
+            deep=True, return_address=True, vtype=vtype, address_type=address_type
+        )
+        addresses = []
+        append = addresses.append
+
+        def values() -> Iterator[Any]:
+            for address, value in items:
+                append(address)
+                yield value
+
+        data = np.fromiter(values(), dtype=dtype)
+        return data, addresses
+
+    def scatter(self, values: Iterable, addresses: Iterable[Sequence]) -> NoneType:
+        """
+        Writes the values to the leaves at the addresses, the opposite of
+        :func:`gather`. Only existing leaves can be written. The values are
+        replaced in place without calling the hooks and the parents of
+        consecutive addresses are only looked up once. Leaves inside standard
+        dictionaries and `ColumnarTable` instances, which are also collected
+        by :func:`gather`, are written the same way.
+
+        Parameters
+        ----------
+        values: Iterable
+            The new values. NumPy arrays are converted to Python scalars.
+        addresses: Iterable[Sequence]
+            The addresses of the leaves, as many as there are values. The keys
+            of the addresses are used as they are, like the ones returned by
+            :func:`gather`.
+        """
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        values = list(values)
+        addresses = list(addresses)
+
+        if len(values) != len(addresses):
+            raise ValueError(
+                f"The number of values ({len(values)}) and addresses "
+                f"({len(addresses)}) must be the same."
+            )
+
+        get = dict.get
+        setitem = dict.__setitem__
+        observed = DeepDict._observed_roots > 0
+        epoch, snapshots = DeepDict._snapshot_epoch, DeepDict._live_snapshots
+        # the containers other than instances that are written in place,
+        # by the ids of the instances that hold them and their keys, and
+        # the ones of them that are changed
+        inside, written = {}, {}
+        prefix = parent = owner = None
+        try:
+            for address, value in zip(addresses, values):
+                if not isinstance(address, tuple):
+                    address = tuple(address)
+                if not address:
+                    raise KeyError(address)
+
+                if address[:-1] != prefix:
+                    prefix = address[:-1]
+                    parent, owner = self, None
+                    for i, subkey in enumerate(prefix):
+                        node, parent = parent, parent.get(subkey, _MISSING)
+                        if parent is _MISSING:
+                            raise KeyError(address)
+                        elif not isinstance(parent, _DEEP_TYPES):
+                            raise TypeError(
+                                f"The value at '{prefix[: i + 1]}' is not a container!"
+                            )
+                        elif owner is None and not isinstance(parent, DeepDict):
+                            owner = (id(node), subkey)
+                            if owner not in inside:
+                                inside[owner] = (node, node._inside_write(subkey))
+                            parent = inside[owner][1]
+                    if owner is None and parent.locked:
+                        raise DeepDictLockedError()
+
+                key = address[-1]
+                if owner is not None:
+                    old = parent.get(key, _MISSING)
+                else:
+                    old = get(parent, key, _MISSING)
+                if old is _MISSING:
+                    raise KeyError(address)
+                elif isinstance(old, _DEEP_TYPES) or isinstance(value, dict):
+                    raise TypeError(f"The value at '{address}' is not a leaf!")
+
+                if owner is not None:
+                    parent[key] = value
+                    written[owner] = None
+                    continue
+
+                if parent._versions is not None or (
+                    parent._cow_epoch != epoch and snapshots
+                ):
+                    parent._preserve()
+                setitem(parent, key, value)
+                if parent._fingerprint is not None:
+                    parent._invalidate_fingerprint()
+                if observed:
+                    parent._notify("on_delete", key, old)
+                    parent._notify("on_set", key, value)
+        finally:
+            for owner in written:
+                node, container = inside[owner]
+                node._inside_written(owner[1], container)
+
+    def map_leaves(
+        self,
+        func: Callable[[Any], Any],
+        *,
+        vtype: Any = None,
+        executor: Executor | NoneType = None,
+        chunksize: int = 1024,
+    ) -> NoneType:
+        """
+        Replaces every leaf with the result of calling `func` on it. The leaves
+        are collected along with the instances that hold them in one pass, the
+        calls are made in batches, optionally on an executor, and the results
+        are written back to the holding instances directly, in the order of
+        the leaves.
+
+        Parameters
+        ----------
+        func: Callable
+            The function to call on the leaves. With a process pool, it must be
+            picklable, like a function defined at the top level of a module.
+        vtype: type or tuple, Optional
+            If provided, only the leaves of this type are mapped, as accepted
+            by :func:`isinstance`. Default is None.
+        executor: concurrent.futures.Executor, Optional
+            A thread or process pool to run the batches on. Default is None,
+            in which case the calls are made in the calling thread.
+        chunksize: int, Optional
+            The number of leaves in a batch. Default is 1024.
+
+        Notes
+        -----
+        If an instance that holds a leaf to be mapped is locked, a
+        :class:`~sigmaepsilon.deepdict.exceptions.DeepDictLockedError` is
+        raised before any call is made. The leaves inside standard dictionaries
+        and `ColumnarTable` instances are mapped as well, the same leaves the
+        deep iteration of :func:`items` visits.
+
+        Example
+        -------
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"E": 210.0, "name": "S235"}, "b": 70.0})
+        >>> with ThreadPoolExecutor(2) as executor:
+        ...     dd.map_leaves(lambda x: x * 1000, vtype=float, executor=executor)
+        >>> dd["a", "E"], dd["a", "name"], dd["b"]
+        (210000.0, 'S235', 70000.0)
+        """
+        if chunksize < 1:
+            raise ValueError("The chunk size must be a positive integer.")
+
+        # the addresses of the leaves inside containers other than instances,
+        # relative to the containers, or None for the leaves of instances
+        nodes, keys, inner, values = [], [], [], []
+        stack = [(self, iter(_promoted_items(self)))]
+        while stack:
+            node, items = stack[-1]
+            for key, value in items:
+                if isinstance(value, DeepDict):
+                    stack.append((value, iter(_promoted_items(value))))
+                    break
+                elif isinstance(value, _DEEP_TYPES):
+                    for address, leaf in _traverse(
+                        value, dtype=_DEEP_TYPES, address_type=tuple
+                    ):
+                        if vtype is None or isinstance(leaf, vtype):
+                            nodes.append(node)
+                            keys.append(key)
+                            inner.append(address)
+                            values.append(leaf)
+                elif vtype is None or isinstance(value, vtype):
+                    nodes.append(node)
+                    keys.append(key)
+                    inner.append(None)
+                    values.append(value)
+            else:
+                stack.pop()
+
+        for node in {id(node): node for node in nodes}.values():
+            if node.locked:
+                raise DeepDictLockedError()
+
+        batches = [values[i : i + chunksize] for i in range(0, len(values), chunksize)]
+        if executor is None:
+            results = map(_map_batch, [func] * len(batches), batches)
+        else:
+            results = executor.map(_map_batch, [func] * len(batches), batches)
+
+        setitem = dict.__setitem__
+        observed = DeepDict._observed_roots > 0
+        epoch, snapshots = DeepDict._snapshot_epoch, DeepDict._live_snapshots
+        # the containers other than instances that are written in place,
+        # by the ids of the instances that hold them and their keys, and
+        # the ones of them that are changed
+        inside, written = {}, {}
+        i = 0
+        try:
+            for batch in results:
+                for value in batch:
+                    node, key, address = nodes[i], keys[i], inner[i]
+                    if address is not None:
+                        container = inside.get((id(node), key))
+                        if container is None:
+                            container = (node, node._inside_write(key))
+                            inside[id(node), key] = container
+                        _set_in_place(container[1], address, value)
+                        written[id(node), key] = None
+                    elif isinstance(value, dict):
+                        node._setitem(key, value)
+                    else:
+                        if node._versions is not None or (
+                            node._cow_epoch != epoch and snapshots
+                        ):
+                            node._preserve()
+                        setitem(node, key, value)
+                        if node._fingerprint is not None:
+                            node._invalidate_fingerprint()
+                        if observed:
+                            node._notify("on_delete", key, values[i])
+                            node._notify("on_set", key, value)
+                    i += 1
+        finally:
+            for owner in written:
+                node, container = inside[owner]
+                node._inside_written(owner[1], container)
+
+    def reduce(
+        self,
+        func: Callable[[Any, Any], Any],
+        initial: Any,
+        *,
+        vtype: Any = None,
+        combine: Callable[[Any, Any], Any] | NoneType = None,
+        parallel: bool = False,
+        executor: Executor | NoneType = None,
+    ) -> Any:
+        """
+        Reduces the leaves to a single value with `func`, starting from `initial`,
+        like :func:`functools.reduce` over the leaves in depth-first order.
+
+        In parallel, the layout is split at the nested instances of the top
+        level, every part is reduced separately and the partial results are
+        combined in order. Without `combine`, the parts are reduced from their
+        first leaves and the partial results are reduced with `func`, starting
+        from `initial`, hence `initial` is applied exactly once and `func` must
+        be associative, like for sums, minimums and maximums. With `combine`,
+        every part starts from a deep copy of `initial`, which must then be
+        neutral to `combine`, like `0` for sums or an empty counter for counts.
+
+        Parameters
+        ----------
+        func: Callable
+            A function of an accumulated value and a leaf, that returns the
+            new accumulated value.
+        initial: Any
+            The initial value.
+        vtype: type or tuple, Optional
+            If provided, only the leaves of this type are reduced, as accepted
+            by :func:`isinstance`. Default is None.
+        combine: Callable, Optional
+            A function that combines two partial results in parallel. Default
+            is None, in which case `func` is used.
+        parallel: bool, Optional
+            If `True`, the parts are reduced on a pool of processes. Python
+            functions only run in parallel on separate processes, hence `func`
+            and `combine` must be picklable. Default is `False`, in which case
+            the leaves are reduced in one pass in the calling thread, unless an
+            executor is provided.
+        executor: concurrent.futures.Executor, Optional
+            A thread or process pool to run the parts on, which implies
+            `parallel=True`. With a process pool, the parts are sent to the
+            workers pickled as flat node tables, which is cheaper than
+            collecting their leaves in the calling process. Default is None.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"x": 1, "y": 2.5}, "b": {"z": 3}, "c": "?"})
+        >>> dd.reduce(lambda total, v: total + v, 0, vtype=(int, float))
+        6.5
+        >>> dd.reduce(max, float("-inf"), vtype=(int, float))
+        3
+
+        Counting the leaves by their types, with a function to merge the counts:
+
+        >>> from collections import Counter
+        >>> def count(counts, v):
+        ...     counts[type(v).__name__] += 1
+        ...     return counts
+        >>> dd.reduce(count, Counter())
+        Counter({'int': 2, 'float': 1, 'str': 1})
+        """
+        vtype = Any if vtype is None else vtype
+
+        if not parallel and executor is None:
+            return functools.reduce(func, self.values(deep=True, vtype=vtype), initial)
+
+        # the nested instances and the runs of leaves in between at the top level
+        parts, leaves = [], []
+        for _, value in _promoted_items(self):
+            if isinstance(value, DeepDict):
+                if leaves:
+                    parts.append(leaves)
+                    leaves = []
+                parts.append(value)
+            elif isinstance(value, _DEEP_TYPES):
+                leaves.extend(
+                    v
+                    for _, v in parseitems(value, dtype=_DEEP_TYPES)
+                    if vtype is Any or isinstance(v, vtype)
+                )
+            elif vtype is Any or isinstance(value, vtype):
+                leaves.append(value)
+        if leaves:
+            parts.append(leaves)
+
+        if not parts:
+            return initial
+
+        # the parts start from their first leaves without a function to
+        # combine them, so that the initial value is only applied once
+        start = () if combine is None else (initial,)
+        own_executor = executor is None and len(parts) > 1
+        if own_executor:
+            executor = ProcessPoolExecutor()
+        try:
+            if executor is None:
+                results = [_reduce_part(func, start, parts[0], vtype)]
+            else:
+                results = executor.map(
+                    _reduce_part,
+                    [func] * len(parts),
+                    [start] * len(parts),
+                    parts,
+                    [vtype] * len(parts),
+                )
+            partials = [result[0] for result in results if result]
+        finally:
+            if own_executor:
+                executor.shutdown()
+        if combine is None:
+            return functools.reduce(func, partials, initial)
+        return functools.reduce(combine, partials)
+
+    def diff(self, other: dict) -> list[tuple[str, tuple, Any]]:
+        """
+        Returns the operations that turn the instance into `other`, as a list
+        of tuples `(op, address, value)`, where `op` is one of 'add', 'remove'
+        and 'replace' and the address is a tuple of keys. The value of a
+        'remove' operation is `None`, nested instances in the values are
+        returned as standard dictionaries. The result can be applied with
+        :func:`patch`.
+
+        Subtrees that are the same object in both layouts, or that have cached
+        fingerprints that are equal (see :func:`fingerprint`), are skipped
+        without being compared. Leaves are equal if they are of the same type
+        and they compare equal.
+
+        Parameters
+        ----------
+        other: dict
+            A `DeepDict` or a nested dictionary.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> a = DeepDict.wrap({"a": {"b": 1, "c": 2}, "d": 3})
+        >>> b = DeepDict.wrap({"a": {"b": 1, "c": 5, "e": {"f": 6}}})
+        >>> ops = a.diff(b)
+        >>> ops
+        [('replace', ('a', 'c'), 5), ('add', ('a', 'e'), {'f': 6}), ('remove', ('d',), None)]
+        >>> a.patch(ops)
+        >>> a == b
+        True
+        """
+        ops = []
+        stack = [((), self, other, iter(dict.items(self)))]
+        while stack:
+            prefix, a, b, items = stack[-1]
+            for key, va in items:
+                vb = dict.get(b, key, _MISSING)
+                if vb is _MISSING:
+                    ops.append(("remove", prefix + (key,), None))
+                elif va is vb or _same_fingerprint(va, vb):
+                    continue
+                elif isinstance(va, dict) and isinstance(vb, dict):
+                    stack.append((prefix + (key,), va, vb, iter(dict.items(va))))
+                    break
+                elif not _same_leaf(va, vb):
+                    ops.append(("replace", prefix + (key,), _detached(vb)))
+            else:
+                stack.pop()
+                for key, vb in dict.items(b):
+                    if not dict.__contains__(a, key):
+                        ops.append(("add", prefix + (key,), _detached(vb)))
+        return ops
+
+    def patch(self, ops: Iterable[tuple[str, Sequence, Any]]) -> NoneType:
+        """
+        Applies operations returned by :func:`diff`. An 'add' operation creates
+        the missing levels of its address and sets the value, a 'replace'
+        operation sets the value of an existing item and a 'remove' operation
+        deletes an existing item. Dictionaries among the values are wrapped.
+
+        Parameters
+        ----------
+        ops: Iterable[tuple[str, Sequence, Any]]
+            The operations as tuples `(op, address, value)`. The keys of the
+            addresses are used as they are.
+        """
+        cls = self.__class__
+        get = dict.get
+        for op, address, value in ops:
+            if op not in ("add", "remove", "replace"):
+                raise ValueError(f"Invalid operation: {op}")
+            elif not address:
+                raise KeyError(address)
+
+            parent = self
+            for key in address[:-1]:
+                if parent._lazy is not None and key in parent._lazy:
+                    child = parent._promote(key)
+                else:
+                    child = get(parent, key, _MISSING)
+                if child is _MISSING:
+                    if op != "add":
+                        raise KeyError(tuple(address))
+                    child = cls()
+                    parent._setitem(key, child)
+                elif not isinstance(child, DeepDict):
+                    raise TypeError(f"The value at '{tuple(address)}' is not a DeepDict!")
+                parent = child
+
+            key = address[-1]
+            if op == "remove":
+                parent._delitem(key)
+                continue
+            elif op == "replace" and not dict.__contains__(parent, key):
+                raise KeyError(tuple(address))
+
+            if isinstance(value, dict) and not isinstance(value, DeepDict):
+                value = cls.wrap(value)
+            parent._setitem(key, value)
 
     def lock(self) -> NoneType:
         """
@@ -230,6 +1181,7 @@ class DeepDict(dict, Generic[_KT, _VT]):
         dictionary and not possible and you will experience an error upon trying.
         """
         self._locked = True
+        DeepDict._global_lock_generation += 1
 
     def unlock(self) -> NoneType:
         """
@@ -238,6 +1190,369 @@ class DeepDict(dict, Generic[_KT, _VT]):
         items becomes an option.
         """
         self._locked = False
+        DeepDict._global_lock_generation += 1
+
+    @property
+    def index(self) -> "AddressIndex | NoneType":
+        """
+        Returns the address index of the instance, or None if it is not indexed.
+        """
+        return self._index
+
+    def enable_index(self) -> "AddressIndex":
+        """
+        Builds an index of all the addresses in the layout and keeps it up to
+        date as the layout changes. Multi-level access like `dd["a", "b", "c"]`
+        on an indexed instance costs a single lookup, regardless of the length
+        of the address. Only a root can be indexed and the index is dropped if
+        the instance joins a parent.
+
+        Returns the index, which can also be used to query the items under an
+        address. Calling the method on an indexed instance returns the existing
+        index.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"b": {"c": 1}, "d": 2}})
+        >>> index = dd.enable_index()
+        >>> dd["a", "b", "c"]
+        1
+        >>> list(index.under(("a",)))
+        [(('a', 'b'), DeepDict({'c': 1})), (('a', 'b', 'c'), 1), (('a', 'd'), 2)]
+        """
+        if self._parent is not None:
+            raise ValueError("Only the root of a layout can be indexed.")
+
+        if self._index is None:
+            from .index import AddressIndex
+
+            self._index = AddressIndex(self)
+            self._add_observer(self._index)
+        return self._index
+
+    def disable_index(self) -> NoneType:
+        """
+        Drops the address index of the instance, if there is any.
+        """
+        if self._index is not None:
+            self._remove_observer(self._index)
+            self._index = None
+
+    @property
+    def type_index(self) -> "LeafTypeIndex | NoneType":
+        """
+        Returns the leaf type index of the instance, or None if it is not indexed.
+        """
+        return self._leaf_index
+
+    def enable_type_index(self) -> "LeafTypeIndex":
+        """
+        Builds an index of the leaves of the layout, partitioned by their types,
+        and keeps it up to date as the layout changes. Deep iteration filtered
+        by the type of the values with the `items` and `values` methods of an
+        indexed instance only touches the matching leaves.
+
+        Only a root can be indexed and the index is dropped if the instance joins
+        a parent. Calling the method on an indexed instance returns the existing
+        index.
+
+        .. note::
+           Filtered deep iteration on an indexed instance returns the leaves in the
+           same depth-first order as without the index. Once items are set in the
+           layout, the matching leaves are sorted by their positions, see
+           :func:`~sigmaepsilon.deepdict.index.LeafTypeIndex.find`. The index is not
+           used if the layout has values that are standard dictionaries or columnar
+           tables, since changes inside them can't be followed.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"b": 1.0, "c": 2}, "d": 3.0})
+        >>> index = dd.enable_type_index()
+        >>> dd["a", "e"] = 4.0
+        >>> list(dd.values(deep=True, vtype=float))
+        [1.0, 4.0, 3.0]
+        """
+        if self._parent is not None:
+            raise ValueError("Only the root of a layout can be indexed.")
+
+        if self._leaf_index is None:
+            from .index import LeafTypeIndex
+
+            self._leaf_index = LeafTypeIndex(self)
+            self._add_observer(self._leaf_index)
+        return self._leaf_index
+
+    def disable_type_index(self) -> NoneType:
+        """
+        Drops the leaf type index of the instance, if there is any.
+        """
+        if self._leaf_index is not None:
+            self._remove_observer(self._leaf_index)
+            self._leaf_index = None
+
+    @property
+    def journal(self) -> "Journal | NoneType":
+        """
+        Returns the journal of the instance, or None if it has no journal.
+        """
+        return self._journal
+
+    def enable_journal(self) -> "Journal":
+        """
+        Starts recording the addresses of the items that are set or deleted
+        in the layout, including the levels created on the fly by multi-level
+        assignment. The changes since the last checkpoint can be queried from
+        the returned journal, with a cost proportional to the number of changes
+        rather than the size of the layout.
+
+        Only a root can have a journal and the journal is dropped if the
+        instance joins a parent. Calling the method on an instance with a
+        journal returns the existing journal.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"b": 1}})
+        >>> journal = dd.enable_journal()
+        >>> dd["a", "c", "d"] = 2
+        >>> journal.dirty_addresses()
+        [('a', 'c')]
+        """
+        if self._parent is not None:
+            raise ValueError("Only the root of a layout can have a journal.")
+
+        if self._journal is None:
+            from .journal import Journal
+
+            self._journal = Journal(self)
+            self._add_observer(self._journal)
+        return self._journal
+
+    def disable_journal(self) -> NoneType:
+        """
+        Drops the journal of the instance, if there is any.
+        """
+        if self._journal is not None:
+            self._remove_observer(self._journal)
+            self._journal = None
+
+    def snapshot(self) -> "Snapshot":
+        """
+        Returns a read-only view of the instance as it is now. The view shares
+        the instances of the layout, which save their items only when they are
+        changed for the first time after the snapshot was taken. Hence taking a
+        snapshot is a constant time operation and the memory it needs grows with
+        the number of instances changed afterwards, not with the size of the
+        layout.
+
+        The view is locked, trying to change it raises a `DeepDictLockedError`.
+        Nested dictionaries are returned as views of the same snapshot.
+
+        Notes
+        -----
+        Only the instances of the layout of the snapshot, including the ones
+        removed from it afterwards, save their items for the snapshot. Columnar
+        tables, standard dictionaries, lists and other containers that are
+        written through the addresses of the layout are copied before their
+        first change. Other in-place
+        changes of mutable leaves, like appending to a list, are not isolated
+        from the snapshots. The items saved for a snapshot are dropped when an
+        instance changes after the snapshot is garbage collected.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"b": 1}, "c": 2})
+        >>> snapshot = dd.snapshot()
+        >>> dd["a", "b"] = 3
+        >>> snapshot["a", "b"], dd["a", "b"]
+        (1, 3)
+        """
+        from .snapshot import _take
+
+        return _take(self)
+
+    def _preserve(self) -> NoneType:
+        """
+        Saves the items of the instance for the snapshots of its layout taken
+        since its last change and drops the saved items no live snapshot of
+        the layout refers to. It must be called before the instance is changed.
+        """
+        epoch = DeepDict._snapshot_epoch
+        live = self._covering_snapshots()
+        versions = self._versions
+        if versions is not None:
+            oldest = min(live, default=epoch + 1)
+            for version in [v for v in versions if v < oldest]:
+                del versions[version]
+        if live and max(live) > self._cow_epoch:
+            if versions is None:
+                versions = {}
+            versions[epoch] = dict(dict.items(self))
+        self._versions = versions or None
+        self._cow_epoch = epoch
+
+    def _covering_snapshots(self) -> list[int]:
+        """
+        Returns the epochs of the live snapshots that can see the instance,
+        which are the snapshots of the instance and of its parents, and forgets
+        the epochs of the snapshots that are garbage collected.
+        """
+        live = DeepDict._live_snapshots
+        result = []
+        node = self
+        while node is not None:
+            epochs = node._snapshot_epochs
+            if epochs is not None:
+                epochs.intersection_update(live)
+                if epochs:
+                    result.extend(epochs)
+                else:
+                    node._snapshot_epochs = None
+            node = node._parent
+        return result
+
+    def _pin(self, epochs: Iterable[int]) -> NoneType:
+        """
+        Keeps the instance saving its items for the snapshots of the given
+        epochs, before it leaves a layout they can see.
+        """
+        if self._snapshot_epochs is None:
+            self._snapshot_epochs = set()
+        self._snapshot_epochs.update(epochs)
+
+    def _typed_leaves(self, vtype: Any) -> Iterator[tuple[tuple, Any]] | NoneType:
+        """
+        Returns the addresses and the values of the leaves of type `vtype` from
+        the leaf type index, or None if the index can't be used.
+        """
+        index = self._leaf_index
+        if index is None or not index.complete:
+            return None
+        try:
+            return index.find(vtype)
+        except TypeError:
+            return None
+
+    def _add_observer(self, observer: Any) -> NoneType:
+        """
+        Registers an observer that is notified about the changes of the layout.
+        The observer must implement the methods `on_set` and `on_delete`, which
+        are called with the address of the affected item and its value.
+        """
+        if self._observers is None:
+            self._observers = _Observers()
+            DeepDict._observed_roots += 1
+            # the count is released when the list is garbage collected,
+            # even if the root is dropped without removing its observers
+            weakref.finalize(self._observers, _release_observed_root)
+        self._observers.append(observer)
+
+    def _remove_observer(self, observer: Any) -> NoneType:
+        """
+        Unregisters an observer.
+        """
+        self._observers.remove(observer)
+        if not self._observers:
+            self._observers = None
+
+    def _drop_observers(self) -> NoneType:
+        """
+        Unregisters all observers.
+        """
+        self._observers = None
+        self._index = None
+        self._leaf_index = None
+        self._journal = None
+
+    def _notify(self, event: str, key: Hashable, value: Any) -> NoneType:
+        """
+        Notifies the observers of the root about an item of the instance
+        being set or deleted.
+        """
+        _, root, address = self._location()
+        observers = root._observers
+        if observers is not None:
+            address = address.child(key)
+            for observer in observers:
+                getattr(observer, event)(address, value)
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of the content of the instance as a hexadecimal string.
+        Equal layouts have the same fingerprint, regardless of the order of
+        their items. The fingerprints of the nested instances are cached and
+        a change through the instances only invalidates the fingerprints along
+        the chain of parents, hence calling it again after a few changes only
+        hashes the changed parts and it is a constant time operation if
+        nothing has changed.
+
+        Notes
+        -----
+        Leaves are hashed by their representations if they are strings, numbers,
+        booleans or `None`, otherwise by their pickled forms. Values of different
+        types have different fingerprints, even if they compare equal. Writes
+        into columnar tables and standard dictionaries through the addresses of
+        the instance invalidate the fingerprints, but in-place changes of these
+        objects and of mutable leaves, like appending to a list, are not detected.
+
+        Example
+        -------
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> a = DeepDict.wrap({"a": {"b": 1, "c": [2, 3]}, "d": "x"})
+        >>> b = DeepDict.wrap({"d": "x", "a": {"c": [2, 3], "b": 1}})
+        >>> a.fingerprint() == b.fingerprint()
+        True
+        >>> fingerprint = a["a"].fingerprint()
+        >>> a["a", "b"] = 2
+        >>> a["a"].fingerprint() == fingerprint
+        False
+        """
+        return self._digest().hex()
+
+    def _digest(self) -> bytes:
+        """
+        Returns the digest of the instance, computing the missing digests of
+        the nested instances bottom-up and caching them.
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+
+        # the node, its items, its encoded items and its key
+        stack = [(self, iter(dict.items(self)), [], None)]
+        while stack:
+            node, items, encoded, _ = frame = stack[-1]
+            append = encoded.append
+            for key, value in items:
+                if isinstance(value, DeepDict) and value._fingerprint is not None:
+                    append(_encode(key) + b"\x00D" + value._fingerprint.hex().encode())
+                elif isinstance(value, dict):
+                    stack.append((value, iter(dict.items(value)), [], key))
+                    break
+                else:
+                    append(_encode(key) + b"\x00" + _encode(value))
+            else:
+                stack.pop()
+                digest = _node_digest(encoded)
+                if isinstance(node, DeepDict):
+                    node._fingerprint = digest
+                if stack:
+                    stack[-1][2].append(
+                        _encode(frame[3]) + b"\x00D" + digest.hex().encode()
+                    )
+        return self._fingerprint
+
+    def _invalidate_fingerprint(self) -> NoneType:
+        """
+        Clears the cached fingerprints of the instance and its parents. If a
+        fingerprint is not cached, neither are the ones of its parents.
+        """
+        node = self
+        while node is not None and node._fingerprint is not None:
+            node._fingerprint = None
+            node = node._parent
 
     def is_root(self) -> bool:
         """
@@ -271,7 +1586,18 @@ class DeepDict(dict, Generic[_KT, _VT]):
 
         """
         dtype = self.__class__ if dtype is None else dtype
-        return not any(list([isinstance(v, dtype) for v in self.values()]))
+
+        if not (isinstance(dtype, type) and issubclass(dtype, DeepDict)):
+            return not any(isinstance(v, dtype) for v in self.values())
+
+        if self._lazy is not None and issubclass(self.__class__, dtype):
+            # the pending dictionaries become instances of the same class
+            return False
+
+        containers = self._containers
+        return containers is None or not any(
+            isinstance(v, dtype) for v in containers.values()
+        )
 
     def containers(
         self: _DT,
@@ -335,62 +1661,282 @@ class DeepDict(dict, Generic[_KT, _VT]):
 
         """
         dtype = self.__class__ if dtype is None else dtype
-        return parsedicts(self, inclusive=inclusive, dtype=dtype, deep=deep)
+
+        if inclusive and isinstance(self, dtype):
+            yield self
+
+        if isinstance(dtype, type) and issubclass(dtype, DeepDict):
+            # only the nested instances are visited
+            stack = [iter(self._child_containers())]
+            while stack:
+                for child in stack[-1]:
+                    if isinstance(child, dtype):
+                        yield child
+                        if deep:
+                            stack.append(iter(child._child_containers()))
+                            break
+                else:
+                    stack.pop()
+            return
+
+        for _, value in _traverse(
+            self,
+            dtype=dtype,
+            leaves=False,
+            containers=True,
+            deep=deep,
+            items=_promoted_items,
+        ):
+            yield value
+
+    def _child_containers(self: _DT) -> Iterable[_DT]:
+        """
+        Returns the values of the instance that are instances of `DeepDict`,
+        in the order of the items.
+        """
+        if self._lazy is not None:
+            self._promote_all()
+        return () if self._containers is None else self._containers.values()
 
     def __getitem__(self: _DT, key: _KT, /) -> _VT:
-        if isinstance(key, Key) or not _issequence(key):
-            _key = key.wrapped if isinstance(key, Key) else key
-            return dict.__getitem__(self, _key)
-        else:
-            item = self.__getitem__(key[0])
-            if len(key) > 1:
-                return item.__getitem__(key[1:])
+        if isinstance(key, Key):
+            key = key.wrapped
+        elif _issequence(key):
+            if len(key) == 0:
+                raise KeyError(key)
+
+            if self._index is not None:
+                value = self._index._lookup(key)
+                if value is not _MISSING:
+                    return value
+
+            return self._getitem_path(key, len(key))
+
+        value = dict.__getitem__(self, key)
+        if self._lazy is not None and key in self._lazy:
+            value = self._promote(key)
+        return value
+
+    def get(self, key: _KT, default: Any = None, /) -> _VT | Any:
+        """
+        Returns the value for `key` if `key` is in the dictionary, else `default`.
+        It works the same as for standard dictionaries.
+        """
+        if self._lazy is not None and key in self._lazy:
+            return self._promote(key)
+        return dict.get(self, key, default)
+
+    def _getitem_path(self: _DT, key: Sequence, stop: int, /) -> _DT | _VT:
+        """
+        Returns the item at the address `key[:stop]` by walking the address
+        with a loop. Missing levels are created on the way.
+        """
+        getitem = dict.__getitem__
+        obj = self
+        for i in range(stop):
+            if not isinstance(obj, DeepDict):
+                return obj.__getitem__(key[i:stop])
+
+            subkey = key[i]
+            if isinstance(subkey, _SPECIAL_KEY_TYPES):
+                obj = obj.__getitem__(subkey)
+            elif obj._lazy is not None and subkey in obj._lazy:
+                obj = obj._promote(subkey)
             else:
-                return item
+                obj = getitem(obj, subkey)
+        return obj
 
     def __delitem__(self, key: _KT, /) -> NoneType:
         if isinstance(key, Key) or not _issequence(key):
-            _key = key.wrapped if isinstance(key, Key) else key
-            value = self[_key]
-            value_is_DeepDict = isinstance(value, DeepDict)
-            if value_is_DeepDict:
-                value.__before_leave_parent__()
-            if self.locked:
-                raise DeepDictLockedError()
-            dict.__delitem__(self, _key)
-            if value_is_DeepDict:
-                value.__after_leave_parent__()
+            self._delitem(key.wrapped if isinstance(key, Key) else key)
         else:
-            parent = self.__getitem__(key[:-1])
-            parent.__delitem__(key[-1])
+            last = len(key) - 1
+            host = self
+            for i in range(last):
+                subkey = key[i]
+                if isinstance(subkey, _SPECIAL_KEY_TYPES):
+                    item = host.__getitem__(subkey)
+                elif host._lazy is not None and subkey in host._lazy:
+                    item = host._promote(subkey)
+                else:
+                    item = dict.__getitem__(host, subkey)
+
+                if isinstance(item, DeepDict):
+                    host = item
+                elif isinstance(subkey, Key):
+                    host._del_inside(subkey.wrapped, key[i + 1 :])
+                    return
+                elif isinstance(subkey, _SPECIAL_KEY_TYPES):
+                    # a nested address, its keys are walked the same way
+                    host.__delitem__((*subkey, *key[i + 1 :]))
+                    return
+                else:
+                    host._del_inside(subkey, key[i + 1 :])
+                    return
+            host.__delitem__(key[last])
+
+    def _delitem(self, key: Hashable, /) -> _VT:
+        """
+        Deletes the item with the key `key`, interpreted as it is, and
+        returns its value.
+        """
+        value = dict.__getitem__(self, key) if dict.__contains__(self, key) else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+
+        value_is_DeepDict = isinstance(value, DeepDict)
+        if value_is_DeepDict:
+            value.__before_leave_parent__()
+        if self.locked:
+            raise DeepDictLockedError()
+        if self._versions is not None or (
+            self._cow_epoch != DeepDict._snapshot_epoch and DeepDict._live_snapshots
+        ):
+            self._preserve()
+        if value_is_DeepDict and DeepDict._live_snapshots:
+            # the snapshots still see the value through the saved items
+            value._pin(self._covering_snapshots())
+        dict.__delitem__(self, key)
+        if value_is_DeepDict and self._containers is not None:
+            self._containers.pop(key, None)
+            if not self._containers:
+                self._containers = None
+        if self._lazy is not None and key in self._lazy:
+            self._lazy.discard(key)
+            if not self._lazy:
+                self._lazy = None
+        if value_is_DeepDict:
+            value.__after_leave_parent__()
+        if self._fingerprint is not None:
+            self._invalidate_fingerprint()
+        if DeepDict._observed_roots:
+            self._notify("on_delete", key, value)
+        return value
 
     def __setitem__(self, key: _KT, value: _VT, /) -> NoneType:
         if isinstance(key, Key) or not _issequence(key):
-            _key = key.wrapped if isinstance(key, Key) else key
-            if not isinstance(_key, Hashable):
-                raise TypeError(f"Invalid key type: {type(_key)}")
-
-            if key in self:
-                self.__delitem__(key)
-            elif self.locked:
-                raise DeepDictLockedError(f"Missing key '{key}' and the object is locked!")
-
-            value_is_DeepDict = isinstance(value, DeepDict)
-
-            if value_is_DeepDict:
-                value.__before_join_parent__(self, key)
-            dict.__setitem__(self, _key, value)
-            if value_is_DeepDict:
-                value.__after_join_parent__(self, key)
+            self._setitem(key.wrapped if isinstance(key, Key) else key, value)
         elif _issequence(key):
-            if len(key) == 1:
-                self.__setitem__(key[0], value)
-            else:
-                host = self.__missing__(key[0]) if key[0] not in self else self[key[0]]
-                host.__setitem__(key[1:], value)
+            get = dict.get
+            last = len(key) - 1
+            host = self
+            for i in range(last):
+                subkey = key[i]
+                if isinstance(subkey, _SPECIAL_KEY_TYPES):
+                    item = host[subkey] if subkey in host else _MISSING
+                elif host._lazy is not None and subkey in host._lazy:
+                    item = host._promote(subkey)
+                else:
+                    item = get(host, subkey, _MISSING)
+
+                if item is _MISSING:
+                    host = host.__missing__(subkey)
+                elif isinstance(item, DeepDict):
+                    host = item
+                elif isinstance(subkey, Key):
+                    host._set_inside(subkey.wrapped, key[i + 1 :], value)
+                    return
+                elif isinstance(subkey, _SPECIAL_KEY_TYPES):
+                    # a nested address, its keys are walked the same way
+                    host.__setitem__((*subkey, *key[i + 1 :]), value)
+                    return
+                else:
+                    host._set_inside(subkey, key[i + 1 :], value)
+                    return
+            host.__setitem__(key[last], value)
         else:  # pragma: no cover
             raise TypeError(f"Invalid key type: {type(key)}")
 
+    def _setitem(self, key: Hashable, value: _VT, /) -> NoneType:
+        """
+        Sets the item with the key `key`, interpreted as it is.
+        """
+        if not isinstance(key, Hashable):
+            raise TypeError(f"Invalid key type: {type(key)}")
+
+        if dict.__contains__(self, key):
+            self._delitem(key)
+        elif self.locked:
+            raise DeepDictLockedError(f"Missing key '{key}' and the object is locked!")
+
+        value_is_DeepDict = isinstance(value, DeepDict)
+
+        if value_is_DeepDict:
+            if value._parent is not None and DeepDict._live_snapshots:
+                # the value is moved, but the previous parent still refers to it
+                value._pin(value._parent._covering_snapshots())
+            value.__before_join_parent__(self, key)
+        if self._versions is not None or (
+            self._cow_epoch != DeepDict._snapshot_epoch and DeepDict._live_snapshots
+        ):
+            self._preserve()
+        dict.__setitem__(self, key, value)
+        if value_is_DeepDict:
+            if self._containers is None:
+                self._containers = {}
+            self._containers[key] = value
+            value.__after_join_parent__(self, key)
+        if self._fingerprint is not None:
+            self._invalidate_fingerprint()
+        if DeepDict._observed_roots:
+            self._notify("on_set", key, value)
+
+    def _set_inside(self, key: Hashable, address: Sequence, value: Any) -> NoneType:
+        """
+        Sets an item inside the value of the key `key`, which is a container
+        other than an instance, like a standard dictionary or a `ColumnarTable`.
+        The keys of the address are used as they are. The change counts as a
+        change of the value of the key, hence the locks, the fingerprints and
+        the observers are handled the same way as for other changes.
+        """
+        container = self._inside_write(key)
+        _set_in_place(container, address, value)
+        self._inside_written(key, container)
+
+    def _del_inside(self, key: Hashable, address: Sequence) -> NoneType:
+        """
+        Deletes an item inside the value of the key `key`, which is a container
+        other than an instance, the same way as :func:`_set_inside` sets one.
+        """
+        container = self._inside_write(key)
+        parent = container
+        for subkey in address[:-1]:
+            parent = parent[subkey]
+        del parent[address[-1]]
+        self._inside_written(key, container)
+
+    def _inside_write(self, key: Hashable) -> Any:
+        """
+        Prepares the value of the key `key` to be changed in place and returns
+        it. It must be followed by a call to :func:`_inside_written` once the
+        value is changed.
+        """
+        if self.locked:
+            raise DeepDictLockedError()
+        if self._versions is not None or (
+            self._cow_epoch != DeepDict._snapshot_epoch and DeepDict._live_snapshots
+        ):
+            self._preserve()
+        container = dict.__getitem__(self, key)
+        versions = self._versions
+        if versions is not None and any(
+            version.get(key) is container for version in versions.values()
+        ):
+            # the container is shared with the items saved for the snapshots
+            container = _copied(container)
+            dict.__setitem__(self, key, container)
+        return container
+
+    def _inside_written(self, key: Hashable, container: Any) -> NoneType:
+        """
+        Reports the value of the key `key` as changed in place.
+        """
+        if self._fingerprint is not None:
+            self._invalidate_fingerprint()
+        if DeepDict._observed_roots:
+            self._notify("on_delete", key, container)
+            self._notify("on_set", key, container)
+
     def __missing__(self: _DT, key: _KT, /) -> _DT:
         """
         This is called when a value is about to be set and the key spans
@@ -402,23 +1948,29 @@ class DeepDict(dict, Generic[_KT, _VT]):
 
         if isinstance(key, Key) or not _issequence(key):
             value = self.__class__()
-            _key = key.wrapped if isinstance(key, Key) else key
-            self[_key] = value
+            self[key] = value
             return value
         elif _issequence(key):
-            if key[0] not in self:
-                value = self.__class__()
-                self[key[0]] = value
-            else:
-                value = self[key[0]]
+            value = self
+            for i, subkey in enumerate(key):
+                if i > 0:
+                    if not isinstance(value, DeepDict):
+                        raise TypeError(
+                            f"The value of key '{key[i - 1]}' is not a DeepDict!"
+                        )
+
+                    if value.locked:
+                        raise DeepDictLockedError(
+                            f"Missing key '{key[i:]}' and the object is locked!"
+                        )
+
+                if subkey not in value:
+                    host, value = value, value.__class__()
+                    host[subkey] = value
+                else:
+                    value = value[subkey]
 
-            if len(key) > 1:
-                if not isinstance(value, DeepDict):
-                    raise TypeError(f"The value of key '{key[0]}' is not a DeepDict!")
-
-                return value.__missing__(key[1:])
-            else:
-                return value
+            return value
 
     def __contains__(self, item: Any, /) -> bool:
         if isinstance(item, Key):
@@ -429,9 +1981,23 @@ class DeepDict(dict, Generic[_KT, _VT]):
             if len(item) == 0:
                 raise ValueError(f"{item} has zero length")
             else:
+                if self._index is not None and self._index._lookup(item) is not _MISSING:
+                    return True
+
+                get = dict.get
                 obj = self
                 for subitem in item:
-                    if not isinstance(subitem, Hashable):
+                    if isinstance(obj, DeepDict) and not isinstance(
+                        subitem, _SPECIAL_KEY_TYPES
+                    ):
+                        try:
+                            obj = get(obj, subitem, _MISSING)
+                        except TypeError:
+                            raise TypeError(f"{subitem} is not hashable") from None
+
+                        if obj is _MISSING:
+                            return False
+                    elif not isinstance(subitem, Hashable):
                         raise TypeError(f"{subitem} is not hashable")
                     else:
                         if obj.__contains__(subitem):
@@ -444,26 +2010,99 @@ class DeepDict(dict, Generic[_KT, _VT]):
         else:
             raise TypeError(f"{item} is not hashable")
 
+    def update(self, *args, **kwargs) -> NoneType:
+        """
+        Updates the dictionary from a mapping or an iterable of key-value pairs
+        and from keyword arguments. It works the same as for standard dictionaries,
+        but the items are set the same way as with item assignment, which means
+        that the instance can't be updated if it is locked.
+        """
+        if len(args) > 1:
+            raise TypeError(f"update expected at most 1 argument, got {len(args)}")
+
+        if args:
+            other = args[0]
+            if isinstance(other, dict):
+                for k, v in dict.items(other):
+                    self._setitem(k, v)
+            elif hasattr(other, "keys"):
+                for k in other.keys():
+                    self._setitem(k, other[k])
+            else:
+                for k, v in other:
+                    self._setitem(k, v)
+
+        for k, v in kwargs.items():
+            self._setitem(k, v)
+
+    def __ior__(self: _DT, other: Any, /) -> _DT:
+        self.update(other)
+        return self
+
+    def pop(self, key: _KT, default: Any = _MISSING, /) -> _VT | Any:
+        """
+        Removes the item with the key `key` and returns its value. If the key
+        is missing, `default` is returned if it is provided, otherwise a
+        `KeyError` is raised. It works the same as for standard dictionaries.
+        """
+        if not dict.__contains__(self, key):
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return self._delitem(key)
+
+    def popitem(self) -> tuple[_KT, _VT]:
+        """
+        Removes the last inserted item and returns it as a key-value pair.
+        It works the same as for standard dictionaries.
+        """
+        if dict.__len__(self) == 0:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(dict.keys(self)))
+        return key, self._delitem(key)
+
+    def setdefault(self, key: _KT, default: Any = None, /) -> _VT | Any:
+        """
+        Returns the value for `key` if `key` is in the dictionary, otherwise
+        sets it to `default` and returns `default`. It works the same as for
+        standard dictionaries.
+        """
+        if dict.__contains__(self, key):
+            return self.get(key)
+        self._setitem(key, default)
+        return default
+
+    def clear(self) -> NoneType:
+        """
+        Removes all items from the dictionary. It works the same as for
+        standard dictionaries.
+        """
+        for key in list(dict.keys(self)):
+            self._delitem(key)
+
     def __reduce__(self) -> Any:
-        return self.__class__, tuple(), None, None, self.items()
+        return _from_node_table, (_to_node_table(self),)
 
     def __repr__(self) -> str:
         frmtstr = self.__class__.__name__ + "(%s)"
         return frmtstr % (dict.__repr__(self))
 
     def _items(
-        self: _DT, *, deep: bool = False, return_address: bool = False
+        self: _DT,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        address_type: type = list,
     ) -> Iterator[tuple[_KT, _DT | _VT]]:
         if deep:
             if return_address:
-                for addr, v in dictparser(self):
-                    yield addr, v
+                return dictparser(self, dtype=_DEEP_TYPES, address_type=address_type)
             else:
-                for k, v in parseitems(self):
-                    yield k, v
+                return parseitems(self, dtype=_DEEP_TYPES)
         else:
-            for k, v in super().items():
-                yield k, v
+            if self._lazy is not None:
+                self._promote_all()
+            return super().items()
 
     def items(
         self: _DT,
@@ -471,6 +2110,7 @@ class DeepDict(dict, Generic[_KT, _VT]):
         deep: bool = False,
         return_address: bool = False,
         vtype: type = Any,
+        address_type: type = list,
     ) -> Iterator[tuple[_KT, _DT | _VT]]:
         """
         Returns the items. When called without arguments, it works the same as for
@@ -488,28 +2128,55 @@ class DeepDict(dict, Generic[_KT, _VT]):
             Default is False.
         vtype: type, Optional
             The type of the values to return. Default is `Any`.
+        address_type: type, Optional
+            The type of the addresses if `return_address` is `True`. It can be `list`,
+            `tuple` or :class:`~sigmaepsilon.deepdict.utils.Address`. The latter two are
+            cheaper to create than lists when walking big layouts. Default is `list`.
         """
+        if deep and vtype is not Any:
+            leaves = self._typed_leaves(vtype)
+            if leaves is not None:
+                if not return_address:
+                    yield from ((a[-1], v) for a, v in leaves)
+                elif address_type is tuple:
+                    yield from leaves
+                elif address_type is list:
+                    yield from ((list(a), v) for a, v in leaves)
+                elif address_type is Address:
+                    yield from ((Address(*a), v) for a, v in leaves)
+                else:
+                    raise TypeError(f"Invalid address type: {address_type}")
+                return
+
+        items = self._items(
+            deep=deep, return_address=return_address, address_type=address_type
+        )
         if vtype is Any:
-            for k, v in self._items(deep=deep, return_address=return_address):
-                yield k, v
+            yield from items
         else:
-            for k, v in self._items(deep=deep, return_address=return_address):
+            for k, v in items:
                 if isinstance(v, vtype):
                     yield k, v
 
     def _values(
-        self: _DT, *, deep: bool = False, return_address: bool = False
+        self: _DT,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        address_type: type = list,
     ) -> Iterator[_DT | _VT]:
         if deep:
             if return_address:
-                for addr, v in dictparser(self):
-                    yield addr, v
+                yield from dictparser(
+                    self, dtype=_DEEP_TYPES, address_type=address_type
+                )
             else:
-                for _, v in parseitems(self):
+                for _, v in parseitems(self, dtype=_DEEP_TYPES):
                     yield v
         else:
-            for v in super().values():
-                yield v
+            if self._lazy is not None:
+                self._promote_all()
+            yield from super().values()
 
     def values(
         self: _DT,
@@ -517,6 +2184,7 @@ class DeepDict(dict, Generic[_KT, _VT]):
         deep: bool = False,
         return_address: bool = False,
         vtype: _VT1 = Any,
+        address_type: type = list,
     ) -> Iterator[_DT | _VT | _VT1]:
         """
         Returns the values. When called without arguments, it works the same as for
@@ -532,12 +2200,23 @@ class DeepDict(dict, Generic[_KT, _VT]):
             Default is False.
         vtype: type, Optional
             The type of the values to return. Default is `Any`.
+        address_type: type, Optional
+            The type of the addresses if `return_address` is `True`.
+            See :func:`items` for the details. Default is `list`.
         """
+        if deep and not return_address and vtype is not Any:
+            leaves = self._typed_leaves(vtype)
+            if leaves is not None:
+                yield from (v for _, v in leaves)
+                return
+
+        values = self._values(
+            deep=deep, return_address=return_address, address_type=address_type
+        )
         if vtype is Any:
-            for v in self._values(deep=deep, return_address=return_address):
-                yield v
+            yield from values
         else:
-            for v in self._values(deep=deep, return_address=return_address):
+            for v in values:
                 if isinstance(v, vtype):
                     yield v
 
@@ -546,6 +2225,7 @@ class DeepDict(dict, Generic[_KT, _VT]):
         *,
         deep: bool = False,
         return_address: bool = False,
+        address_type: type = list,
     ) -> Iterator[_KT]:
         """
         Returns the keys. When called without arguments, it works the same as for
@@ -561,17 +2241,201 @@ class DeepDict(dict, Generic[_KT, _VT]):
             than that of absolute and repative paths. In this respect, keys are the relative
             paths (relative to the parent), and addresses are absolute paths (relative to the root).
             Default is False.
+        address_type: type, Optional
+            The type of the addresses if `return_address` is `True`.
+            See :func:`items` for the details. Default is `list`.
         """
         if deep:
             if return_address:
-                for addr, _ in dictparser(self):
+                for addr, _ in dictparser(
+                    self, dtype=_DEEP_TYPES, address_type=address_type
+                ):
                     yield addr
             else:
-                for k, _ in parseitems(self):
+                for k, _ in parseitems(self, dtype=_DEEP_TYPES):
                     yield k
         else:
-            for k in super().keys():
-                yield k
+            yield from super().keys()
+
+    async def aitems(
+        self: _DT,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        vtype: type = Any,
+        address_type: type = list,
+        every: int = 1000,
+    ) -> AsyncIterator[tuple[_KT, _DT | _VT]]:
+        """
+        Returns the items like :func:`items`, as an asynchronous iterator that
+        gives control back to the event loop after every `every` items.
+
+        Parameters
+        ----------
+        every: int, Optional
+            The number of items between two suspensions. Default is 1000.
+
+        See :func:`items` for the rest of the parameters.
+
+        Example
+        -------
+        >>> import asyncio
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> dd = DeepDict.wrap({"a": {"b": 1, "c": 2}, "d": 3})
+        >>> async def main():
+        ...     return [item async for item in dd.aitems(deep=True, every=2)]
+        >>> asyncio.run(main())
+        [('b', 1), ('c', 2), ('d', 3)]
+        """
+        items = self.items(
+            deep=deep,
+            return_address=return_address,
+            vtype=vtype,
+            address_type=address_type,
+        )
+        async for item in _suspending(items, every):
+            yield item
+
+    async def avalues(
+        self: _DT,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        vtype: _VT1 = Any,
+        address_type: type = list,
+        every: int = 1000,
+    ) -> AsyncIterator[_DT | _VT | _VT1]:
+        """
+        Returns the values like :func:`values`, as an asynchronous iterator that
+        gives control back to the event loop after every `every` values.
+
+        Parameters
+        ----------
+        every: int, Optional
+            The number of values between two suspensions. Default is 1000.
+
+        See :func:`values` for the rest of the parameters.
+        """
+        values = self.values(
+            deep=deep,
+            return_address=return_address,
+            vtype=vtype,
+            address_type=address_type,
+        )
+        async for value in _suspending(values, every):
+            yield value
+
+    async def akeys(
+        self: _DT,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        address_type: type = list,
+        every: int = 1000,
+    ) -> AsyncIterator[_KT]:
+        """
+        Returns the keys like :func:`keys`, as an asynchronous iterator that
+        gives control back to the event loop after every `every` keys.
+
+        Parameters
+        ----------
+        every: int, Optional
+            The number of keys between two suspensions. Default is 1000.
+
+        See :func:`keys` for the rest of the parameters.
+        """
+        keys = self.keys(
+            deep=deep, return_address=return_address, address_type=address_type
+        )
+        async for key in _suspending(keys, every):
+            yield key
+
+    async def aresolve(self, *, limit: int = 16, every: int = 1000) -> int:
+        """
+        Awaits the leaves that are awaitable, like coroutines, tasks or futures,
+        and replaces them with their results. At most `limit` of them are awaited
+        at the same time. Returns the number of leaves that were resolved.
+
+        Parameters
+        ----------
+        limit: int, Optional
+            The maximum number of leaves awaited at the same time. Default is 16.
+        every: int, Optional
+            The number of items visited between two suspensions while looking
+            for awaitable leaves. Default is 1000.
+
+        Notes
+        -----
+        If an instance that holds an awaitable leaf is locked, a
+        :class:`~sigmaepsilon.deepdict.exceptions.DeepDictLockedError` is
+        raised before anything is awaited. If awaiting a leaf raises an
+        exception, the leaves that are still pending are cancelled and the
+        exception is propagated, while the leaves resolved so far keep
+        their results.
+
+        Example
+        -------
+        >>> import asyncio
+        >>> from sigmaepsilon.deepdict import DeepDict
+        >>> async def load(x):
+        ...     await asyncio.sleep(0)
+        ...     return x * 2
+        >>> async def main():
+        ...     dd = DeepDict.wrap({"a": {"b": load(1)}, "c": load(2), "d": 3})
+        ...     await dd.aresolve(limit=2)
+        ...     return dd
+        >>> asyncio.run(main())
+        DeepDict({'a': DeepDict({'b': 2}), 'c': 4, 'd': 3})
+        """
+        if limit < 1:
+            raise ValueError("The limit must be a positive integer.")
+
+        pending = []
+        count = 0
+        stack = [(self, iter(_promoted_items(self)))]
+        while stack:
+            node, items = stack[-1]
+            for key, value in items:
+                count += 1
+                if count % every == 0:
+                    await asyncio.sleep(0)
+                if isinstance(value, DeepDict):
+                    stack.append((value, iter(_promoted_items(value))))
+                    break
+                elif inspect.isawaitable(value):
+                    pending.append((node, key, value))
+            else:
+                stack.pop()
+
+        for node in {id(node): node for node, _, _ in pending}.values():
+            if node.locked:
+                raise DeepDictLockedError()
+
+        semaphore = asyncio.Semaphore(limit)
+
+        async def resolve(node: DeepDict, key: Hashable, awaitable: Any) -> NoneType:
+            async with semaphore:
+                value = await awaitable
+            if isinstance(value, dict) or DeepDict._observed_roots:
+                node._setitem(key, value)
+            else:
+                if node._versions is not None or (
+                    node._cow_epoch != DeepDict._snapshot_epoch
+                    and DeepDict._live_snapshots
+                ):
+                    node._preserve()
+                dict.__setitem__(node, key, value)
+                if node._fingerprint is not None:
+                    node._invalidate_fingerprint()
+
+        tasks = [asyncio.ensure_future(resolve(*item)) for item in pending]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return len(tasks)
 
     def __before_join_parent__(
         self: _DT, parent: _DT, key: _KT | NoneType = None
@@ -592,6 +2456,10 @@ class DeepDict(dict, Generic[_KT, _VT]):
         """
         self._parent = parent
         self._key = key
+        self._clear_location()
+        self._invalidate_lock()
+        if self._observers is not None:
+            self._drop_observers()
 
     def __before_leave_parent__(self) -> NoneType:
         """Actions to be taken before leaving a parent."""
@@ -608,6 +2476,8 @@ class DeepDict(dict, Generic[_KT, _VT]):
         """
         self._parent = None
         self._key = None
+        self._clear_location()
+        self._invalidate_lock()
 
     def __leave_parent__(self) -> NoneType:
         warnings.warn(
@@ -626,3 +2496,236 @@ class DeepDict(dict, Generic[_KT, _VT]):
             DeprecationWarning,
             stacklevel=2,
         )
+
+
+class _Observers(list):
+    """
+    The observers of a root, in a list that can be referenced weakly.
+    """
+
+
+def _release_observed_root() -> NoneType:
+    DeepDict._observed_roots -= 1
+
+
+def _set_in_place(container: Any, address: Sequence, value: Any) -> NoneType:
+    """
+    Sets the item at `address` inside a container other than a `DeepDict`.
+    """
+    for key in address[:-1]:
+        container = container[key]
+    container[address[-1]] = value
+
+
+def _promoted_items(d: dict) -> Iterable[tuple[Hashable, Any]]:
+    """
+    Returns the items of a container, wrapping lazily wrapped nested
+    dictionaries first.
+    """
+    if isinstance(d, DeepDict) and d._lazy is not None:
+        d._promote_all()
+    return _items(d)
+
+
+def _map_batch(func: Callable[[Any], Any], values: list) -> list:
+    """
+    Calls a function on a batch of values. It is defined at the top level
+    of the module, so that it can be sent to a process pool.
+    """
+    return [func(value) for value in values]
+
+
+async def _suspending(items: Iterable[Any], every: int) -> AsyncIterator[Any]:
+    """
+    Yields the items, giving control back to the event loop after
+    every `every` items.
+    """
+    if every < 1:
+        raise ValueError("The value of 'every' must be a positive integer.")
+    for i, item in enumerate(items, 1):
+        yield item
+        if i % every == 0:
+            await asyncio.sleep(0)
+
+
+_DIGEST_SIZE = 16
+
+# the representations of these types are distinct and don't contain
+# the separators used for hashing
+_REPR_TYPES = frozenset((str, int, float, bool, NoneType))
+
+
+def _encode(value: Any) -> bytes:
+    """
+    Encodes a key or a leaf for hashing. Strings, numbers, booleans and `None`
+    are encoded by their representations, other values by the hash of their
+    pickled form.
+    """
+    if value.__class__ in _REPR_TYPES:
+        return repr(value).encode("utf-8", "surrogatepass")
+    data = pickle.dumps(value, protocol=4)
+    return b"p" + blake2b(data, digest_size=_DIGEST_SIZE).hexdigest().encode()
+
+
+def _node_digest(items: list[bytes]) -> bytes:
+    """
+    Returns the digest of a dictionary from the encoded items. The items are
+    sorted, which makes the result independent of their order.
+    """
+    items.sort()
+    return blake2b(b"\x01".join(items), digest_size=_DIGEST_SIZE).digest()
+
+
+def _same_leaf(a: Any, b: Any) -> bool:
+    """
+    Returns `True` if two values are of the same type and compare equal.
+    Values that can't be compared to a single boolean, like arrays, are
+    considered different.
+    """
+    if a is b:
+        return True
+    elif type(a) is not type(b):
+        return False
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def _same_fingerprint(a: Any, b: Any) -> bool:
+    """
+    Returns `True` if both values are instances with cached fingerprints
+    that are equal. Fingerprints are not computed here.
+    """
+    return (
+        isinstance(a, DeepDict)
+        and isinstance(b, DeepDict)
+        and a._fingerprint is not None
+        and a._fingerprint == b._fingerprint
+    )
+
+
+def _copied(container: Any) -> Any:
+    """
+    Returns a copy of a container other than an instance, like a standard
+    dictionary, a list or a `ColumnarTable`, with copies of the nested
+    dictionaries, lists and tables, while the other values are shared.
+    Containers that appear more than once are copied once.
+    """
+    if isinstance(container, ColumnarTable):
+        return container.copy()
+    result = shallow_copy(container)
+    if not isinstance(container, (dict, list)):
+        return result
+    memo = {id(container): result}
+    stack = [result]
+    while stack:
+        node = stack.pop()
+        items = list(node.items() if isinstance(node, dict) else enumerate(node))
+        for key, value in items:
+            if not isinstance(value, (dict, list, ColumnarTable)):
+                continue
+            copy = memo.get(id(value))
+            if copy is None:
+                if isinstance(value, ColumnarTable):
+                    copy = value.copy()
+                else:
+                    copy = shallow_copy(value)
+                    stack.append(copy)
+                memo[id(value)] = copy
+            node[key] = copy
+    return result
+
+
+def _detached(value: Any) -> Any:
+    """
+    Returns the value with nested instances turned into standard dictionaries
+    and columnar tables copied, since they are changed in place by writes
+    through the layout.
+    """
+    if isinstance(value, ColumnarTable):
+        return value.copy()
+    elif not isinstance(value, DeepDict):
+        return value
+    result = {}
+    stack = [(value, result)]
+    while stack:
+        node, d = stack.pop()
+        for key, item in _items(node):
+            if isinstance(item, dict):
+                d[key] = {}
+                stack.append((item, d[key]))
+            elif isinstance(item, ColumnarTable):
+                d[key] = item.copy()
+            else:
+                d[key] = item
+    return result
+
+
+def _reduce_part(
+    func: Callable[[Any, Any], Any], start: tuple, part: Any, vtype: Any
+) -> tuple:
+    """
+    Reduces a part of a layout, which is either an instance or a list of
+    leaves, starting from a deep copy of the value in `start`, or from the
+    first leaf if `start` is empty. The result is returned in a tuple, that is
+    empty if there was nothing to start from.
+    """
+    values = part.values(deep=True, vtype=vtype) if isinstance(part, DeepDict) else part
+    values = iter(values)
+    initial = deep_copy(start[0]) if start else next(values, _MISSING)
+    if initial is _MISSING:
+        return ()
+    return (functools.reduce(func, values, initial),)
+
+
+def _to_node_table(dd: DeepDict) -> list[tuple]:
+    """
+    Returns the nodes of a layout as a flat table in depth-first order. A row
+    holds the class of a node, the index of its parent in the table, its key,
+    name, own lock state, the keys of lazily wrapped values and its items,
+    where nested nodes are replaced by `None`.
+    """
+    table = []
+    stack = [(dd, -1, None)]
+    while stack:
+        node, parent, key = stack.pop()
+        index = len(table)
+        containers = node._containers
+        if containers is None:
+            values = list(dict.values(node))
+        else:
+            values = [None if isinstance(v, DeepDict) else v for v in dict.values(node)]
+        lazy = None if node._lazy is None else set(node._lazy)
+        table.append(
+            (
+                node.__class__,
+                parent,
+                key,
+                node._name,
+                node._locked,
+                lazy,
+                list(dict.keys(node)),
+                values,
+            )
+        )
+        if containers is not None:
+            stack.extend((c, index, k) for k, c in reversed(containers.items()))
+    return table
+
+
+def _from_node_table(table: list[tuple]) -> DeepDict:
+    """
+    Rebuilds a layout from a table created by :func:`_to_node_table`.
+    """
+    nodes = []
+    for cls, parent, key, name, locked, lazy, keys, values in table:
+        node = cls()
+        node._name = name
+        node._locked = locked
+        node._lazy = lazy
+        dict.update(node, zip(keys, values))
+        if parent >= 0:
+            nodes[parent]._attach(key, node)
+        nodes.append(node)
+    return nodes[0]
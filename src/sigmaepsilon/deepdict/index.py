@@ -0,0 +1,299 @@
+from typing import Any, Callable, Hashable, Iterator, Sequence
+from collections.abc import Mapping
+from heapq import merge
+from itertools import count
+from operator import itemgetter
+
+from .deepdict import DeepDict, _MISSING, _SPECIAL_KEY_TYPES
+from .columnar import ColumnarTable
+from .utils import Address
+
+__all__ = ["AddressIndex", "LeafTypeIndex"]
+
+
+def _walk(
+    node: DeepDict, prefix: tuple, skip: tuple = _SPECIAL_KEY_TYPES
+) -> Iterator[tuple[tuple, Any]]:
+    """
+    Yields the addresses and the values of all the items below a node
+    in depth-first order. By default, items with keys that would be
+    interpreted as addresses themselves are skipped along with everything
+    below them, this can be controlled with the types in `skip`.
+    """
+    node._promote_all()
+    stack = [(prefix, iter(dict.items(node)))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if isinstance(key, skip):
+                continue
+
+            address = prefix + (key,)
+            yield address, value
+
+            if isinstance(value, DeepDict):
+                value._promote_all()
+                stack.append((address, iter(dict.items(value))))
+                break
+        else:
+            stack.pop()
+
+
+class AddressIndex(Mapping):
+    """
+    A flat, read-only view of a `DeepDict` that maps the addresses of all
+    the items in the layout to their values, including the addresses of the
+    nested dictionaries. The addresses are tuples of keys.
+
+    An index is not created directly, but with the `enable_index` method of
+    a root `DeepDict`, which keeps it up to date as the layout changes.
+
+    Parameters
+    ----------
+    root: DeepDict
+        The root of the indexed layout.
+
+    Example
+    -------
+    >>> from sigmaepsilon.deepdict import DeepDict
+    >>> dd = DeepDict.wrap({"a": {"b": {"c": 1}}, "d": 2})
+    >>> index = dd.enable_index()
+    >>> index["a", "b", "c"]
+    1
+    >>> dd["a", "e"] = 3
+    >>> list(index)
+    [('a',), ('a', 'b'), ('a', 'b', 'c'), ('d',), ('a', 'e')]
+    """
+
+    __slots__ = ["_root", "_entries"]
+
+    def __init__(self, root: DeepDict):
+        self._root = root
+        self._entries = dict(_walk(root, ()))
+
+    @property
+    def root(self) -> DeepDict:
+        """
+        Returns the indexed `DeepDict`.
+        """
+        return self._root
+
+    def _lookup(self, address: Sequence) -> Any:
+        """
+        Returns the value at `address`, or a sentinel if the address is not
+        in the index.
+        """
+        if isinstance(address, list):
+            address = tuple(address)
+        try:
+            return self._entries.get(address, _MISSING)
+        except TypeError:
+            return _MISSING
+
+    def __getitem__(self, address: Sequence) -> Any:
+        value = self._lookup(address)
+        if value is _MISSING:
+            raise KeyError(address)
+        return value
+
+    def __contains__(self, address: Any) -> bool:
+        return self._lookup(address) is not _MISSING
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def under(self, prefix: Sequence) -> Iterator[tuple[tuple, Any]]:
+        """
+        Yields the addresses and the values of all the items below the
+        address `prefix` in depth-first order. Only the nested dictionary
+        at the prefix is looked up in the index, the items below it are
+        read from the layout by walking the dictionary. Hence the cost is
+        proportional to the number of items below the prefix, but it is
+        not cheaper than walking the nested dictionary directly.
+
+        Parameters
+        ----------
+        prefix: Sequence
+            The address of a nested dictionary. An empty prefix means
+            the whole layout.
+        """
+        prefix = tuple(prefix)
+        node = self._root if not prefix else self._lookup(prefix)
+        if isinstance(node, DeepDict):
+            yield from _walk(node, prefix)
+
+    def on_set(self, address: Address, value: Any) -> None:
+        address = address.totuple()
+        if not self._accepts(address):
+            return
+
+        self._entries[address] = value
+        if isinstance(value, DeepDict):
+            self._entries.update(_walk(value, address))
+
+    def on_delete(self, address: Address, value: Any) -> None:
+        address = address.totuple()
+        if self._entries.pop(address, _MISSING) is _MISSING:
+            return
+
+        if isinstance(value, DeepDict):
+            for subaddress, _ in _walk(value, address):
+                self._entries.pop(subaddress, None)
+
+    def _accepts(self, address: tuple[Hashable, ...]) -> bool:
+        """
+        Returns `True` if the address can be resolved with the index.
+        """
+        if isinstance(address[-1], _SPECIAL_KEY_TYPES):
+            return False
+        return len(address) == 1 or address[:-1] in self._entries
+
+
+class LeafTypeIndex:
+    """
+    An index of the leaves of a `DeepDict`, partitioned by their types. It
+    makes deep iteration filtered by the type of the values cost proportional
+    to the number of matching leaves.
+
+    An index is not created directly, but with the `enable_type_index` method
+    of a root `DeepDict`, which keeps it up to date as the layout changes.
+
+    Parameters
+    ----------
+    root: DeepDict
+        The root of the indexed layout.
+    """
+
+    __slots__ = ["_root", "_buckets", "_plain", "_counter", "_ordered"]
+
+    def __init__(self, root: DeepDict):
+        self._root = root
+        self._buckets = {}
+        self._plain = 0
+        self._counter = count()
+        for address, value in _walk(root, (), ()):
+            self._add(address, value)
+        # True while the order of insertion is the depth-first order
+        self._ordered = True
+
+    @property
+    def root(self) -> DeepDict:
+        """
+        Returns the indexed `DeepDict`.
+        """
+        return self._root
+
+    @property
+    def complete(self) -> bool:
+        """
+        Returns `True` if the index covers all the leaves of the layout. This
+        is not the case if the layout has values that are standard dictionaries
+        or columnar tables, since changes inside them can't be followed.
+        """
+        return self._plain == 0
+
+    def types(self) -> list[type]:
+        """
+        Returns the types of the leaves.
+        """
+        return list(self._buckets)
+
+    def find(self, vtype: type | tuple) -> Iterator[tuple[tuple, Any]]:
+        """
+        Returns an iterator over the addresses and the values of the leaves,
+        which are instances of `vtype`, in depth-first order, the same order
+        the deep iteration of the layout yields them.
+
+        As long as the layout only loses items, the leaves are returned in
+        the order they were inserted, which is the depth-first order. Once
+        an item is set, the matching leaves are sorted by the positions of
+        their keys in the nested dictionaries, which costs an extra pass over
+        the nested dictionaries that hold them.
+
+        Parameters
+        ----------
+        vtype: type or tuple
+            A type or a tuple of types, as accepted by :func:`isinstance`.
+        """
+        buckets = [b for t, b in self._buckets.items() if issubclass(t, vtype)]
+        if not self._ordered:
+            leaves = [(a, v) for b in buckets for a, (_, v) in b.items()]
+            leaves.sort(key=self._positions())
+            return iter(leaves)
+        if len(buckets) == 1:
+            return ((a, v) for a, (_, v) in buckets[0].items())
+        streams = [((i, a, v) for a, (i, v) in b.items()) for b in buckets]
+        return ((a, v) for _, a, v in merge(*streams, key=itemgetter(0)))
+
+    def _positions(self) -> Callable[[tuple[tuple, Any]], tuple[int, ...]]:
+        """
+        Returns a sort key for leaves, that maps the address of a leaf to the
+        positions of its keys in the nested dictionaries along the address.
+        """
+        root = self._root
+        nodes = {(): root}
+        positions = {}
+
+        def node_at(prefix: tuple) -> DeepDict:
+            node = nodes.get(prefix)
+            if node is None:
+                parent = node_at(prefix[:-1])
+                node = nodes[prefix] = dict.__getitem__(parent, prefix[-1])
+            return node
+
+        def key(leaf: tuple[tuple, Any]) -> tuple[int, ...]:
+            address = leaf[0]
+            result = []
+            for i in range(len(address)):
+                prefix = address[:i]
+                found = positions.get(prefix)
+                if found is None:
+                    keys = dict.keys(node_at(prefix))
+                    found = positions[prefix] = {k: j for j, k in enumerate(keys)}
+                result.append(found[address[i]])
+            return tuple(result)
+
+        return key
+
+    def _add(self, address: tuple, value: Any) -> None:
+        if isinstance(value, DeepDict):
+            return
+        elif isinstance(value, (dict, ColumnarTable)):
+            self._plain += 1
+            return
+
+        bucket = self._buckets.get(type(value))
+        if bucket is None:
+            bucket = self._buckets[type(value)] = {}
+        bucket[address] = (next(self._counter), value)
+
+    def _remove(self, address: tuple, value: Any) -> None:
+        if isinstance(value, DeepDict):
+            return
+        elif isinstance(value, (dict, ColumnarTable)):
+            self._plain -= 1
+            return
+
+        bucket = self._buckets[type(value)]
+        del bucket[address]
+        if not bucket:
+            del self._buckets[type(value)]
+
+    def on_set(self, address: Address, value: Any) -> None:
+        address = address.totuple()
+        # the new items are inserted last, wherever they are in the layout
+        self._ordered = False
+        self._add(address, value)
+        if isinstance(value, DeepDict):
+            for subaddress, subvalue in _walk(value, address, ()):
+                self._add(subaddress, subvalue)
+
+    def on_delete(self, address: Address, value: Any) -> None:
+        address = address.totuple()
+        self._remove(address, value)
+        if isinstance(value, DeepDict):
+            for subaddress, subvalue in _walk(value, address, ()):
+                self._remove(subaddress, subvalue)
@@ -0,0 +1,132 @@
+from typing import Any, Hashable
+
+from .deepdict import DeepDict, _MISSING, _detached
+from .utils import Address
+
+__all__ = ["Journal"]
+
+
+class Journal:
+    """
+    A record of the addresses of a `DeepDict` that changed since the last
+    checkpoint. The journal is compacted as it is written: only the last
+    change of an address is kept, the changes below an address that was set
+    or deleted later are covered by that change, and addresses that were
+    added after the checkpoint and deleted since are left out.
+
+    A journal is not created directly, but with the `enable_journal` method
+    of a root `DeepDict`, which keeps it up to date as the layout changes.
+
+    Parameters
+    ----------
+    root: DeepDict
+        The root of the layout.
+
+    Example
+    -------
+    >>> from sigmaepsilon.deepdict import DeepDict
+    >>> dd = DeepDict.wrap({"a": {"b": 1, "c": 2}, "d": 3})
+    >>> journal = dd.enable_journal()
+    >>> dd["a", "b"] = 10
+    >>> dd["e", "f"] = 4
+    >>> del dd["d"]
+    >>> journal.dirty_addresses()
+    [('a', 'b'), ('e',), ('d',)]
+    >>> journal.changes()
+    [('add', ('a', 'b'), 10), ('add', ('e',), {'f': 4}), ('remove', ('d',), None)]
+    >>> journal.clear_dirty()
+    >>> journal.changes()
+    []
+    """
+
+    __slots__ = ["_root", "_log"]
+
+    def __init__(self, root: DeepDict):
+        self._root = root
+        # address -> (True if the item existed at the checkpoint, True if
+        # the item was set and False if it was deleted last)
+        self._log = {}
+
+    @property
+    def root(self) -> DeepDict:
+        """
+        Returns the root of the layout.
+        """
+        return self._root
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def dirty_addresses(self) -> list[tuple]:
+        """
+        Returns the addresses that changed since the last checkpoint, in the
+        order of their last changes. Addresses below another changed address
+        are left out.
+        """
+        return [address for address, _ in self._compacted()]
+
+    def changes(self) -> list[tuple[str, tuple, Any]]:
+        """
+        Returns the changes since the last checkpoint as a list of operations
+        `(op, address, value)`, where `op` is either 'add' or 'remove'. The
+        values are the current values of the layout at the addresses, nested
+        instances are returned as standard dictionaries. The operations can be
+        applied to a copy of the layout taken at the last checkpoint with the
+        `patch` method of `DeepDict`.
+        """
+        result = []
+        for address, is_set in self._compacted():
+            if is_set:
+                result.append(("add", address, _detached(self._value(address))))
+            else:
+                result.append(("remove", address, None))
+        return result
+
+    def clear_dirty(self) -> None:
+        """
+        Forgets all the changes, marking a checkpoint.
+        """
+        self._log.clear()
+
+    def _compacted(self) -> list[tuple[tuple, bool]]:
+        log = self._log
+        result = []
+        for address, (existed, is_set) in log.items():
+            if not (existed or is_set):
+                # added and deleted since the checkpoint, but it still covers
+                # the changes below it
+                continue
+            for i in range(1, len(address)):
+                if address[:i] in log:
+                    break
+            else:
+                result.append((address, is_set))
+        return result
+
+    def _value(self, address: tuple[Hashable, ...]) -> Any:
+        node = self._root
+        for key in address:
+            if node._lazy is not None and key in node._lazy:
+                node = node._promote(key)
+            else:
+                node = dict.get(node, key, _MISSING)
+        return node
+
+    def _touch(self, address: Address, is_set: bool) -> None:
+        address = address.totuple()
+        log = self._log
+        # the address is moved to the end
+        entry = log.pop(address, None)
+        if entry is None:
+            # an existing item is always deleted before it is set again,
+            # hence the first change of an item that existed is a deletion
+            existed = not is_set
+        else:
+            existed = entry[0]
+        log[address] = (existed, is_set)
+
+    def on_set(self, address: Address, value: Any) -> None:
+        self._touch(address, True)
+
+    def on_delete(self, address: Address, value: Any) -> None:
+        self._touch(address, False)
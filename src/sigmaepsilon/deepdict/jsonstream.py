@@ -0,0 +1,593 @@
+"""
+Streaming JSON and NDJSON input and output for `DeepDict` instances.
+
+The JSON loader reads the document in chunks and builds the layout directly,
+so there is no intermediate copy of the data as nested standard dictionaries.
+Objects become nested instances and everything else, including arrays, is
+stored as a leaf, the same way as :func:`DeepDict.wrap` would store it. The
+objects that fit into the buffer are decoded at once by the decoder of the
+standard library, the loader only walks the ones that don't, level by level.
+
+The writers walk the layout item by item with the traversal engine of the
+library and write the output in chunks, hence they only need a small, constant
+amount of memory on top of the layout itself.
+"""
+from typing import Any, Callable, Iterator, TextIO
+from itertools import chain
+from os import PathLike
+import io
+import json
+
+from .deepdict import DeepDict
+from .columnar import ColumnarTable
+from .utils import _traverse
+
+__all__ = ["loadjson", "loadndjson", "dumpjson", "dumpndjson"]
+
+
+_WHITESPACE = " \t\n\r"
+_NUMBER = "0123456789+-.eE"
+_decoder = json.JSONDecoder()
+_encoder = json.JSONEncoder()
+_encode_string = json.encoder.encode_basestring_ascii
+_INFINITY = (float("inf"), float("-inf"))
+# closes the items of every dictionary for the writer of JSON documents
+_END = object()
+_CLOSE = ((_END, None),)
+
+
+class _Reader:
+    """
+    A buffer over a text stream, that is refilled on demand.
+    """
+
+    __slots__ = [
+        "_file",
+        "_chunk_size",
+        "buffer",
+        "pos",
+        "eof",
+        "_offset",
+        "_lines",
+        "_line_start",
+    ]
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # the number of characters and lines dropped from the buffer, and the
+        # position of the start of the last dropped line in the document
+        self._offset = 0
+        self._lines = 0
+        self._line_start = 0
+
+    def fill(self, size: int | None = None) -> bool:
+        """
+        Reads more data into the buffer. Returns `False` at the end of the stream.
+        """
+        if self.eof:
+            return False
+        data = self._file.read(max(size or 0, self._chunk_size))
+        if not data:
+            self.eof = True
+            return False
+        buffer, pos = self.buffer, self.pos
+        lines = buffer.count("\n", 0, pos)
+        if lines:
+            self._lines += lines
+            self._line_start = self._offset + buffer.rfind("\n", 0, pos) + 1
+        self._offset += pos
+        self.buffer = buffer[pos:] + data
+        self.pos = 0
+        return True
+
+    def error(self, msg: str, pos: int | None = None) -> json.JSONDecodeError:
+        """
+        Returns an error at a position of the buffer, with the position, the
+        line and the column of the error in the whole document.
+        """
+        buffer = self.buffer
+        pos = self.pos if pos is None else pos
+        lineno = self._lines + buffer.count("\n", 0, pos) + 1
+        start = buffer.rfind("\n", 0, pos)
+        start = self._line_start if start < 0 else self._offset + start + 1
+        error = json.JSONDecodeError(msg, buffer, pos)
+        error.pos = self._offset + pos
+        error.lineno = lineno
+        error.colno = error.pos - start + 1
+        error.args = (f"{msg}: line {lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+    def peek(self) -> str:
+        """
+        Returns the next character that is not whitespace, without consuming it.
+        Returns an empty string at the end of the stream.
+        """
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer) or not self.fill():
+                return buffer[pos] if pos < len(buffer) else ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise self.error(f"Expected one of {list(chars)}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        Decodes a value that is not an object.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if not self.fill(2 * len(self.buffer)):
+                    raise self.error(error.msg, error.pos) from None
+                continue
+            if (
+                not self.eof
+                and isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] in _NUMBER)
+                and self.fill()
+            ):
+                # the number might continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+    def object(self) -> dict | None:
+        """
+        Decodes an object if it ends within the buffer, otherwise returns None.
+        """
+        try:
+            value, self.pos = _decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError:
+            return None
+        return value
+
+
+def _build(cls: type, d: dict, keys: dict[str, str]) -> DeepDict:
+    """
+    Builds a layout from a decoded object, like :func:`DeepDict.wrap`. Equal
+    keys are shared through `keys` across the objects of the document.
+    """
+    setitem = dict.__setitem__
+    root = cls()
+    stack = [(root, iter(d.items()))]
+    while stack:
+        node, items = stack[-1]
+        for key, value in items:
+            key = keys.setdefault(key, key)
+            if isinstance(value, dict):
+                child = cls()
+                node._attach(key, child)
+                stack.append((child, iter(value.items())))
+                break
+            setitem(node, key, value)
+        else:
+            stack.pop()
+    return root
+
+
+def _open(
+    file: str | PathLike | TextIO, mode: str = "r"
+) -> tuple[TextIO, Callable[[], Any]]:
+    """
+    Returns a text stream and a function that releases it.
+    """
+    if hasattr(file, "read" if mode == "r" else "write"):
+        if isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+            # detached at the end, so that the file of the caller is not closed
+            wrapper = io.TextIOWrapper(file, encoding="utf-8")
+            return wrapper, wrapper.detach
+        return file, lambda: None
+    file = open(file, mode, encoding="utf-8")
+    return file, file.close
+
+
+class _Writer:
+    """
+    Collects the pieces of the output and writes them in chunks.
+    """
+
+    __slots__ = ["_file", "_chunk_size", "_parts", "_size"]
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self._file.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+
+def _merge(root: DeepDict, address: tuple, value: Any, cls: type) -> None:
+    """
+    Sets a value at an address of a layout, and merges dictionaries into the
+    `DeepDict` instances that already exist there. Values on the way that are not
+    instances of `DeepDict` are replaced.
+    """
+
+    def child(node: DeepDict, key: str) -> DeepDict:
+        if not isinstance(dict.get(node, key), DeepDict):
+            node[key] = cls()
+        return dict.__getitem__(node, key)
+
+    node = root
+    for key in address[:-1]:
+        node = child(node, key)
+    if not isinstance(value, dict):
+        node[address[-1]] = value
+        return
+    stack = [(child(node, address[-1]), iter(value.items()))]
+    while stack:
+        node, items = stack[-1]
+        for key, value in items:
+            if isinstance(value, dict):
+                stack.append((child(node, key), iter(value.items())))
+                break
+            node[key] = value
+        else:
+            stack.pop()
+
+
+def _closed_items(d: dict) -> Iterator[tuple[Any, Any]]:
+    """
+    Returns the items of a dictionary, followed by an item with the key `_END`.
+    """
+    return chain(dict.items(d), _CLOSE)
+
+
+def _write_table(write: Callable[[str], None], table: ColumnarTable) -> None:
+    """
+    Writes a columnar table as an object of its records, record by record.
+    """
+    write("{")
+    comma = ""
+    for key, record in table.items():
+        fields = ", ".join(f"{_key(f)}: {_encode_leaf(v)}" for f, v in record.items())
+        write(f"{comma}{_key(key)}: {{{fields}}}")
+        comma = ", "
+    write("}")
+
+
+def _write_table_lines(
+    write: Callable[[str], None], table: ColumnarTable, name: str, sep: str
+) -> None:
+    """
+    Writes the fields of the records of a columnar table as lines of NDJSON,
+    where `name` is the address of the table. Empty tables and records are
+    written as empty objects.
+    """
+    if not table:
+        write(f"{{{_encode_string(name)}: {{}}}}\n")
+    for key, record in table.items():
+        prefix = name + sep + str(key)
+        if not record:
+            write(f"{{{_encode_string(prefix)}: {{}}}}\n")
+        for field, value in record.items():
+            key = _encode_string(prefix + sep + str(field))
+            write(f"{{{key}: {_encode_leaf(value)}}}\n")
+
+
+def _encode_leaf(value: Any) -> str:
+    """
+    Encodes a value, with shortcuts for the common scalar types.
+    """
+    cls = value.__class__
+    if cls is str:
+        return _encode_string(value)
+    elif cls is int:
+        return int.__repr__(value)
+    elif cls is float and value == value and value not in _INFINITY:
+        return float.__repr__(value)
+    elif value is None:
+        return "null"
+    return _encoder.encode(value)
+
+
+def _key(key: Any) -> str:
+    """
+    Encodes a key the same way as the encoder of the standard library does.
+    """
+    if isinstance(key, str):
+        return _encode_string(key)
+    elif key is True:
+        return '"true"'
+    elif key is False:
+        return '"false"'
+    elif key is None:
+        return '"null"'
+    elif isinstance(key, (int, float)):
+        return '"' + _encoder.encode(key) + '"'
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+
+def loadjson(
+    file: str | PathLike | TextIO,
+    *,
+    cls: type = DeepDict,
+    chunk_size: int = 2**16,
+) -> DeepDict:
+    """
+    Loads a JSON document into a `DeepDict`, reading it in chunks. The top level
+    of the document must be an object.
+
+    Parameters
+    ----------
+    file: str or PathLike or TextIO
+        A path or a file object.
+    cls: type, Optional
+        The class of the created instances. Default is `DeepDict`.
+    chunk_size: int, Optional
+        The number of characters to read at once. Default is 65536.
+
+    Example
+    -------
+    >>> import io
+    >>> from sigmaepsilon.deepdict import loadjson
+    >>> dd = loadjson(io.StringIO('{"a": {"b": [1, 2], "c": {"d": null}}}'))
+    >>> dd["a", "c", "d"] is None
+    True
+    >>> dd["a", "c"].address
+    ['a', 'c']
+    """
+    file, release = _open(file)
+    try:
+        reader = _Reader(file, chunk_size)
+        if reader.peek() != "{":
+            raise reader.error("The top level of the document must be an object")
+
+        # Objects that end within the buffer are decoded at once, the others
+        # are built here level by level, while the buffer is refilled.
+        keys = {}
+        stack = []
+        d = reader.object()
+        if d is None:
+            reader.pos += 1
+            root = cls()
+            stack.append(root)
+        else:
+            root = _build(cls, d, keys)
+        first = True
+
+        setitem = dict.__setitem__
+        while stack:
+            node = stack[-1]
+            if first:
+                first = False
+                if reader.peek() == "}":
+                    reader.pos += 1
+                    stack.pop()
+                    continue
+            elif reader.expect(",}") == "}":
+                stack.pop()
+                continue
+
+            if reader.peek() != '"':
+                raise reader.error("Expected a key")
+            key = reader.value()
+            key = keys.setdefault(key, key)
+            reader.expect(":")
+
+            if reader.peek() == "{":
+                d = reader.object()
+                if d is None:
+                    reader.pos += 1
+                    child = cls()
+                    stack.append(child)
+                    first = True
+                else:
+                    child = _build(cls, d, keys)
+                if dict.__contains__(node, key):
+                    node._setitem(key, child)
+                else:
+                    node._attach(key, child)
+            else:
+                value = reader.value()
+                if dict.__contains__(node, key):
+                    node._setitem(key, value)
+                else:
+                    setitem(node, key, value)
+
+        if reader.peek():
+            raise reader.error("Extra data")
+        return root
+    finally:
+        release()
+
+
+def loadndjson(
+    file: str | PathLike | TextIO,
+    *,
+    sep: str | None = ".",
+    cls: type = DeepDict,
+) -> DeepDict:
+    """
+    Loads an NDJSON file into a `DeepDict`, line by line. Every line is an object
+    that maps addresses to values, and all the lines are merged into one layout.
+    The keys of an address are joined by `sep` in the file.
+
+    Parameters
+    ----------
+    file: str or PathLike or TextIO
+        A path or a file object.
+    sep: str, Optional
+        The separator of the keys of the addresses. If it is None, the addresses
+        are single keys. Default is '.'.
+    cls: type, Optional
+        The class of the created instances. Default is `DeepDict`.
+
+    Example
+    -------
+    >>> import io
+    >>> from sigmaepsilon.deepdict import loadndjson
+    >>> lines = '{"a.b": 1}\\n{"a.c": {"d": 2}, "e": 3}\\n'
+    >>> dd = loadndjson(io.StringIO(lines))
+    >>> dd["a", "c", "d"], dd["e"]
+    (2, 3)
+
+    Objects are merged into the dictionaries that already exist at their
+    addresses, and values that are not dictionaries are replaced, also on the
+    way to an address.
+
+    >>> lines = '{"a.b": 1, "a.c": 2}\\n{"a": {"c": {"d": 3}, "e": 4}}\\n'
+    >>> loadndjson(io.StringIO(lines)).to_dict()
+    {'a': {'b': 1, 'c': {'d': 3}, 'e': 4}}
+    """
+    file, release = _open(file)
+    try:
+        root = cls()
+        for line in file:
+            if not line.strip():
+                continue
+            for address, value in json.loads(line).items():
+                address = (address,) if sep is None else tuple(address.split(sep))
+                _merge(root, address, value, cls)
+        return root
+    finally:
+        release()
+
+
+def dumpjson(
+    dd: DeepDict, file: str | PathLike | TextIO, *, chunk_size: int = 2**16
+) -> None:
+    """
+    Writes a `DeepDict` to a file as a JSON document, in chunks. The output is
+    the same as that of :func:`json.dump` with the default settings, columnar
+    tables are written as objects of their records.
+
+    Parameters
+    ----------
+    dd: DeepDict
+        The dictionary to write.
+    file: str or PathLike or TextIO
+        A path or a file object.
+    chunk_size: int, Optional
+        The number of characters to write at once. Default is 65536.
+
+    Example
+    -------
+    >>> import io
+    >>> from sigmaepsilon.deepdict import DeepDict, dumpjson
+    >>> dd = DeepDict.wrap({"a": {"b": [1, 2], "c": {"d": None}}, "e": 1.5})
+    >>> file = io.StringIO()
+    >>> dumpjson(dd, file)
+    >>> file.getvalue()
+    '{"a": {"b": [1, 2], "c": {"d": null}}, "e": 1.5}'
+    """
+    file, release = _open(file, "w")
+    try:
+        writer = _Writer(file, chunk_size)
+        write = writer.write
+        write("{")
+        # the separator before the next item
+        comma = ""
+        for key, value in _traverse(dd, containers=True, items=_closed_items):
+            if key is _END:
+                write("}")
+                comma = ", "
+            elif isinstance(value, dict):
+                write(f"{comma}{_key(key)}: {{")
+                comma = ""
+            else:
+                try:
+                    text = _encode_leaf(value)
+                except TypeError:
+                    if not isinstance(value, ColumnarTable):
+                        raise
+                    write(f"{comma}{_key(key)}: ")
+                    _write_table(write, value)
+                else:
+                    write(f"{comma}{_key(key)}: {text}")
+                comma = ", "
+        writer.flush()
+    finally:
+        release()
+
+
+def dumpndjson(
+    dd: DeepDict,
+    file: str | PathLike | TextIO,
+    *,
+    sep: str = ".",
+    chunk_size: int = 2**16,
+) -> None:
+    """
+    Writes a `DeepDict` to a file in NDJSON format, with one object on every
+    line that maps the address of a leaf to its value. The keys of an address
+    are converted to strings and joined by `sep`. The fields of the records of
+    columnar tables are written as leaves. Empty dictionaries are written as
+    leaves, hence the file can be loaded back with :func:`loadndjson`.
+
+    Parameters
+    ----------
+    dd: DeepDict
+        The dictionary to write.
+    file: str or PathLike or TextIO
+        A path or a file object.
+    sep: str, Optional
+        The separator of the keys of the addresses. Default is '.'.
+    chunk_size: int, Optional
+        The number of characters to write at once. Default is 65536.
+
+    Example
+    -------
+    >>> import io
+    >>> from sigmaepsilon.deepdict import DeepDict, dumpndjson
+    >>> dd = DeepDict.wrap({"a": {"b": [1, 2], "c": {}}, "d": None})
+    >>> file = io.StringIO()
+    >>> dumpndjson(dd, file)
+    >>> print(file.getvalue(), end="")
+    {"a.b": [1, 2]}
+    {"a.c": {}}
+    {"d": null}
+    """
+    file, release = _open(file, "w")
+    try:
+        writer = _Writer(file, chunk_size)
+        write = writer.write
+        # the prefixes of the addresses of the open dictionaries
+        prefixes = [""]
+        for key, value in _traverse(dd, containers=True, items=_closed_items):
+            if key is _END:
+                prefixes.pop()
+            elif isinstance(value, dict) and value:
+                prefixes.append(prefixes[-1] + str(key) + sep)
+            else:
+                name = prefixes[-1] + str(key)
+                try:
+                    text = _encode_leaf(value)
+                except TypeError:
+                    if not isinstance(value, ColumnarTable):
+                        raise
+                    _write_table_lines(write, value, name, sep)
+                else:
+                    write(f"{{{_encode_string(name)}: {text}}}\n")
+                if isinstance(value, dict):
+                    # balances the end of the empty dictionary
+                    prefixes.append(None)
+        writer.flush()
+    finally:
+        release()
@@ -0,0 +1,227 @@
+from typing import Any, Hashable, Iterator
+from collections.abc import Mapping
+import weakref
+
+from .deepdict import DeepDict, Key, _MISSING, _DEEP_TYPES
+from .columnar import ColumnarTable
+from .exceptions import DeepDictLockedError
+from .utils import _issequence, _traverse
+
+__all__ = ["Snapshot"]
+
+
+class _Epoch:
+    """
+    The epoch of a snapshot. The epoch is alive as long as any view of the
+    snapshot refers to it.
+    """
+
+    __slots__ = ["value", "__weakref__"]
+
+    def __init__(self, value: int):
+        self.value = value
+
+
+def _take(node: DeepDict) -> "Snapshot":
+    DeepDict._snapshot_epoch += 1
+    epoch = _Epoch(DeepDict._snapshot_epoch)
+    DeepDict._live_snapshots.add(epoch.value)
+    weakref.finalize(epoch, DeepDict._live_snapshots.discard, epoch.value)
+    # only the layout of the instance saves its items for the snapshot
+    node._pin((epoch.value,))
+    return Snapshot(node, epoch)
+
+
+class Snapshot(Mapping):
+    """
+    A read-only view of a `DeepDict` as it was when the view was created. The
+    view shares the instances of the layout and an instance only saves its items
+    when it is changed for the first time after a snapshot was taken, hence
+    taking a snapshot is a constant time operation and the memory it needs is
+    proportional to the number of instances changed afterwards.
+
+    A snapshot is not created directly, but with the `snapshot` method of a
+    `DeepDict`. Nested dictionaries are returned as snapshots as well.
+    Snapshots are locked, any attempt to change them raises a
+    :class:`~sigmaepsilon.deepdict.exceptions.DeepDictLockedError`.
+
+    Parameters
+    ----------
+    node: dict
+        The `DeepDict` or the nested dictionary the view is created for.
+    epoch: _Epoch
+        The epoch of the snapshot.
+
+    Notes
+    -----
+    In-place changes of mutable leaves, like appending to a list, are visible
+    through the snapshots.
+
+    Example
+    -------
+    >>> from sigmaepsilon.deepdict import DeepDict
+    >>> dd = DeepDict.wrap({"a": {"b": 1, "c": 2}, "d": 3})
+    >>> snapshot = dd.snapshot()
+    >>> dd["a", "b"] = 10
+    >>> del dd["d"]
+    >>> snapshot["a", "b"], snapshot["d"]
+    (1, 3)
+    >>> snapshot.to_dict()
+    {'a': {'b': 1, 'c': 2}, 'd': 3}
+    >>> snapshot.locked
+    True
+    """
+
+    __slots__ = ["_node", "_epoch"]
+
+    def __init__(self, node: dict, epoch: _Epoch):
+        self._node = node
+        self._epoch = epoch
+
+    @property
+    def locked(self) -> bool:
+        """
+        Returns `True`, snapshots are always locked.
+        """
+        return True
+
+    def _version(self) -> dict | None:
+        """
+        Returns the items the instance saved for the snapshot, or None if the
+        instance has not changed since the snapshot was taken.
+        """
+        node = self._node
+        versions = node._versions if isinstance(node, DeepDict) else None
+        if not versions:
+            return None
+        epoch = self._epoch.value
+        found = None
+        for version in tuple(versions):
+            if version >= epoch and (found is None or version < found):
+                found = version
+        return None if found is None else versions.get(found)
+
+    def _items(self) -> list[tuple[Hashable, Any]]:
+        # The live items are read first. If the instance is changed in the
+        # meantime, it saves its items before the change, so they are found
+        # by the check that follows.
+        items = list(dict.items(self._node))
+        version = self._version()
+        if version is not None:
+            items = list(version.items())
+        return [(key, self._view(value)) for key, value in items]
+
+    def _view(self, value: Any) -> Any:
+        return Snapshot(value, self._epoch) if isinstance(value, dict) else value
+
+    def _get(self, key: Hashable) -> Any:
+        value = dict.get(self._node, key, _MISSING)
+        version = self._version()
+        if version is not None:
+            value = version.get(key, _MISSING)
+        return value if value is _MISSING else self._view(value)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, Key) or not _issequence(key):
+            value = self._get(key.wrapped if isinstance(key, Key) else key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+
+        value = self
+        for subkey in key:
+            if not isinstance(value, Mapping):
+                raise KeyError(tuple(key))
+            value = value[subkey]
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        try:
+            self[key]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter([key for key, _ in self._items()])
+
+    def __len__(self) -> int:
+        version = self._version()
+        return len(self._node) if version is None else len(version)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        raise DeepDictLockedError("Snapshots are read-only!")
+
+    def __delitem__(self, key: Any) -> None:
+        raise DeepDictLockedError("Snapshots are read-only!")
+
+    def items(
+        self,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        address_type: type = list,
+    ) -> Iterator[tuple[Hashable, Any]]:
+        """
+        Returns the items. The parameters are the same as for the `items`
+        method of `DeepDict`.
+        """
+        if not deep:
+            return iter(self._items())
+        return _traverse(
+            self,
+            dtype=(Snapshot,) + _DEEP_TYPES,
+            address_type=address_type if return_address else None,
+            items=_snapshot_items,
+        )
+
+    def values(self, *, deep: bool = False) -> Iterator[Any]:
+        """
+        Returns the values. With `deep=True`, the leaves are returned.
+        """
+        return (value for _, value in self.items(deep=deep))
+
+    def keys(
+        self,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        address_type: type = list,
+    ) -> Iterator[Hashable]:
+        """
+        Returns the keys. The parameters are the same as for the `keys`
+        method of `DeepDict`.
+        """
+        items = self.items(
+            deep=deep, return_address=return_address, address_type=address_type
+        )
+        return (key for key, _ in items)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the content of the snapshot as nested standard dictionaries,
+        the same way as the `to_dict` method of `DeepDict` does.
+        """
+        root = {}
+        stack = [(root, iter(self._items()))]
+        while stack:
+            result, items = stack[-1]
+            for key, value in items:
+                if isinstance(value, Snapshot):
+                    result[key] = {}
+                    stack.append((result[key], iter(value._items())))
+                    break
+                elif isinstance(value, ColumnarTable):
+                    result[key] = value.to_dict()
+                else:
+                    result[key] = value
+            else:
+                stack.pop()
+        return root
+
+    def __repr__(self) -> str:
+        return f"Snapshot({self.to_dict()})"
+
+
+def _snapshot_items(d: Any) -> Any:
+    return d._items() if isinstance(d, Snapshot) else d.items()
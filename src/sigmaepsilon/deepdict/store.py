@@ -0,0 +1,449 @@
+from typing import Any, Hashable, Iterator, Iterable
+from collections import OrderedDict
+from functools import partial
+from os import PathLike
+import pickle
+import sqlite3
+
+from .deepdict import Key, _MISSING
+from .utils import Address, _issequence
+
+__all__ = ["SqliteDeepDict"]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (id INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS items (
+    parent INTEGER NOT NULL,
+    key BLOB NOT NULL,
+    child INTEGER,
+    value BLOB,
+    PRIMARY KEY (parent, key)
+);
+INSERT OR IGNORE INTO nodes (id) VALUES (0);
+"""
+
+_dumps = partial(pickle.dumps, protocol=4)
+_loads = pickle.loads
+
+_ADDRESS = {
+    list: list,
+    tuple: lambda address: address,
+    Address: lambda address: Address(*address),
+}
+
+
+class _Child:
+    """
+    Stands for a nested dictionary in the content of a cached node.
+    """
+
+    __slots__ = ["id"]
+
+    def __init__(self, id: int):
+        self.id = id
+
+
+class _Store:
+    """
+    The database of a layout and the cache of its recently used nodes.
+    """
+
+    def __init__(self, path: str | PathLike, cache_size: int):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def node(self, id: int) -> dict:
+        """
+        Returns the content of a node, loading it if it is not in the cache.
+        """
+        cache = self.cache
+        content = cache.get(id)
+        if content is not None:
+            cache.move_to_end(id)
+            return content
+
+        content = {}
+        rows = self.connection.execute(
+            "SELECT key, child, value FROM items WHERE parent = ? ORDER BY rowid", (id,)
+        )
+        for key, child, value in rows:
+            content[_loads(key)] = _Child(child) if child is not None else _loads(value)
+
+        cache[id] = content
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return content
+
+    def set(self, id: int, key: Hashable, value: Any) -> Any:
+        """
+        Sets an item of a node and returns what is stored in the content of
+        the node. Dictionaries are stored as nested nodes.
+        """
+        content = self.cache.get(id)
+        if content is None or key in content:
+            self.delete(id, key, missing_ok=True)
+
+        execute = self.connection.execute
+        if not isinstance(value, dict):
+            execute(
+                "INSERT INTO items (parent, key, value) VALUES (?, ?, ?)",
+                (id, _dumps(key), _dumps(value)),
+            )
+            stored = value
+        else:
+            stored = _Child(self._new_node())
+            execute(
+                "INSERT INTO items (parent, key, child) VALUES (?, ?, ?)",
+                (id, _dumps(key), stored.id),
+            )
+            self._insert(stored.id, value)
+
+        content = self.cache.get(id)
+        if content is not None:
+            content[key] = stored
+        return stored
+
+    def delete(self, id: int, key: Hashable, missing_ok: bool = False) -> None:
+        """
+        Deletes an item of a node along with everything below it.
+        """
+        execute = self.connection.execute
+        row = execute(
+            "SELECT child FROM items WHERE parent = ? AND key = ?", (id, _dumps(key))
+        ).fetchone()
+        if row is None:
+            if missing_ok:
+                return
+            raise KeyError(key)
+
+        execute("DELETE FROM items WHERE parent = ? AND key = ?", (id, _dumps(key)))
+        content = self.cache.get(id)
+        if content is not None:
+            content.pop(key, None)
+
+        stack = [] if row[0] is None else [row[0]]
+        while stack:
+            child = stack.pop()
+            rows = execute(
+                "SELECT child FROM items WHERE parent = ? AND child IS NOT NULL",
+                (child,),
+            )
+            stack.extend(r[0] for r in rows)
+            execute("DELETE FROM items WHERE parent = ?", (child,))
+            execute("DELETE FROM nodes WHERE id = ?", (child,))
+            self.cache.pop(child, None)
+
+    def _new_node(self) -> int:
+        return self.connection.execute("INSERT INTO nodes DEFAULT VALUES").lastrowid
+
+    def _insert(self, id: int, d: dict) -> None:
+        """
+        Inserts the content of a nested dictionary into an empty node.
+        """
+        executemany = self.connection.executemany
+        stack = [(id, d)]
+        while stack:
+            id, d = stack.pop()
+            leaves = []
+            for key, value in d.items():
+                if isinstance(value, dict):
+                    child = self._new_node()
+                    leaves.append((id, _dumps(key), child, None))
+                    stack.append((child, value))
+                else:
+                    leaves.append((id, _dumps(key), None, _dumps(value)))
+            executemany(
+                "INSERT INTO items (parent, key, child, value) VALUES (?, ?, ?, ?)",
+                leaves,
+            )
+
+
+class SqliteDeepDict:
+    """
+    A nested dictionary stored in an SQLite database, for layouts that don't fit
+    into memory. It supports the addressing of a `DeepDict` and its deep iteration,
+    but the nodes of the layout are only loaded when they are needed and only a
+    limited number of recently used nodes are kept in memory.
+
+    Opening a database is independent of the size of the stored layout. Changes
+    are written to the database right away, but they are only made permanent by
+    :func:`commit`, or when the instance is used as a context manager and the
+    block exits without an error.
+
+    Nested dictionaries are returned as instances of this class, that refer to
+    the same database. Changing a mutable leaf in place doesn't change the database,
+    the leaf has to be set again. Keys are compared by their pickled form, which
+    must be the same for equal keys.
+
+    Parameters
+    ----------
+    path: str or PathLike
+        The path of the database file. It is created if it doesn't exist.
+    cache_size: int, Optional
+        The maximum number of nodes kept in memory. Default is 1024.
+
+    Example
+    -------
+    >>> from sigmaepsilon.deepdict import SqliteDeepDict
+    >>> with SqliteDeepDict(":memory:") as dd:
+    ...     dd["a", "b", "c"] = 1
+    ...     dd["d"] = {"e": 2}
+    ...     print(dd["a", "b", "c"], dd["d", "e"])
+    ...     print(list(dd.items(deep=True, return_address=True)))
+    1 2
+    [(['a', 'b', 'c'], 1), (['d', 'e'], 2)]
+    """
+
+    __slots__ = ["_store", "_id", "_address"]
+
+    def __init__(self, path: str | PathLike, *, cache_size: int = 1024):
+        self._store = _Store(path, cache_size)
+        self._id = 0
+        self._address = ()
+
+    @classmethod
+    def _view(cls, store: _Store, id: int, address: tuple) -> "SqliteDeepDict":
+        obj = cls.__new__(cls)
+        obj._store = store
+        obj._id = id
+        obj._address = address
+        return obj
+
+    @property
+    def key(self) -> Hashable | None:
+        """
+        Returns the key of the instance, or None if it is the root.
+        """
+        return self._address[-1] if self._address else None
+
+    @property
+    def address(self) -> list:
+        """
+        Returns the address of the instance.
+        """
+        return list(self._address)
+
+    def is_root(self) -> bool:
+        """
+        Returns `True`, if the instance is the root.
+        """
+        return not self._address
+
+    def commit(self) -> None:
+        """
+        Makes the changes permanent.
+        """
+        self._store.connection.commit()
+
+    def close(self) -> None:
+        """
+        Closes the database. Changes that are not committed are lost.
+        """
+        self._store.connection.close()
+        self._store.cache.clear()
+
+    def __enter__(self) -> "SqliteDeepDict":
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        if exc_type is None:
+            self.commit()
+        self.close()
+
+    def _content(self) -> dict:
+        return self._store.node(self._id)
+
+    def _value(self, key: Hashable, value: Any) -> Any:
+        if isinstance(value, _Child):
+            return self._view(self._store, value.id, self._address + (key,))
+        return value
+
+    def _get(self, key: Hashable) -> Any:
+        """
+        Returns the value of a key of the instance, creating a new level if
+        the key is missing.
+        """
+        value = self._content().get(key, _MISSING)
+        if value is _MISSING:
+            value = self._store.set(self._id, key, {})
+        return self._value(key, value)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, Key):
+            return self._get(key.wrapped)
+        elif _issequence(key):
+            if len(key) == 0:
+                raise KeyError(key)
+            obj = self
+            for i, subkey in enumerate(key):
+                if not isinstance(obj, SqliteDeepDict):
+                    return obj[tuple(key[i:])]
+                obj = obj._get(subkey)
+            return obj
+        return self._get(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if isinstance(key, Key):
+            host = self
+            key = key.wrapped
+        elif _issequence(key):
+            if len(key) == 0:
+                raise KeyError(key)
+            host = self[key[:-1]] if len(key) > 1 else self
+            if not isinstance(host, SqliteDeepDict):
+                raise TypeError(f"The value at '{tuple(key[:-1])}' is not a dictionary!")
+            key = key[-1]
+        else:
+            host = self
+
+        if isinstance(value, SqliteDeepDict):
+            value = value.to_dict()
+        host._store.set(host._id, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        if isinstance(key, Key):
+            self._store.delete(self._id, key.wrapped)
+        elif _issequence(key):
+            if len(key) == 0:
+                raise KeyError(key)
+            host = self[key[:-1]] if len(key) > 1 else self
+            if not isinstance(host, SqliteDeepDict):
+                raise TypeError(f"The value at '{tuple(key[:-1])}' is not a dictionary!")
+            host._store.delete(host._id, key[-1])
+        else:
+            self._store.delete(self._id, key)
+
+    def __contains__(self, key: Any) -> bool:
+        if isinstance(key, Key):
+            return key.wrapped in self._content()
+        elif _issequence(key):
+            if len(key) == 0:
+                raise ValueError(f"{key} has zero length")
+            obj = self
+            for subkey in key:
+                if isinstance(obj, SqliteDeepDict):
+                    value = obj._content().get(subkey, _MISSING)
+                    if value is _MISSING:
+                        return False
+                    obj = obj._value(subkey, value)
+                elif hasattr(obj, "__contains__") and subkey in obj:
+                    obj = obj[subkey]
+                else:
+                    return False
+            return True
+        return key in self._content()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value for `key` if `key` is in the dictionary, else `default`.
+        """
+        value = self._content().get(key, _MISSING)
+        return default if value is _MISSING else self._value(key, value)
+
+    def __len__(self) -> int:
+        return len(self._content())
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._content()))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(address={self.address})"
+
+    def _walk(
+        self, *, leaves: bool = True, containers: bool = False, deep: bool = True
+    ) -> Iterator[tuple[tuple, Any]]:
+        """
+        Yields the addresses and the values of the items depth-first.
+        """
+        stack = [(self._address, iter(list(self._content().items())))]
+        while stack:
+            prefix, items = stack[-1]
+            for key, value in items:
+                address = prefix + (key,)
+                if isinstance(value, _Child):
+                    if containers:
+                        yield address, self._view(self._store, value.id, address)
+                    if deep:
+                        content = self._store.node(value.id)
+                        stack.append((address, iter(list(content.items()))))
+                        break
+                elif leaves:
+                    yield address, value
+            else:
+                stack.pop()
+
+    def items(
+        self,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        vtype: Any = Any,
+        address_type: type = list,
+    ) -> Iterator[tuple[Any, Any]]:
+        """
+        Returns the items. The arguments are the same as for the `items` method
+        of `DeepDict`. With `deep=True` only the leaves are returned.
+        """
+        if not deep:
+            items = (
+                (key, self._value(key, value))
+                for key, value in list(self._content().items())
+            )
+        elif return_address:
+            address = _ADDRESS[address_type]
+            items = ((address(a), v) for a, v in self._walk())
+        else:
+            items = ((a[-1], v) for a, v in self._walk())
+
+        for key, value in items:
+            if vtype is Any or isinstance(value, vtype):
+                yield key, value
+
+    def values(self, *, deep: bool = False, vtype: Any = Any) -> Iterator[Any]:
+        """
+        Returns the values. With `deep=True` only the leaves are returned.
+        """
+        for _, value in self.items(deep=deep, vtype=vtype):
+            yield value
+
+    def keys(
+        self,
+        *,
+        deep: bool = False,
+        return_address: bool = False,
+        address_type: type = list,
+    ) -> Iterator[Any]:
+        """
+        Returns the keys. With `deep=True` only the keys of the leaves are returned.
+        """
+        for key, _ in self.items(
+            deep=deep, return_address=return_address, address_type=address_type
+        ):
+            yield key
+
+    def containers(
+        self, *, inclusive: bool = False, deep: bool = True
+    ) -> Iterable["SqliteDeepDict"]:
+        """
+        Returns the nested dictionaries. The arguments are the same as for the
+        `containers` method of `DeepDict`.
+        """
+        if inclusive:
+            yield self
+        for _, value in self._walk(leaves=False, containers=True, deep=deep):
+            yield value
+
+    def to_dict(self) -> dict:
+        """
+        Loads the layout below the instance into nested standard dictionaries.
+        """
+        result = {}
+        nodes = {self._address: result}
+        for address, value in self._walk(containers=True):
+            if isinstance(value, SqliteDeepDict):
+                value = nodes[address] = {}
+            nodes[address[:-1]][address[-1]] = value
+        return result
@@ -7,31 +7,267 @@ from typing import (
     Hashable,
     Optional,
     Union,
-    TypeVar,
-    Callable,
     Generator,
+    Iterator,
+    Callable,
 )
-from copy import copy
+from collections.abc import Sequence
+from itertools import chain
 
 try:
     import asciitree
 except ImportError:  # pragma: no cover
     asciitree = None
 
-__all__ = ["dictparser", "parseaddress", "parseitems", "parsedicts", "parsedicts_addr"]
+__all__ = [
+    "Address",
+    "dictparser",
+    "parseaddress",
+    "parseitems",
+    "parsedicts",
+    "parsedicts_addr",
+]
+
+
+class Address(Sequence):
+    """
+    An immutable address in a nested layout, that shares its prefix with the
+    address of the parent container. Creating the address of an item from the
+    address of its container is O(1) and the keys are only collected into a
+    tuple the first time they are needed.
+
+    Instances behave like tuples, they can be indexed, iterated, hashed and
+    compared to tuples and lists. They can also be used to index a `DeepDict`.
+
+    Example
+    -------
+    >>> from sigmaepsilon.deepdict import Address
+    >>> address = Address("a", "b")
+    >>> address
+    Address('a', 'b')
+    >>> address.child("c") == ("a", "b", "c")
+    True
+    """
+
+    __slots__ = ("_prefix", "_key", "_len", "_keys")
+
+    def __init__(self, *keys: Hashable):
+        self._prefix = None
+        self._key = None
+        self._len = len(keys)
+        self._keys = keys
+
+    def child(self, key: Hashable) -> "Address":
+        """
+        Returns the address of an item with the key `key` in the container
+        this address points to.
+        """
+        address = Address.__new__(Address)
+        address._prefix = self
+        address._key = key
+        address._len = self._len + 1
+        address._keys = None
+        return address
+
+    def totuple(self) -> tuple:
+        """
+        Returns the keys as a tuple.
+        """
+        if self._keys is None:
+            keys = []
+            node = self
+            while node._keys is None:
+                keys.append(node._key)
+                node = node._prefix
+            keys.reverse()
+            self._keys = node._keys + tuple(keys)
+        return self._keys
+
+    def tolist(self) -> list:
+        """
+        Returns the keys as a list.
+        """
+        return list(self.totuple())
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: int | slice) -> Hashable | tuple:
+        return self.totuple()[index]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.totuple())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Address):
+            return self._len == other._len and self.totuple() == other.totuple()
+        elif isinstance(other, (tuple, list)):
+            return self._len == len(other) and self.totuple() == tuple(other)
+        return NotImplemented
 
+    def __hash__(self) -> int:
+        return hash(self.totuple())
 
-DictLike = TypeVar("DictLike", bound=dict)
+    def __repr__(self) -> str:
+        return "Address(%s)" % ", ".join(map(repr, self.totuple()))
 
 
 def _issequence(item: Any) -> bool:
-    return isinstance(item, (list, tuple))
+    return isinstance(item, (list, tuple, Address))
+
+
+_ROOT_PREFIX = {list: (), tuple: (), Address: Address()}
+_EXTEND = {
+    list: lambda prefix, key: prefix + (key,),
+    tuple: lambda prefix, key: prefix + (key,),
+    Address: Address.child,
+}
+_EMIT = {
+    list: lambda prefix, key: [*prefix, key],
+    tuple: lambda prefix, key: prefix + (key,),
+    Address: Address.child,
+}
+
+
+def _check_address_type(address_type: Any) -> None:
+    try:
+        valid = address_type in _ROOT_PREFIX
+    except TypeError:
+        valid = False
+    if not valid:
+        raise TypeError(f"Invalid address type: {address_type}")
+
+
+def _empty_address(address_type: type = list) -> list | tuple | Address:
+    _check_address_type(address_type)
+    return address_type()
+
 
+def _items(d: Any) -> Iterable[Tuple[Hashable, Any]]:
+    return dict.items(d) if isinstance(d, dict) else d.items()
 
-def dictparser(d: dict, *, dtype=dict, **_kw) -> Iterable[Tuple[List[Hashable], Any]]:
+
+def _circular(key: Hashable) -> str:
+    return f"Circular reference detected at key '{key}'."
+
+
+def _traverse(
+    d: dict,
+    *,
+    dtype: Any = dict,
+    leaves: bool = True,
+    containers: bool = False,
+    deep: bool = True,
+    address_type: Optional[type] = None,
+    items: Callable[[Any], Iterable[Tuple[Hashable, Any]]] = _items,
+) -> Iterator[Tuple[Union[Hashable, List[Hashable]], Any]]:
+    """
+    The traversal engine behind the deep parsers of this module.
+
+    The nested layout is walked depth-first using an explicit stack of item
+    iterators instead of recursion, hence the cost of yielding an item does
+    not depend on its depth and there is no limit on the depth of the layout.
+    The items are yielded in the same order a recursive walk would yield them.
+
+    When addresses are requested, the address of every container on the stack
+    is stored only once and the address of an item is built from the address
+    of its container, so no address is copied key by key.
+
+    A container may appear more than once in the layout, but a layout that
+    contains itself raises a `ValueError` once the walk gets back to a
+    container it is inside of.
+
+    Parameters
+    ----------
+    d: dict
+        The dictionary to walk.
+    dtype: Any, Optional
+        Values of this type are considered as containers. Default is `dict`.
+    leaves: bool, Optional
+        If `True`, values that are not containers are yielded. Default is `True`.
+    containers: bool, Optional
+        If `True`, containers are yielded before their content. Default is `False`.
+    deep: bool, Optional
+        If `True`, the walk goes into nested containers. Default is `True`.
+    address_type: type, Optional
+        If provided, addresses of this type are yielded instead of keys.
+        Possible values are `list`, `tuple` and `Address`. Default is `None`.
+    items: Callable, Optional
+        A function that returns the items of a container.
+    """
+    # the ids of the containers on the stack, in order and as a set
+    ids, inside = [id(d)], {id(d)}
+    if address_type is None:
+        stack = [iter(items(d))]
+        while stack:
+            for key, value in stack[-1]:
+                if isinstance(value, dtype):
+                    if containers:
+                        yield key, value
+                    if deep:
+                        i = id(value)
+                        if i in inside:
+                            raise ValueError(_circular(key))
+                        ids.append(i)
+                        inside.add(i)
+                        stack.append(iter(items(value)))
+                        break
+                elif leaves:
+                    yield key, value
+            else:
+                stack.pop()
+                inside.discard(ids.pop())
+        return
+
+    _check_address_type(address_type)
+
+    extend = _EXTEND[address_type]
+    emit = _EMIT[address_type]
+    stack = [iter(items(d))]
+    prefixes = [_ROOT_PREFIX[address_type]]
+    while stack:
+        prefix = prefixes[-1]
+        for key, value in stack[-1]:
+            if isinstance(value, dtype):
+                if containers:
+                    yield emit(prefix, key), value
+                if deep:
+                    i = id(value)
+                    if i in inside:
+                        raise ValueError(_circular(key))
+                    ids.append(i)
+                    inside.add(i)
+                    prefixes.append(extend(prefix, key))
+                    stack.append(iter(items(value)))
+                    break
+            elif leaves:
+                yield emit(prefix, key), value
+        else:
+            stack.pop()
+            prefixes.pop()
+            inside.discard(ids.pop())
+
+
+def dictparser(
+    d: dict, *, dtype=dict, address_type: type = list
+) -> Iterable[Tuple[List[Hashable], Any]]:
     """
     Iterates through all the values of a nested dictionary.
 
+    Parameters
+    ----------
+    d: dict
+        A dictionary.
+    dtype: Any, Optional
+        Values of this type are considered as nested dictionaries.
+        Default is `dict`.
+    address_type: type, Optional
+        The type of the addresses. It can be `list`, `tuple` or `Address`.
+        Lists are created by copying the keys of the address, while tuples
+        and addresses of type `Address` are cheaper alternatives when walking
+        big layouts. `Address` instances share their prefixes and are the
+        cheapest option for deep layouts. Default is `list`.
+
     Notes
     -----
     Returns all kinds of items, even nested discionaries themselves,
@@ -50,16 +286,15 @@ def dictparser(d: dict, *, dtype=dict, **_kw) -> Iterable[Tuple[List[Hashable],
     Address: ['a', 'aa'], Value: 1
     Address: ['b'], Value: 2
     Address: ['c', 'cc', 'ccc'], Value: 3
+
+    >>> for address, value in dictparser(d, address_type=tuple):
+    ...     print(f"Address: {address}, Value: {value}")
+    Address: ('a', 'aa'), Value: 1
+    Address: ('b',), Value: 2
+    Address: ('c', 'cc', 'ccc'), Value: 3
     """
-    address = _kw.get("_addr", [])
-    for key, value in d.items():
-        subaddress = copy(address)
-        subaddress.append(key)
-        if isinstance(value, dtype):
-            for data in dictparser(value, dtype=dtype, _addr=subaddress):
-                yield data
-        else:
-            yield subaddress, value
+    _check_address_type(address_type)
+    return _traverse(d, dtype=dtype, address_type=address_type)
 
 
 def parseaddress(d: dict, address: List[Hashable]) -> Any:
@@ -80,13 +315,16 @@ def parseaddress(d: dict, address: List[Hashable]) -> Any:
     if not isinstance(d, dict):
         raise ValueError
 
-    if not address[0] in d:
-        raise KeyError(address[0])
+    for key in address:
+        if not isinstance(d, dict):
+            raise ValueError
+
+        if not key in d:
+            raise KeyError(key)
+
+        d = d[key]
 
-    if len(address) > 1:
-        return parseaddress(d[address[0]], address[1:])
-    else:
-        return d[address[0]]
+    return d
 
 
 def parseitems(d: dict, *, dtype: Any = dict) -> Iterable[Tuple[Hashable, Any]]:
@@ -112,12 +350,7 @@ def parseitems(d: dict, *, dtype: Any = dict) -> Iterable[Tuple[Hashable, Any]]:
     Key: b, Value: 2
     Key: ccc, Value: 3
     """
-    for key, value in d.items():
-        if isinstance(value, dtype):
-            for data in parseitems(value, dtype=dtype):
-                yield data
-        else:
-            yield key, value
+    return _traverse(d, dtype=dtype)
 
 
 def parsedicts(
@@ -152,20 +385,26 @@ def parsedicts(
         if isinstance(d, dtype):
             yield d
 
-    for value in d.values():
-        if isinstance(value, dtype):
-            yield value
-            if deep:
-                for subvalue in parsedicts(value, inclusive=False, dtype=dtype):
-                    yield subvalue
+    for _, value in _traverse(
+        d, dtype=dtype, leaves=False, containers=True, deep=deep
+    ):
+        yield value
 
 
 def parsedicts_addr(
-    d: dict, *, inclusive: bool = True, dtype: Any = dict, deep: bool = True, **_kw
-) -> Generator[tuple[Hashable, dict], None, None]:
+    d: dict,
+    *,
+    inclusive: bool = True,
+    dtype: Any = dict,
+    deep: bool = True,
+    address_type: type = list,
+) -> Iterator[tuple[Hashable, dict]]:
     """
     Returns all subdirectories of a dictionary and their addresses.
 
+    The type of the addresses is controlled by the `address_type` argument,
+    see :func:`dictparser` for the possible values.
+
     Example
     -------
     >>> from sigmaepsilon.deepdict import parsedicts_addr
@@ -188,22 +427,18 @@ def parsedicts_addr(
     {'cc': {'ccc': 3}} @ ['c']
     {'ccc': 3} @ ['c', 'cc']
     """
-    address = _kw.get("_addr", [])
-
-    if inclusive:
-        if isinstance(d, dtype):
-            yield address, d
-
-    for key, value in d.items():
-        if isinstance(value, dtype):
-            addr = copy(address)
-            addr.append(key)
-            yield addr, value
-            if deep:
-                for subaddr, subval in parsedicts_addr(
-                    value, inclusive=False, dtype=dtype, _addr=addr
-                ):
-                    yield subaddr, subval
+    _check_address_type(address_type)
+    items = _traverse(
+        d,
+        dtype=dtype,
+        leaves=False,
+        containers=True,
+        deep=deep,
+        address_type=address_type,
+    )
+    if inclusive and isinstance(d, dtype):
+        return chain([(_empty_address(address_type), d)], items)
+    return items
 
 
 def _asciitree(data: dict, dtype: type = dict, **_kw) -> dict:
@@ -217,26 +452,6 @@ def _asciitree(data: dict, dtype: type = dict, **_kw) -> dict:
     return tree
 
 
-def _wrap(
-    data: dict, wrapper: DictLike, tr: Optional[Union[Callable, None]] = None, **_kw
-) -> DictLike:
-    result = _kw.get("_result", None)
-    if result is None:
-        result = wrapper()
-
-    if tr is None:
-        tr = lambda x: x
-
-    for key, value in data.items():
-        if isinstance(value, dict):
-            result[key] = wrapper()
-            _wrap(value, wrapper, tr=tr, _result=result[key])
-        else:
-            result[key] = tr(value)
-
-    return result
-
-
 if asciitree is None:  # pragma: no cover
 
     def asciiprint(*_, **__) -> str:
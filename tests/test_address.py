@@ -0,0 +1,98 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Address, dictparser, parsedicts_addr
+
+
+def test_address_behaves_like_a_tuple():
+    address = Address("a", "b").child("c").child("d")
+    assert len(address) == 4
+    assert address == ("a", "b", "c", "d")
+    assert address == ["a", "b", "c", "d"]
+    assert address != ("a", "b", "c")
+    assert address[0] == "a"
+    assert address[-1] == "d"
+    assert address[1:3] == ("b", "c")
+    assert list(address) == ["a", "b", "c", "d"]
+    assert address.tolist() == ["a", "b", "c", "d"]
+    assert "c" in address
+    assert hash(address) == hash(("a", "b", "c", "d"))
+    assert {address: 1}[Address("a", "b", "c", "d")] == 1
+    assert repr(address) == "Address('a', 'b', 'c', 'd')"
+    assert len(Address()) == 0
+
+
+def test_address_shares_prefix():
+    prefix = Address("a").child("b")
+    left, right = prefix.child("c"), prefix.child("d")
+    assert left._prefix is right._prefix
+    assert left == ("a", "b", "c")
+    assert right == ("a", "b", "d")
+
+
+@pytest.mark.parametrize("address_type", [list, tuple, Address])
+def test_dictparser_address_types(address_type):
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    result = list(dictparser(d, address_type=address_type))
+    assert all(isinstance(addr, address_type) for addr, _ in result)
+    assert [tuple(addr) for addr, _ in result] == [
+        ("a", "aa"),
+        ("a", "ab", "aba"),
+        ("b",),
+        ("c", "cc", "ccc"),
+    ]
+    assert [v for _, v in result] == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("address_type", [list, tuple, Address])
+def test_parsedicts_addr_address_types(address_type):
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    result = list(parsedicts_addr(d, address_type=address_type))
+    assert all(isinstance(addr, address_type) for addr, _ in result)
+    assert [tuple(addr) for addr, _ in result] == [
+        (),
+        ("a",),
+        ("a", "ab"),
+        ("c",),
+        ("c", "cc"),
+    ]
+
+
+@pytest.mark.parametrize("address_type", [set, None, "list", []])
+def test_invalid_address_type(address_type):
+    d = {"a": {"b": 1}, "c": 2}
+    # the address type is validated when the iterators are created
+    for parser in (dictparser, parsedicts_addr):
+        with pytest.raises(TypeError, match="Invalid address type"):
+            parser(d, address_type=address_type)
+
+    with pytest.raises(TypeError, match="Invalid address type"):
+        parsedicts_addr(d, inclusive=False, address_type=address_type)
+
+
+def test_deepdict_address_types():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    )
+    assert list(dd.keys(deep=True, return_address=True)) == [
+        ["a", "aa"],
+        ["a", "ab", "aba"],
+        ["b"],
+        ["c", "cc", "ccc"],
+    ]
+    assert list(dd.keys(deep=True, return_address=True, address_type=tuple)) == [
+        ("a", "aa"),
+        ("a", "ab", "aba"),
+        ("b",),
+        ("c", "cc", "ccc"),
+    ]
+
+    for address, value in dd.items(
+        deep=True, return_address=True, address_type=Address
+    ):
+        assert isinstance(address, Address)
+        assert dd[address] == value
+
+    for address, value in dd.values(
+        deep=True, return_address=True, address_type=tuple
+    ):
+        assert dd[address] == value
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+
+async def _collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+def test_async_iteration():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}}, "b": 3, "c": {"cc": 4.0}}
+    )
+    for every in (1, 3, 1000):
+        for kwargs in (
+            {},
+            {"deep": True},
+            {"deep": True, "return_address": True, "address_type": tuple},
+            {"deep": True, "vtype": float},
+        ):
+            items = asyncio.run(_collect(dd.aitems(every=every, **kwargs)))
+            assert items == list(dd.items(**kwargs))
+            values = asyncio.run(_collect(dd.avalues(every=every, **kwargs)))
+            assert values == list(dd.values(**kwargs))
+            kwargs.pop("vtype", None)
+            keys = asyncio.run(_collect(dd.akeys(every=every, **kwargs)))
+            assert keys == list(dd.keys(**kwargs))
+
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(dd.aitems(every=0)))
+
+
+def test_async_iteration_gives_control_back():
+    dd = DeepDict.wrap({i: {j: j for j in range(10)} for i in range(10)})
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        count = 0
+        async for _ in dd.avalues(deep=True, every=10):
+            count += 1
+        task.cancel()
+        return count
+
+    assert asyncio.run(main()) == 100
+    assert len(ticks) >= 9
+
+
+def test_aresolve():
+    running = []
+    peak = []
+
+    async def load(value):
+        running.append(value)
+        peak.append(len(running))
+        await asyncio.sleep(0.001)
+        running.remove(value)
+        return value * 2
+
+    async def main():
+        dd = DeepDict.wrap(
+            {
+                "a": {i: load(i) for i in range(10)},
+                "b": {"c": load(10), "d": "x"},
+                "e": load(11),
+            },
+            lazy=True,
+        )
+        index = dd.enable_index()
+        future = asyncio.get_running_loop().create_future()
+        future.set_result({"f": 1})
+        dd["g"] = future
+        assert await dd.aresolve(limit=3) == 13
+        return dd, index
+
+    dd, index = asyncio.run(main())
+    assert max(peak) == 3
+    assert dd["a"] == {i: 2 * i for i in range(10)}
+    assert dd["b"] == {"c": 20, "d": "x"}
+    assert dd["e"] == 22 and dd["g"] == {"f": 1}
+    assert index[("b", "c")] == 20
+    assert asyncio.run(dd.aresolve()) == 0
+
+
+def test_aresolve_errors():
+    async def fail():
+        raise RuntimeError()
+
+    async def slow():
+        await asyncio.sleep(1)
+        return 1
+
+    async def main(dd):
+        await dd.aresolve()
+
+    dd = DeepDict.wrap({"a": {"b": fail()}, "c": slow()})
+    with pytest.raises(RuntimeError):
+        asyncio.run(main(dd))
+
+    async def one():
+        return 1
+
+    coroutine = one()
+    dd = DeepDict.wrap({"a": {"b": coroutine}})
+    dd["a"].lock()
+    with pytest.raises(DeepDictLockedError):
+        asyncio.run(main(dd))
+    coroutine.close()
+
+    with pytest.raises(ValueError):
+        asyncio.run(DeepDict().aresolve(limit=0))
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Key
+
+
+def _dumped(dd: DeepDict) -> io.BytesIO:
+    file = io.BytesIO()
+    dd.dump(file)
+    file.seek(0)
+    return file
+
+
+def test_roundtrip():
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+            "b": 3,
+            "c": {"cc": {"ccc": "4"}, "cd": {"x": None}},
+        }
+    )
+    dd[Key(("t", 1))] = DeepDict(y=1)
+    dd["c"].name = "C"
+    dd["c", "cd"].lock()
+    loaded = DeepDict.load(_dumped(dd))
+    assert loaded == dd
+    assert list(loaded.items(deep=True, return_address=True)) == list(
+        dd.items(deep=True, return_address=True)
+    )
+    assert [c.address for c in loaded.containers()] == [
+        c.address for c in dd.containers()
+    ]
+    assert loaded["c"].name == "C"
+    assert loaded["c", "cd"].locked and loaded["c", "cc"].locked is False
+    assert loaded[Key(("t", 1))]["y"] == 1
+    assert loaded["a", "ab"].parent is loaded["a"]
+    assert loaded["a", "ab"].address == ["a", "ab"]
+
+
+def test_roundtrip_with_files(tmp_path):
+    class MyDeepDict(DeepDict): ...
+
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}}, "b": 3})
+    path = tmp_path / "data.dd"
+    dd.dump(path)
+    loaded = MyDeepDict.load(path)
+    assert loaded == dd
+    assert all(isinstance(c, MyDeepDict) for c in loaded.containers())
+    assert MyDeepDict.load(path, ["a", "ab"]) == dd["a", "ab"]
+
+
+def test_partial_loads():
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+            "b": 3,
+            "c": {"cc": {"ccc": "4"}, "cd": {"x": None}},
+        }
+    )
+    dd[Key(("t", 1))] = DeepDict(y=1)
+    dd["c", "cd"].lock()
+    file = _dumped(dd)
+    for address in (["a"], ("a", "ab"), ["c", "cd"], "a", ["a", "ac"]):
+        file.seek(0)
+        loaded = DeepDict.load(file, address)
+        assert loaded == dd[address]
+        assert loaded.is_root()
+    file.seek(0)
+    assert DeepDict.load(file, ["c", "cd"]).locked
+
+    # leaves are loaded from the block of their parent
+    file.seek(0)
+    assert DeepDict.load(file, ["a", "ab", "abb"]) == [1, 2]
+    file.seek(0)
+    assert DeepDict.load(file, Key(("t", 1))) == DeepDict(y=1)
+
+    for address in (["x"], ["a", "x", "y"], ["b", "c"]):
+        file.seek(0)
+        with pytest.raises(KeyError):
+            DeepDict.load(file, address)
+
+
+def test_lazy_layouts_are_not_promoted():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": [3]}, lazy=True)
+    loaded = DeepDict.load(_dumped(dd))
+    assert dd._lazy is not None
+    assert loaded == dd.to_dict()
+
+
+def test_invalid_files():
+    with pytest.raises(ValueError):
+        DeepDict.load(io.BytesIO(b"NOTADEEPDICTFILE" * 3))
@@ -0,0 +1,189 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, ColumnarTable, ColumnarRecord
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+np = pytest.importorskip("numpy")
+
+
+def _elements(n: int = 4) -> dict:
+    return {i: {"E": 210.0 + i, "nu": 0.3, "id": i} for i in range(n)}
+
+
+def test_table():
+    table = ColumnarTable.from_records(_elements())
+    assert len(table) == 4
+    assert list(table) == [0, 1, 2, 3]
+    assert table.fields == ["E", "nu", "id"]
+    assert isinstance(table.column("E"), np.ndarray)
+    assert table.column("id").tolist() == [0, 1, 2, 3]
+    assert 3 in table and 4 not in table and "E" not in table
+    assert table.to_dict() == _elements()
+
+    record = table[2]
+    assert isinstance(record, ColumnarRecord)
+    assert dict(record) == {"E": 212.0, "nu": 0.3, "id": 2}
+    assert type(record["id"]) is int
+    record["nu"] = 0.25
+    assert table.column("nu")[2] == 0.25
+    assert table[2, "nu"] == 0.25
+    assert table[(2,)] == record
+
+    table[1] = {"E": 1.0, "nu": 2.0, "id": 3}
+    assert table.to_dict()[1] == {"E": 1.0, "nu": 2.0, "id": 3}
+
+    copy = table.copy()
+    copy[1, "E"] = 5.0
+    assert table[1, "E"] == 1.0 and copy[1, "E"] == 5.0
+    assert copy.to_dict() == {**table.to_dict(), 1: {"E": 5.0, "nu": 2.0, "id": 3}}
+
+    with pytest.raises(KeyError):
+        table[4]
+    with pytest.raises(KeyError):
+        table[0, "G"]
+    with pytest.raises(ValueError):
+        table[0] = {"E": 1.0}
+
+
+def test_table_with_keys():
+    records = {"a": {"x": 1, "y": "u"}, "b": {"x": 2, "y": "v"}}
+    table = ColumnarTable.from_records(records)
+    assert list(table) == ["a", "b"]
+    assert table["b", "y"] == "v"
+    assert 0 not in table
+    assert table.to_dict() == records
+
+    with pytest.raises(ValueError):
+        ColumnarTable({"x": [1, 2]}, keys=["a", "a"])
+    with pytest.raises(ValueError):
+        ColumnarTable({"x": [1, 2], "y": [1]})
+    with pytest.raises(ValueError):
+        ColumnarTable.from_records({"a": {"x": 1}, "b": {"y": 2}})
+
+
+def test_table_in_deepdict():
+    dd = DeepDict.wrap({"model": {"name": "frame"}})
+    dd["model", "elements"] = ColumnarTable.from_records(_elements())
+
+    assert dd["model", "elements", 1, "E"] == 211.0
+    assert dd["model", "elements", 1]["id"] == 1
+    dd["model", "elements", 1, "E"] = 100.0
+    assert dd["model", "elements"].column("E")[1] == 100.0
+    assert ("model", "elements", 1, "E") in dd
+    assert ("model", "elements", 9, "E") not in dd
+    assert ("model", "elements", 1, "G") not in dd
+
+    elements = _elements()
+    elements[1]["E"] = 100.0
+    expected = DeepDict.wrap({"model": {"name": "frame", "elements": elements}})
+    assert list(dd.items(deep=True, return_address=True)) == list(
+        expected.items(deep=True, return_address=True)
+    )
+    assert list(dd.values(deep=True, vtype=float)) == list(
+        expected.values(deep=True, vtype=float)
+    )
+    assert list(dd.keys(deep=True)) == list(expected.keys(deep=True))
+    assert [c.key for c in dd.containers()] == ["model"]
+
+
+def test_table_with_indices():
+    dd = DeepDict.wrap({"model": {"name": "frame"}})
+    dd.enable_index()
+    index = dd.enable_type_index()
+    dd["model", "elements"] = ColumnarTable.from_records(_elements())
+    assert not index.complete
+    assert dd["model", "elements", 1, "E"] == 211.0
+    assert len(list(dd.values(deep=True, vtype=float))) == 8
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def on_set(self, address, value):
+        self.events.append(("set", address.totuple(), value))
+
+    def on_delete(self, address, value):
+        self.events.append(("delete", address.totuple(), value))
+
+
+def test_writes_into_tables_go_through_the_layout():
+    dd = DeepDict.wrap({"model": {"name": "frame"}})
+    dd["model", "elements"] = table = ColumnarTable.from_records(_elements())
+    recorder = _Recorder()
+    dd._add_observer(recorder)
+
+    dd["model", "elements", 1, "E"] = 100.0
+    dd[["model", "elements", 2]] = {"E": 1.0, "nu": 0.2, "id": 7}
+    assert table.column("E").tolist() == [210.0, 100.0, 1.0, 213.0]
+    assert recorder.events == 2 * [
+        ("delete", ("model", "elements"), table),
+        ("set", ("model", "elements"), table),
+    ]
+    dd._remove_observer(recorder)
+
+    dd["model"].lock()
+    with pytest.raises(DeepDictLockedError):
+        dd["model", "elements", 1, "E"] = 0.0
+    assert table.column("E")[1] == 100.0
+
+
+def test_writes_into_plain_dictionaries():
+    dd = DeepDict()
+    dd["p"] = {"x": {"y": 1}}
+    dd["p", "x", "y"] = 2
+    dd["p", "z"] = 3
+    assert dict.__getitem__(dd, "p") == {"x": {"y": 2}, "z": 3}
+
+    recorder = _Recorder()
+    dd._add_observer(recorder)
+    fingerprint = dd.fingerprint()
+    del dd["p", "x", "y"]
+    assert dict.__getitem__(dd, "p") == {"x": {}, "z": 3}
+    assert dd.fingerprint() != fingerprint
+    assert recorder.events == [
+        ("delete", ("p",), {"x": {}, "z": 3}),
+        ("set", ("p",), {"x": {}, "z": 3}),
+    ]
+    with pytest.raises(KeyError):
+        del dd["p", "w"]
+    assert len(recorder.events) == 2
+    dd._remove_observer(recorder)
+
+    dd.lock()
+    with pytest.raises(DeepDictLockedError):
+        del dd["p", "z"]
+    assert dict.__getitem__(dd, "p") == {"x": {}, "z": 3}
+
+
+def test_gather_scatter_and_map_leaves_with_tables():
+    dd = DeepDict.wrap({"model": {"name": "frame", "scale": 2.0}})
+    dd["model", "elements"] = ColumnarTable.from_records(_elements(2))
+    dd["model", "plain"] = {"w": 0.5}
+
+    data, addresses = dd.gather()
+    assert addresses == [
+        ("model", "scale"),
+        ("model", "elements", 0, "E"),
+        ("model", "elements", 0, "nu"),
+        ("model", "elements", 1, "E"),
+        ("model", "elements", 1, "nu"),
+        ("model", "plain", "w"),
+    ]
+    assert data.tolist() == [2.0, 210.0, 0.3, 211.0, 0.3, 0.5]
+
+    dd.scatter(data * 2, addresses)
+    assert dd.gather()[0].tolist() == (data * 2).tolist()
+    assert dd["model", "elements", 1, "id"] == 1
+
+    dd.map_leaves(lambda x: x / 2, vtype=float)
+    assert dd.gather()[0].tolist() == data.tolist()
+    assert list(dd.values(deep=True, vtype=float)) == data.tolist()
+    assert dd.reduce(lambda a, b: a + b, 0.0, vtype=float) == sum(data.tolist())
+
+    with pytest.raises(TypeError):
+        dd.scatter([1.0], [("model", "elements", 0)])
+    with pytest.raises(KeyError):
+        dd.scatter([1.0], [("model", "elements", 9, "E")])
+    with pytest.raises(TypeError):
+        dd.scatter([1.0], [("model", "name", "x")])
@@ -0,0 +1,69 @@
+from sigmaepsilon.deepdict import DeepDict, Key, parsedicts
+
+
+def _keys(containers) -> list:
+    return [c.key for c in containers]
+
+
+def test_containers_match_a_full_scan():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2}, "ac": {}}, "b": 3, "c": {"cc": {}}, "d": {}}
+    )
+    for deep in (True, False):
+        expected = list(parsedicts(dd, inclusive=False, deep=deep, dtype=DeepDict))
+        assert _keys(dd.containers(deep=deep)) == _keys(expected)
+
+
+def test_containers_follow_changes():
+    dd = DeepDict.wrap({"a": {"aa": 1}, "b": 3, "c": {"cc": {"ccc": 4}}, "d": {}})
+    dd["e", "ee"] = 6
+    dd["a"] = DeepDict.wrap({"x": {"y": 1}})
+    del dd["c", "cc"]
+    dd["d"].update(z=DeepDict())
+    dd.pop("b")
+    dd[Key((1, 2))] = DeepDict()
+    expected = list(parsedicts(dd, inclusive=False, dtype=DeepDict))
+    assert _keys(dd.containers()) == _keys(expected)
+    assert _keys(dd.containers()) == ["c", "d", "z", "e", "a", "x", (1, 2)]
+
+    dd.clear()
+    assert list(dd.containers()) == []
+    assert dd.is_leaf()
+
+
+def test_containers_of_lazy_layouts():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2}, "ac": {}}, "b": 3, "c": {"cc": {}}, "d": {}},
+        lazy=True,
+    )
+    dd["c"]
+    dd["a", "ab"]
+    assert _keys(dd.containers()) == ["a", "ab", "ac", "c", "cc", "d"]
+
+
+def test_containers_passed_to_the_constructor():
+    a = DeepDict(x=1)
+    dd = DeepDict({"a": a, "b": 2})
+    assert list(dd.containers()) == [a]
+    assert not dd.is_leaf()
+    assert a.is_leaf()
+
+
+def test_is_leaf_with_types():
+    class MyDeepDict(DeepDict): ...
+
+    dd = MyDeepDict.wrap({"a": {"b": 1}, "c": 2})
+    assert not dd.is_leaf()
+    assert dd["a"].is_leaf()
+    assert not dd.is_leaf(dtype=DeepDict)
+
+    dd["a"]["d"] = DeepDict()
+    assert dd["a"].is_leaf()
+    assert not dd["a"].is_leaf(dtype=DeepDict)
+    assert _keys(dd.containers()) == ["a"]
+    assert _keys(dd.containers(dtype=DeepDict)) == ["a", "d"]
+
+    dd["e"] = {"f": 1}
+    assert dd["a", "d"].is_leaf(dtype=dict)
+    assert not dd["a"].is_leaf(dtype=dict)
+    assert list(dd.containers(dtype=dict)) == [dd["a"], dd["a", "d"], {"f": 1}]
@@ -0,0 +1,98 @@
+import copy
+import pickle
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Key
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+
+def test_diff():
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}}, "b": 3, "c": "4"}
+    modified = {
+        "a": {"aa": 1.0, "ab": {"aba": 2.0, "abb": [1, 2, 3]}, "ad": {"x": 1}},
+        "b": {"bb": 3},
+        "c": "4",
+        "d": 5,
+    }
+    a, b = DeepDict.wrap(copy.deepcopy(d)), DeepDict.wrap(copy.deepcopy(modified))
+    assert a.diff(b) == [
+        ("replace", ("a", "aa"), 1.0),
+        ("replace", ("a", "ab", "abb"), [1, 2, 3]),
+        ("remove", ("a", "ac"), None),
+        ("add", ("a", "ad"), {"x": 1}),
+        ("replace", ("b",), {"bb": 3}),
+        ("add", ("d",), 5),
+    ]
+    assert a.diff(a) == [] and a.diff(d) == []
+    assert DeepDict.wrap(d, lazy=True).diff(modified) == a.diff(b)
+    assert all(not isinstance(value, DeepDict) for _, _, value in a.diff(b))
+
+
+def test_diff_skips_shared_subtrees():
+    class Uncomparable:
+        def __eq__(self, other):
+            raise AssertionError()
+
+    shared = {"x": Uncomparable()}
+    a = DeepDict(a=1)
+    a["b"] = shared
+    b = DeepDict(a=2)
+    b["b"] = shared
+    assert a.diff(b) == [("replace", ("a",), 2)]
+
+
+def test_patch():
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}}, "b": 3, "c": {}}
+    a = DeepDict.wrap(copy.deepcopy(d))
+    b = DeepDict.wrap(
+        {"a": {"aa": 1.0, "ab": {"aba": 2.0}, "ad": {"x": 1}}, "b": {"bb": 3}, "c": {}}
+    )
+    ops = pickle.loads(pickle.dumps(a.diff(b)))
+    a.patch(ops)
+    assert a == b
+    assert isinstance(a["a", "ad"], DeepDict) and a["a", "ad"].parent is a["a"]
+    assert a["a", "ad"].address == ["a", "ad"]
+    assert sorted(c.address for c in a.containers()) == [
+        ["a"],
+        ["a", "ab"],
+        ["a", "ad"],
+        ["b"],
+        ["c"],
+    ]
+
+    a = DeepDict.wrap(d, lazy=True)
+    index = a.enable_index()
+    a.patch([("add", ("c", "x", "y"), 1), ("remove", ("a", "ab", "aba"), None)])
+    assert a["c", "x", "y"] == 1 and ("a", "ab", "aba") not in a
+    assert index[("c", "x", "y")] == 1
+
+    a = DeepDict()
+    a[Key(("t", 1))] = DeepDict(u=1)
+    b = DeepDict()
+    b[Key(("t", 1))] = DeepDict(u=2)
+    ops = a.diff(b)
+    assert ops == [("replace", (("t", 1), "u"), 2)]
+    a.patch(ops)
+    assert a[Key(("t", 1))]["u"] == 2
+
+
+def test_patch_errors():
+    d = {"a": {"aa": 1}, "b": 3, "c": {"cc": {"ccc": "4"}}}
+    dd = DeepDict.wrap(copy.deepcopy(d))
+    for op in (
+        ("replace", ("a", "x"), 1),
+        ("remove", ("a", "x"), None),
+        ("remove", ("x", "y"), None),
+        ("replace", (), 1),
+    ):
+        with pytest.raises(KeyError):
+            dd.patch([op])
+    with pytest.raises(TypeError):
+        dd.patch([("add", ("b", "c"), 1)])
+    with pytest.raises(ValueError):
+        dd.patch([("move", ("b",), 1)])
+    dd["c"].lock()
+    with pytest.raises(DeepDictLockedError):
+        dd.patch([("replace", ("c", "cc", "ccc"), 1)])
+    assert dd == d
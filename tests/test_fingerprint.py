@@ -0,0 +1,159 @@
+import copy
+import pickle
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Key
+
+
+def _fresh(dd: DeepDict) -> str:
+    """Returns the fingerprint of a layout, computed from scratch."""
+    for c in dd.containers(inclusive=True):
+        c._fingerprint = None
+    return dd.fingerprint()
+
+
+class Uncomparable:
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        raise AssertionError()
+
+    def __reduce__(self):
+        return Uncomparable, (self.value,)
+
+
+def test_fingerprint():
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}}, "b": 3, "c": "4"}
+    dd = DeepDict.wrap(copy.deepcopy(d))
+    fingerprint = dd.fingerprint()
+    assert isinstance(fingerprint, str) and len(fingerprint) == 32
+    assert dd.fingerprint() == fingerprint
+
+    # order and laziness don't matter
+    reordered = {k: copy.deepcopy(d[k]) for k in reversed(list(d))}
+    assert DeepDict.wrap(reordered).fingerprint() == fingerprint
+    assert DeepDict.wrap(copy.deepcopy(d), lazy=True).fingerprint() == fingerprint
+
+    # neither do plain dictionaries among the values
+    dd2 = DeepDict.wrap(copy.deepcopy(d))
+    dd2["a"] = {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}}
+    assert not isinstance(dict.__getitem__(dd2, "a"), DeepDict)
+    assert dd2.fingerprint() == fingerprint
+
+    # but types, keys and values do
+    for address, value in ((("b",), 3.0), (("a", "ac", "x"), None), (("d",), {})):
+        other = DeepDict.wrap(copy.deepcopy(d))
+        other[address] = value
+        assert other.fingerprint() != fingerprint
+    assert DeepDict.wrap({"a": {"b": 1}}).fingerprint() != DeepDict.wrap(
+        {"a": {"c": 1}}
+    ).fingerprint()
+    assert DeepDict.wrap({"a": {}}).fingerprint() != DeepDict.wrap(
+        {"a": None}
+    ).fingerprint()
+    assert DeepDict().fingerprint() == DeepDict().fingerprint()
+
+
+def test_fingerprint_is_invalidated():
+    d = {
+        "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+        "b": 3,
+        "c": {"cc": {"ccc": "4"}},
+    }
+    dd = DeepDict.wrap(copy.deepcopy(d))
+    expected = DeepDict.wrap(d)
+
+    def check():
+        assert dd.fingerprint() == _fresh(expected)
+        for c in dd.containers():
+            # pickled copies don't have cached fingerprints
+            assert c.fingerprint() == pickle.loads(pickle.dumps(c)).fingerprint()
+
+    dd.fingerprint()
+    unchanged = dd["c"]._fingerprint
+    for address, value in (
+        (("a", "ab", "aba"), 5.0),
+        (("a", "ac", "x", "y"), 1),
+        (("a", "ab"), DeepDict(z=1)),
+    ):
+        dd[address] = value
+        expected[address] = DeepDict(z=1) if isinstance(value, DeepDict) else value
+        assert dd._fingerprint is None and dd["a"]._fingerprint is None
+        check()
+    assert dd["c"]._fingerprint is unchanged
+
+    for address in (("a", "ac", "x"), ("b",)):
+        del dd[address]
+        del expected[address]
+        check()
+
+    dd.update(b=4)
+    expected["b"] = 4
+    check()
+    dd["a"].pop("aa")
+    del expected["a", "aa"]
+    check()
+    dd[Key(("t", 1))] = 1
+    expected[Key(("t", 1))] = 1
+    check()
+
+    # a subtree that leaves the layout keeps its fingerprint
+    a = dd.pop("a")
+    fingerprint = a.fingerprint()
+    assert a._fingerprint is not None and dd._fingerprint is None
+    a["x"] = 1
+    assert a.fingerprint() != fingerprint
+
+
+def test_fingerprint_of_lazy_layouts():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {}}, "c": {"cc": {"ccc": "4"}}}, lazy=True)
+    dd.fingerprint()
+    dd["c", "cc", "ccc"] = "5"
+    assert dd.fingerprint() == DeepDict.wrap(dd.to_dict()).fingerprint()
+
+
+def test_fingerprint_with_bulk_writes():
+    np = pytest.importorskip("numpy")
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}}, "b": 3, "c": "4"}
+    )
+    fingerprint = dd.fingerprint()
+    data, addresses = dd.gather()
+    dd.scatter(data * 2, addresses)
+    assert dd.fingerprint() != fingerprint
+    dd.scatter(np.asarray(data), addresses)
+    assert dd.fingerprint() == fingerprint
+    dd.map_leaves(str, vtype=int)
+    assert dd.fingerprint() == DeepDict.wrap(dd.to_dict()).fingerprint()
+
+
+def test_fingerprint_with_writes_into_tables():
+    pytest.importorskip("numpy")
+    from sigmaepsilon.deepdict import ColumnarTable
+
+    records = {i: {"E": 210.0 + i, "id": i} for i in range(3)}
+    a = DeepDict.wrap({"el": ColumnarTable.from_records(records), "x": 1})
+    b = DeepDict.wrap({"el": ColumnarTable.from_records(records), "x": 1})
+    fingerprint = a.fingerprint()
+    assert b.fingerprint() == fingerprint
+    a["el", 0, "E"] = 99.0
+    assert a.fingerprint() != fingerprint
+    assert a.diff(b) == [("replace", ("el",), b["el"])]
+    b["el", 0, "E"] = 99.0
+    assert a.fingerprint() == b.fingerprint()
+    assert a.diff(b) == []
+
+    a["p"] = {"q": {"r": 1}}
+    fingerprint = a.fingerprint()
+    a["p", "q", "r"] = 2
+    assert a.fingerprint() != fingerprint
+    assert a.fingerprint() == _fresh(a)
+
+
+def test_diff_uses_cached_fingerprints():
+    a = DeepDict.wrap({"a": {"x": Uncomparable(1)}, "b": 1})
+    b = DeepDict.wrap({"a": {"x": Uncomparable(1)}, "b": 2})
+    a.fingerprint(), b.fingerprint()
+    assert a.diff(b) == [("replace", ("b",), 2)]
@@ -0,0 +1,79 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Address
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+np = pytest.importorskip("numpy")
+
+
+def test_gather():
+    dd = DeepDict.wrap(
+        {
+            "steel": {"E": 210.0, "nu": 0.3, "name": "S235"},
+            "elements": {i: {"A": float(i), "n": i} for i in range(5)},
+            "scale": 1.0,
+        }
+    )
+    data, addresses = dd.gather()
+    assert isinstance(data, np.ndarray)
+    assert data.dtype == float
+    assert data.tolist() == list(dd.values(deep=True, vtype=float))
+    assert addresses[0] == ("steel", "E")
+    assert addresses[-1] == ("scale",)
+    assert all(dd[a] == v for a, v in zip(addresses, data))
+
+    data, addresses = dd.gather(int, dtype=np.int64, address_type=list)
+    assert data.tolist() == [0, 1, 2, 3, 4]
+    assert addresses[0] == ["elements", 0, "n"]
+
+    data, addresses = dd.gather(bytes)
+    assert data.shape == (0,) and addresses == []
+
+
+def test_scatter():
+    dd = DeepDict.wrap(
+        {
+            "steel": {"E": 210.0, "nu": 0.3, "name": "S235"},
+            "elements": {i: {"A": float(i), "n": i} for i in range(5)},
+            "scale": 1.0,
+        }
+    )
+    data, addresses = dd.gather()
+    dd.scatter(data * 2, addresses)
+    assert dd["steel", "E"] == 420.0
+    assert dd["elements", 3, "A"] == 6.0
+    assert type(dd["scale"]) is float
+
+    addresses = [Address("scale"), ["steel", "nu"]]
+    dd.scatter([1, 2], addresses)
+    assert dd["scale"] == 1 and dd["steel", "nu"] == 2
+
+
+def test_scatter_errors():
+    dd = DeepDict.wrap({"steel": {"E": 210.0}, "scale": 1.0})
+    with pytest.raises(ValueError):
+        dd.scatter([1.0], [("scale",), ("steel", "E")])
+    with pytest.raises(KeyError):
+        dd.scatter([1.0], [("steel", "G")])
+    with pytest.raises(KeyError):
+        dd.scatter([1.0], [("concrete", "E")])
+    assert "concrete" not in dd
+    with pytest.raises(TypeError):
+        dd.scatter([1.0], [("steel",)])
+    with pytest.raises(TypeError):
+        dd.scatter([1.0], [("scale", "x")])
+
+    dd.lock()
+    with pytest.raises(DeepDictLockedError):
+        dd.scatter([1.0], [("scale",)])
+
+
+def test_scatter_updates_the_indices():
+    dd = DeepDict.wrap({"steel": {"E": 210.0, "n": 10}, "elements": {1: {"A": 10.0}}})
+    dd.enable_index()
+    dd.enable_type_index()
+    data, addresses = dd.gather()
+    dd.scatter(data.astype(int), addresses)
+    assert dd.index["steel", "E"] == 210
+    assert list(dd.values(deep=True, vtype=float)) == []
+    assert dd.gather(int)[0].sum() == 210 + 10 + 10
@@ -0,0 +1,79 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Key
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+
+def test_multi_level_access():
+    dd = DeepDict()
+    dd["a", "b", "c", "d"] = 1
+    assert dd["a", "b", "c", "d"] == 1
+    assert dd[["a", "b", "c", "d"]] == 1
+    assert dd["a", ("b", "c"), "d"] == 1
+    assert dd["a", "b"]["c", "d"] == 1
+    assert dd[("a",)] is dd["a"]
+    assert ("a", "b", "c", "d") in dd
+    assert ("a", "x") not in dd
+
+    dd["a", Key((1, 2)), "c"] = 2
+    assert dd["a", Key((1, 2)), "c"] == 2
+    assert dd["a"][Key((1, 2))]["c"] == 2
+    assert ("a", Key((1, 2)), "c") in dd
+
+    del dd["a", "b", "c", "d"]
+    assert ("a", "b", "c") in dd
+    assert ("a", "b", "c", "d") not in dd
+    del dd[("a",)]
+    assert "a" not in dd
+
+
+def test_empty_address():
+    dd = DeepDict()
+    with pytest.raises(KeyError):
+        dd[()]
+
+
+def test_plain_dict_on_the_path():
+    dd = DeepDict(a={"b": {"c": 1}})
+    with pytest.raises(KeyError):
+        dd["a", "b", "c"]
+
+
+def test_value_on_the_path_is_not_a_deepdict():
+    dd = DeepDict()
+    dd["a"] = 1
+    with pytest.raises(TypeError, match="The value of key 'a' is not a DeepDict!"):
+        dd.__missing__(("a", "b", "c"))
+
+
+def test_locked_level_on_the_path():
+    dd = DeepDict()
+    dd["a", "b"] = 1
+    dd["a"].lock()
+    with pytest.raises(
+        DeepDictLockedError, match=r"Missing key '\('c',\)' and the object is locked!"
+    ):
+        dd.__missing__(("a", "c"))
+
+    with pytest.raises(DeepDictLockedError):
+        dd["a", "c", "d"] = 1
+
+    assert dd["a", "b"] == 1
+
+
+def test_unhashable_item_on_the_path():
+    dd = DeepDict()
+    dd["a", "b"] = 1
+    with pytest.raises(TypeError, match="is not hashable"):
+        ("a", {"b": 1}) in dd
+
+
+def test_very_long_address():
+    address = tuple(range(5000))
+    dd = DeepDict()
+    dd[address] = 1
+    assert dd[address] == 1
+    assert address in dd
+    assert dd[address[:-1]].depth == len(address) - 1
+    del dd[address]
+    assert address not in dd
@@ -0,0 +1,150 @@
+import gc
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, AddressIndex, Key, dictparser, parsedicts_addr
+
+
+def _expected(dd: DeepDict) -> dict:
+    """
+    Returns the entries an index of `dd` should have, built with a full scan.
+    """
+    entries = {tuple(addr): value for addr, value in dictparser(dd, dtype=DeepDict)}
+    for addr, value in parsedicts_addr(dd, inclusive=False, dtype=DeepDict):
+        entries[tuple(addr)] = value
+    # keys that are addresses themselves are not indexed
+    return {
+        addr: value
+        for addr, value in entries.items()
+        if not any(isinstance(key, tuple) for key in addr)
+    }
+
+
+def _check(dd: DeepDict) -> None:
+    index = dd.index
+    assert isinstance(index, AddressIndex)
+    expected = _expected(dd)
+    assert set(index) == set(expected)
+    assert all(index[addr] is value for addr, value in expected.items())
+
+
+def test_index_is_opt_in():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3})
+    assert dd.index is None
+    index = dd.enable_index()
+    assert dd.index is index
+    assert dd.enable_index() is index
+    assert index.root is dd
+    _check(dd)
+    dd.disable_index()
+    assert dd.index is None
+    dd.disable_index()
+
+
+def test_indexed_lookups():
+    dd = DeepDict.wrap({"a": {"ab": {"aba": 2}}, "c": {"cc": {"ccc": 4}}})
+    dd.enable_index()
+    assert dd["a", "ab", "aba"] == 2
+    assert dd[["a", "ab", "aba"]] == 2
+    assert dd["c", "cc"] is dd["c"]["cc"]
+    assert ("a", "ab", "aba") in dd
+    assert ("a", "ab", "x") not in dd
+    assert dd.index.get(("a", "x")) is None
+    with pytest.raises(KeyError):
+        dd.index["a", "x"]
+
+
+def test_index_follows_changes():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    )
+    dd.enable_index()
+
+    dd["a", "ab", "abb"] = 5
+    dd["d", "dd", "ddd"] = 6
+    dd["c"] = DeepDict.wrap({"x": {"y": 7}})
+    del dd["a", "ab"]
+    dd["b"] = {"plain": 1}
+    _check(dd)
+    assert dd["c", "x", "y"] == 7
+    assert ("c", "cc", "ccc") not in dd.index
+
+    dd["c", "x"].update(z=8)
+    dd["c", "x"].pop("y")
+    dd["d"].setdefault("de", 9)
+    dd["d", "dd"].clear()
+    dd.popitem()
+    _check(dd)
+
+    dd["a"] |= {"ac": 10}
+    assert dd.index["a", "ac"] == 10
+
+
+def test_index_with_lazy_layouts():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}, lazy=True
+    )
+    dd.enable_index()
+    _check(dd)
+    dd["e"] = DeepDict.wrap({"ee": {"eee": 1}}, lazy=True)
+    assert dd.index["e", "ee", "eee"] == 1
+    _check(dd)
+
+
+def test_index_skips_special_keys():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3})
+    dd.enable_index()
+    dd[Key(("a", "aa"))] = DeepDict(x=1)
+    assert ("a", "aa") in dd.index
+    assert dd["a", "aa"] == 1
+    assert dd[Key(("a", "aa"))]["x"] == 1
+    _check(dd)
+
+
+def test_prefix_queries():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    )
+    index = dd.enable_index()
+    assert list(index.under(("a",))) == [
+        (("a", "aa"), 1),
+        (("a", "ab"), dd["a", "ab"]),
+        (("a", "ab", "aba"), 2),
+    ]
+    assert list(index.under(["c", "cc"])) == [(("c", "cc", "ccc"), 4)]
+    assert list(index.under(("b",))) == []
+    assert list(index.under(("x",))) == []
+    assert len(list(index.under(()))) == len(index)
+
+
+def test_only_roots_are_indexed():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3})
+    with pytest.raises(ValueError):
+        dd["a"].enable_index()
+
+    other = DeepDict.wrap({"x": {"y": 1}})
+    other.enable_index()
+    dd["o"] = other
+    assert other.index is None
+    assert other._observers is None
+    assert dd["o", "x", "y"] == 1
+
+
+def test_observed_roots_follow_the_lifetime_of_the_roots():
+    gc.collect()
+    count = DeepDict._observed_roots
+
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3})
+    dd.enable_index()
+    dd.enable_type_index()
+    assert DeepDict._observed_roots == count + 1
+    dd.disable_index()
+    dd.disable_type_index()
+    assert DeepDict._observed_roots == count
+
+    # dropping an indexed root releases it without disabling the index
+    dd.enable_index()
+    assert DeepDict._observed_roots == count + 1
+    del dd
+    gc.collect()
+    assert DeepDict._observed_roots == count
@@ -0,0 +1,168 @@
+import pickle
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Journal, Key
+
+
+def test_journal():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2.0}, "ac": {}}, "b": 3, "c": {"cc": "4"}},
+        lazy=True,
+    )
+    journal = dd.enable_journal()
+    assert isinstance(journal, Journal)
+    assert dd.journal is journal and dd.enable_journal() is journal
+    assert journal.root is dd and len(journal) == 0
+
+    dd["a", "ab", "aba"] = 5.0
+    dd["x", "y", "z"] = 1
+    dd["b"] = 4
+    del dd["a", "ac"]
+    dd["a", "ac"] = 0
+    assert journal.dirty_addresses() == [("a", "ab", "aba"), ("x",), ("b",), ("a", "ac")]
+
+    # a change of an address covers the changes below it
+    dd["a", "ab", "abc"] = 6
+    del dd["a"]["ab"]
+    assert journal.dirty_addresses() == [("x",), ("b",), ("a", "ac"), ("a", "ab")]
+    dd["x", "y", "w"] = 2
+    assert journal.dirty_addresses() == [("x",), ("b",), ("a", "ac"), ("a", "ab")]
+    assert journal.changes() == [
+        ("add", ("x",), {"y": {"z": 1, "w": 2}}),
+        ("add", ("b",), 4),
+        ("add", ("a", "ac"), 0),
+        ("remove", ("a", "ab"), None),
+    ]
+
+    journal.clear_dirty()
+    assert journal.changes() == [] and len(journal) == 0
+    dd.update(b=5)
+    dd.setdefault("d", 6)
+    dd[Key(("t", 1))] = DeepDict(u=1)
+    dd[Key(("t", 1))]["u"] = 2
+    dd.pop("c")
+    assert journal.dirty_addresses() == [("b",), ("d",), (("t", 1),), ("c",)]
+
+    dd.disable_journal()
+    assert dd.journal is None
+    dd["b"] = 6
+    assert journal.dirty_addresses() == [("b",), ("d",), (("t", 1),), ("c",)]
+
+
+def test_checkpoints():
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+            "b": 3,
+            "c": {"cc": {"ccc": "4"}},
+        }
+    )
+    journal = dd.enable_journal()
+    checkpoint = pickle.loads(pickle.dumps(dd))
+
+    edits = [
+        lambda: dd.__setitem__(("a", "ab", "aba"), 5.0),
+        lambda: dd.__setitem__(("new", "level"), {"x": 1}),
+        lambda: dd.__delitem__(("c", "cc")),
+        lambda: dd["a"].clear(),
+        lambda: dd.__setitem__(("a", "z"), [1]),
+        lambda: dd.__setitem__(Key(("t", 1)), 1),
+    ]
+    for edit in edits:
+        edit()
+        checkpoint.patch(journal.changes())
+        journal.clear_dirty()
+        assert checkpoint == dd
+
+
+def test_journal_of_items_added_and_deleted():
+    dd = DeepDict.wrap({"a": 1, "b": {"c": 2}})
+    journal = dd.enable_journal()
+    checkpoint = pickle.loads(pickle.dumps(dd))
+    dd["x"] = 2
+    del dd["x"]
+    assert journal.changes() == [] and journal.dirty_addresses() == []
+
+    dd["n", "m", "k"] = 1
+    dd["n", "m", "j"] = 2
+    del dd["n"]
+    dd["b", "d", "e"] = 3
+    del dd["b", "d"]
+    assert journal.changes() == []
+    del dd["b", "c"]
+    dd["a"] = 5
+    del dd["a"]
+    assert journal.changes() == [("remove", ("b", "c"), None), ("remove", ("a",), None)]
+    checkpoint.patch(journal.changes())
+    assert checkpoint == dd
+
+    # an item that existed at the checkpoint is removed, even if it was set since
+    journal.clear_dirty()
+    dd["b"] = {"f": 1}
+    del dd["b"]
+    assert journal.changes() == [("remove", ("b",), None)]
+
+
+def test_journal_of_failed_writes_into_containers():
+    dd = DeepDict.wrap({"x": "str", "y": 1})
+    dd["p"] = {"q": (1, 2)}
+    journal = dd.enable_journal()
+    fingerprint = dd.fingerprint()
+    with pytest.raises(TypeError):
+        dd["x", 0] = 1
+    with pytest.raises(TypeError):
+        dd["p", "q", 0] = 1
+    with pytest.raises(TypeError):
+        dd.scatter([1], [("p", "q", 0)])
+    assert journal.dirty_addresses() == []
+    assert dd._fingerprint is not None and dd.fingerprint() == fingerprint
+
+
+def test_journal_with_bulk_writes():
+    pytest.importorskip("numpy")
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}}, "b": 3})
+    journal = dd.enable_journal()
+    data, addresses = dd.gather()
+    dd.scatter(data * 2, addresses)
+    dd.map_leaves(str, vtype=int)
+    assert journal.dirty_addresses() == [("a", "ab", "aba"), ("a", "aa"), ("b",)]
+
+
+def test_journal_with_writes_into_tables():
+    pytest.importorskip("numpy")
+    from sigmaepsilon.deepdict import ColumnarTable
+
+    records = {i: {"E": 210.0 + i, "id": i} for i in range(3)}
+    dd = DeepDict.wrap({"m": {"el": ColumnarTable.from_records(records)}, "x": 1})
+    journal = dd.enable_journal()
+    checkpoint = pickle.loads(pickle.dumps(dd))
+
+    dd["m", "el", 0, "E"] = 99.0
+    changes = journal.changes()
+    assert changes == [("add", ("m", "el"), dd["m", "el"])]
+    assert changes[0][2] is not dd["m", "el"]
+    dd["m", "el", 1, "E"] = 98.0
+    assert changes[0][2][1, "E"] == 211.0
+    checkpoint.patch(journal.changes())
+    assert checkpoint["m", "el"].to_dict() == dd["m", "el"].to_dict()
+
+    journal.clear_dirty()
+    dd["y"] = DeepDict(el=ColumnarTable.from_records(records))
+    changes = journal.changes()
+    dd["y", "el", 0, "E"] = 0.0
+    assert changes[0][2]["el"][0, "E"] == 210.0
+    assert journal.dirty_addresses() == [("y",)]
+
+
+def test_journal_of_roots_only():
+    dd = DeepDict.wrap({"a": {"aa": 1}, "b": 3})
+    with pytest.raises(ValueError):
+        dd["a"].enable_journal()
+
+    other = DeepDict(x=1)
+    journal = other.enable_journal()
+    dd["other"] = other
+    assert other.journal is None
+    other["x"] = 2
+    assert journal.changes() == []
@@ -0,0 +1,234 @@
+import io
+import json
+
+import pytest
+
+from sigmaepsilon.deepdict import (
+    DeepDict,
+    Key,
+    loadjson,
+    loadndjson,
+    dumpjson,
+    dumpndjson,
+)
+
+
+def test_loadjson():
+    d = {
+        "a": {"aa": 1, "ab": {"aba": 2.5, "abb": [1, {"x": 2}]}, "ac": {}},
+        "b": "3",
+        "c": {"cc": {"ccc": None, "ccd": True}, "cd": -1e-3},
+        "d": [],
+    }
+    text = json.dumps(d, indent=2)
+    expected = DeepDict.wrap(d)
+    for chunk_size in (1, 7, 2**16):
+        dd = loadjson(io.StringIO(text), chunk_size=chunk_size)
+        assert dd == expected
+        assert list(dd.items(deep=True, return_address=True)) == list(
+            expected.items(deep=True, return_address=True)
+        )
+        assert [c.address for c in dd.containers()] == [
+            c.address for c in expected.containers()
+        ]
+        assert dd["a", "ab"].parent is dd["a"]
+        assert not isinstance(dd["a", "ab", "abb"][1], DeepDict)
+
+
+def test_loadjson_with_files(tmp_path):
+    class MyDeepDict(DeepDict): ...
+
+    d = {"a": {"aa": 1, "ab": {"aba": 2.5}}, "b": "3", "c": [None, True]}
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(d), encoding="utf-8")
+    dd = loadjson(path, cls=MyDeepDict)
+    assert all(isinstance(c, MyDeepDict) for c in dd.containers(inclusive=True))
+    assert dd == d
+
+    with open(path, "rb") as file:
+        assert loadjson(file) == d
+        assert not file.closed
+
+
+def test_loadjson_duplicate_keys():
+    dd = loadjson(io.StringIO('{"a": {"b": 1}, "a": 2, "c": 3, "c": {"d": 4}}'))
+    assert dd == {"a": 2, "c": {"d": 4}}
+    assert [c.address for c in dd.containers()] == [["c"]]
+
+
+@pytest.mark.parametrize(
+    "text", ["[1, 2]", '{"a": 1', '{"a" 1}', '{"a": 1}}', '{"a": 1,}', "{1: 2}", ""]
+)
+def test_loadjson_invalid(text):
+    with pytest.raises(ValueError):
+        loadjson(io.StringIO(text), chunk_size=2)
+
+
+def test_loadjson_error_positions():
+    text = '{"a": [' + ", ".join(["1"] * 1000) + '],\n "b": 1,\n "c" 2}'
+    with pytest.raises(json.JSONDecodeError) as info:
+        loadjson(io.StringIO(text), chunk_size=16)
+    error = info.value
+    assert (error.pos, error.lineno, error.colno) == (text.index("2}"), 3, 6)
+
+    text = text.replace('"c" 2', '"c": [1, }')
+    with pytest.raises(json.JSONDecodeError) as info:
+        loadjson(io.StringIO(text), chunk_size=16)
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    assert str(info.value) == str(expected.value)
+
+
+def test_loadndjson(tmp_path):
+    lines = [
+        {"a.aa": 1, "a.ab": {"aba": 2.5}},
+        {"b": [1, 2]},
+        {},
+        {"a.ab.abb": "x", "c": {"cc": {"ccc": None}}},
+    ]
+    path = tmp_path / "data.ndjson"
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n")
+    dd = loadndjson(path)
+    assert dd == {
+        "a": {"aa": 1, "ab": {"aba": 2.5, "abb": "x"}},
+        "b": [1, 2],
+        "c": {"cc": {"ccc": None}},
+    }
+    assert dd["c", "cc"].address == ["c", "cc"]
+
+    dd = loadndjson(io.StringIO('{"a.b": 1}\n{"a/c": 2}'), sep="/")
+    assert dd == {"a.b": 1, "a": {"c": 2}}
+    dd = loadndjson(io.StringIO('{"a.b": 1}'), sep=None)
+    assert dd == {"a.b": 1}
+
+
+def test_loadndjson_merges_objects():
+    lines = [
+        {"a.c.e": 1, "b": 2, "d": 3},
+        {"a.c": {"d": 2}, "a": {"f": {}}, "b": {"x": 1}, "d.y": 4},
+        {"a": {"c": {"e": 5}}, "a.f": {}},
+    ]
+    text = "\n".join(json.dumps(line) for line in lines)
+    dd = loadndjson(io.StringIO(text))
+    assert dd == {
+        "a": {"c": {"e": 5, "d": 2}, "f": {}},
+        "b": {"x": 1},
+        "d": {"y": 4},
+    }
+    assert dd["a", "c"].parent is dd["a"]
+    assert [c.address for c in dd.containers()] == [
+        ["a"],
+        ["a", "c"],
+        ["a", "f"],
+        ["b"],
+        ["d"],
+    ]
+
+
+def test_dumpjson(tmp_path):
+    d = {
+        "a": {"aa": 1, "ab": {"aba": 2.5, "abb": [1, {"x": 2}]}, "ac": {}},
+        "b": "3",
+        "c": {"cc": {"ccc": None, "ccd": True}, "cd": -1e-3},
+        "d": [],
+    }
+    dd = DeepDict.wrap(d)
+    for chunk_size in (1, 2**16):
+        file = io.StringIO()
+        dumpjson(dd, file, chunk_size=chunk_size)
+        assert file.getvalue() == json.dumps(d)
+
+    path = tmp_path / "data.json"
+    dumpjson(dd, path)
+    assert loadjson(path) == dd
+    with open(path, "wb") as file:
+        dumpjson(dd, file)
+        assert not file.closed
+    assert json.loads(path.read_text(encoding="utf-8")) == d
+
+    # lazy layouts are written without being promoted
+    dd = DeepDict.wrap(d, lazy=True)
+    file = io.StringIO()
+    dumpjson(dd, file)
+    assert file.getvalue() == json.dumps(d)
+    assert dd._lazy is not None
+
+    d = {1: {2.5: True, None: 1}, False: {}}
+    file = io.StringIO()
+    dumpjson(DeepDict.wrap(d), file)
+    assert file.getvalue() == json.dumps(d)
+    file = io.StringIO()
+    dumpjson(DeepDict(), file)
+    assert file.getvalue() == "{}"
+
+    dd = DeepDict()
+    dd[Key((1, 2))] = 1
+    with pytest.raises(TypeError):
+        dumpjson(dd, io.StringIO())
+
+
+def test_dumpndjson(tmp_path):
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.5, "abb": [1, {"x": 2}]}, "ac": {}},
+            "b": "3",
+            "c": {"cc": {"ccc": None, "ccd": True}, "cd": -1e-3},
+        }
+    )
+    path = tmp_path / "data.ndjson"
+    dumpndjson(dd, path)
+    lines = path.read_text().splitlines()
+    assert len(lines) == len(list(dd.values(deep=True))) + 1
+    assert json.loads(lines[0]) == {"a.aa": 1}
+    assert loadndjson(path) == dd
+
+    file = io.StringIO()
+    dumpndjson(dd, file, sep="/")
+    file.seek(0)
+    assert loadndjson(file, sep="/") == dd
+
+    dd = DeepDict.wrap({"x": {"nan": float("inf"), 1: True, "s": 'q"é'}})
+    file = io.StringIO()
+    dumpndjson(dd, file)
+    assert file.getvalue().splitlines() == [
+        json.dumps({"x.nan": float("inf")}),
+        json.dumps({"x.1": True}),
+        json.dumps({"x.s": 'q"é'}),
+    ]
+
+
+@pytest.mark.parametrize("dump", [dumpjson, dumpndjson])
+def test_dump_streams_items(dump):
+    class File(io.StringIO):
+        def write(self, text: str) -> int:
+            sizes.append(len(text))
+            return super().write(text)
+
+    sizes = []
+    d = {"a": {str(i): i for i in range(1000)}, "b": {"c": {}, "d": {}}}
+    file = File()
+    dump(DeepDict.wrap(d), file, chunk_size=32)
+    assert len(sizes) > 100
+    assert max(sizes) < 64
+    file.seek(0)
+    load = loadjson if dump is dumpjson else loadndjson
+    assert load(file) == d
+
+
+@pytest.mark.parametrize("dump", [dumpjson, dumpndjson])
+def test_dump_tables(dump):
+    pytest.importorskip("numpy")
+    from sigmaepsilon.deepdict import ColumnarTable
+
+    records = {0: {"E": 210.0, "id": 1}, 1: {"E": 70.0, "id": 2}}
+    dd = DeepDict.wrap({"model": {"name": "frame"}})
+    dd["model", "elements"] = ColumnarTable.from_records(records)
+    dd["model", "empty"] = ColumnarTable({"E": []})
+    file = io.StringIO()
+    dump(dd, file)
+    file.seek(0)
+    load = loadjson if dump is dumpjson else loadndjson
+    expected = json.loads(json.dumps(dd.to_dict()))
+    assert load(file).to_dict() == expected
+    if dump is dumpjson:
+        assert file.getvalue() == json.dumps(dd.to_dict())
@@ -0,0 +1,75 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict
+
+
+def _raw(dd: DeepDict, key):
+    return dict.__getitem__(dd, key)
+
+
+def test_lazy_wrap_is_shallow():
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    dd = DeepDict.wrap(d, lazy=True)
+    assert _raw(dd, "a") is d["a"]
+    assert _raw(dd, "c") is d["c"]
+    assert dd == d
+
+
+def test_promotion_on_getitem():
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    dd = DeepDict.wrap(d, lazy=True)
+    a = dd["a"]
+    assert isinstance(a, DeepDict)
+    assert _raw(dd, "a") is a
+    assert a.parent is dd and a.key == "a"
+    assert _raw(a, "ab") is d["a"]["ab"]
+    assert dd["a", "ab", "aba"] == 2
+    assert dd["a", "ab"].address == ["a", "ab"]
+    assert isinstance(_raw(dd, "c"), dict) and not isinstance(_raw(dd, "c"), DeepDict)
+    assert dd.get("c").parent is dd
+    # the source is not modified
+    assert type(d["a"]["ab"]) is dict
+
+
+def test_promotion_on_iteration():
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    dd = DeepDict.wrap(d, lazy=True)
+    assert all(isinstance(v, DeepDict) for v in dd.values() if isinstance(v, dict))
+    assert [c.key for c in dd.containers()] == ["a", "ab", "c", "cc"]
+    assert [c.address for c in dd.containers()] == [["a"], ["a", "ab"], ["c"], ["c", "cc"]]
+
+    dd = DeepDict.wrap(d, lazy=True)
+    assert all(isinstance(v, DeepDict) for _, v in dd.items() if isinstance(v, dict))
+    assert not dd.is_leaf()
+    assert dd["c", "cc"].is_leaf()
+
+
+def test_deep_iteration_of_a_lazy_layout():
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    dd = DeepDict.wrap(d, lazy=True)
+    eager = DeepDict.wrap(d, copy=True)
+    assert list(dd.items(deep=True)) == list(eager.items(deep=True))
+    assert list(dd.items(deep=True, return_address=True)) == list(
+        eager.items(deep=True, return_address=True)
+    )
+
+
+def test_writing_into_a_lazy_layout():
+    d = {"a": {"aa": 1, "ab": {"aba": 2}}, "b": 3, "c": {"cc": {"ccc": 4}}}
+    dd = DeepDict.wrap(d, lazy=True)
+    dd["c", "cc", "ddd"] = 5
+    assert dd["c", "cc"].parent is dd["c"]
+    assert "ddd" not in d["c"]["cc"]
+    assert ("c", "cc", "ddd") in dd
+    assert ("a", "ab", "aba") in dd
+
+    del dd["a"]
+    assert "a" not in dd
+    assert dd._lazy is None
+    dd["a"] = {"x": 1}
+    assert type(dd["a"]) is dict
+
+
+def test_lazy_wrap_with_copy():
+    with pytest.raises(ValueError):
+        DeepDict.wrap({"a": {"b": 1}}, lazy=True, copy=True)
@@ -0,0 +1,85 @@
+from sigmaepsilon.deepdict import DeepDict
+
+
+def _check(node: DeepDict) -> None:
+    # the expected values are computed by walking the parent chain
+    depth, address, root = 0, [], node
+    while root.parent is not None:
+        depth += 1
+        address.insert(0, root.key)
+        root = root.parent
+    assert node.depth == depth
+    assert node.address == address
+    assert node.root is root
+
+
+def _check_all(*roots: DeepDict) -> None:
+    for root in roots:
+        for node in root.containers(inclusive=True):
+            _check(node)
+
+
+def test_location_is_cached():
+    dd = DeepDict()
+    dd["a", "b", "c", "d"] = 1
+    node = dd["a", "b", "c"]
+    assert node.depth == 3
+    assert node.address == ["a", "b", "c"]
+    assert node.root is dd
+    assert node._loc is not None
+    assert node._location() is node._location()
+
+
+def test_address_is_a_new_list():
+    dd = DeepDict()
+    dd["a", "b", "c"] = 1
+    node = dd["a", "b"]
+    node.address.append("x")
+    assert node.address == ["a", "b"]
+
+
+def test_move_subtree_between_parents():
+    first, second = DeepDict(), DeepDict()
+    first["a", "b", "c", "d"] = 1
+    second["x", "y"] = 2
+    _check_all(first, second)
+
+    subtree = first["a", "b"]
+    del first["a"]["b"]
+    assert subtree.is_root()
+    _check_all(first, second, subtree)
+
+    second["x", "y2"] = subtree
+    assert subtree.root is second
+    assert subtree["c"].address == ["x", "y2", "c"]
+    _check_all(first, second)
+
+    # moving an ancestor updates the cached values of its descendants
+    third = DeepDict()
+    third["p", "q"] = second["x"]
+    assert subtree["c"].depth == 4
+    assert subtree["c"].root is third
+    assert subtree["c"].address == ["p", "q", "y2", "c"]
+    _check_all(first, second, third)
+
+
+def test_replace_subtree():
+    dd = DeepDict()
+    dd["a", "b", "c"] = 1
+    old = dd["a", "b"]
+    assert old.depth == 2
+    new = DeepDict()
+    new["c", "d"] = 2
+    assert new["c"].depth == 1
+    dd["a", "b"] = new
+    assert old.is_root() and old.depth == 0 and old.address == []
+    assert new["c"].depth == 3
+    assert new["c"].address == ["a", "b", "c"]
+    _check_all(dd, old)
+
+
+def test_location_of_a_root():
+    dd = DeepDict()
+    assert dd.depth == 0
+    assert dd.address == []
+    assert dd.root is dd
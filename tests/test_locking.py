@@ -28,3 +28,60 @@ def test_locked_delitem():
     dd.unlock()
     del dd[key]
     assert key not in dd
+
+
+def test_lock_inheritance():
+    dd = DeepDict()
+    dd["a", "b", "c"] = 1
+    a, b = dd["a"], dd["a", "b"]
+    assert not b.locked
+    dd.lock()
+    assert a.locked and b.locked
+    b.unlock()
+    assert a.locked and not b.locked
+    b["d"] = 2
+    with pytest.raises(DeepDictLockedError):
+        a["e"] = 3
+    dd.unlock()
+    a.lock()
+    assert not dd.locked and a.locked and not b.locked
+    b._locked = None
+    a.lock()
+    assert b.locked
+
+
+def test_lock_state_follows_moved_subtrees():
+    locked, unlocked = DeepDict(), DeepDict()
+    locked["a", "b"] = 1
+    subtree = locked["a"]
+    locked.lock()
+    assert subtree.locked
+
+    unlocked["x"] = subtree
+    assert subtree.parent is unlocked
+    assert not subtree.locked
+    subtree["c"] = 1
+
+    unlocked.lock()
+    assert subtree.locked
+    unlocked.unlock()
+    del unlocked["x"]
+    assert not subtree.locked
+
+
+def test_lock_state_of_a_deep_layout():
+    depth = 5000
+    dd = node = DeepDict()
+    for i in range(depth):
+        child = DeepDict()
+        node[i] = child
+        node = child
+    node["leaf"] = 1
+    assert not node.locked
+    dd.lock()
+    assert node.locked
+    with pytest.raises(DeepDictLockedError):
+        node["leaf"] = 2
+    dd.unlock()
+    node["leaf"] = 2
+    assert node.depth == depth
@@ -0,0 +1,79 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+
+def double(value):
+    return value * 2
+
+
+def test_map_leaves():
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}, "ac": {}}, "b": 3, "c": 4.0}
+    for executor in (None, ThreadPoolExecutor(2)):
+        for chunksize in (1, 2, 1024):
+            dd = DeepDict.wrap(copy.deepcopy(d))
+            dd.map_leaves(double, executor=executor, chunksize=chunksize)
+            assert dd == {
+                "a": {"aa": 2, "ab": {"aba": 4.0, "abb": "xx"}, "ac": {}},
+                "b": 6,
+                "c": 8.0,
+            }
+        if executor is not None:
+            executor.shutdown()
+
+
+def test_map_leaves_with_processes():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}}, "b": 3, "c": {"cc": 4.0}}
+    )
+    with ProcessPoolExecutor(2) as executor:
+        dd.map_leaves(double, vtype=(int, float), executor=executor, chunksize=2)
+    assert list(dd.values(deep=True)) == [2, 4.0, "x", 6, 8.0]
+
+
+def test_map_leaves_order_and_types():
+    seen = []
+
+    def f(value):
+        seen.append(value)
+        return {"v": value} if value == 3 else str(value)
+
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}}, "b": 3, "c": {"cc": 4.0}},
+        lazy=True,
+    )
+    dd.map_leaves(f, vtype=(int, float))
+    assert seen == [1, 2.0, 3, 4.0]
+    assert dd["a", "ab", "aba"] == "2.0"
+    assert dd["a", "ab", "abb"] == "x"
+    assert dd["b"] == {"v": 3}
+
+
+def test_map_leaves_keeps_indices_up_to_date():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0}}, "c": {"cc": {"ccc": 4.0}}})
+    index = dd.enable_index()
+    type_index = dd.enable_type_index()
+    dd["a"].map_leaves(double, vtype=float)
+    assert index[("a", "ab", "aba")] == 4.0
+    assert sorted(type_index.find(float)) == [
+        (("a", "ab", "aba"), 4.0),
+        (("c", "cc", "ccc"), 4.0),
+    ]
+
+
+def test_map_leaves_respects_locks():
+    d = {"a": {"aa": 1, "ab": {"abb": "x"}}, "c": {"cc": 4.0}}
+    dd = DeepDict.wrap(copy.deepcopy(d))
+    dd["c"].lock()
+    with pytest.raises(DeepDictLockedError):
+        dd.map_leaves(double)
+    assert dd == d
+    dd["a"].map_leaves(double)
+    dd.map_leaves(double, vtype=str)
+    assert dd["a", "ab", "abb"] == "xxxx"
+    with pytest.raises(ValueError):
+        dd.map_leaves(double, chunksize=0)
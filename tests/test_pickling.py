@@ -3,7 +3,10 @@ import unittest
 import pickle
 
 from sigmaepsilon.core.testing import SigmaEpsilonTestCase
-from sigmaepsilon.deepdict import DeepDict
+from sigmaepsilon.deepdict import DeepDict, Key
+
+
+class MyDeepDict(DeepDict): ...
 
 
 class TestPickle(SigmaEpsilonTestCase):
@@ -21,6 +24,44 @@ class TestPickle(SigmaEpsilonTestCase):
         self.assertIsInstance(recreated_obj, DeepDict)
         self.assertEqual(recreated_obj["a", "b", "d"], 2)
 
+    def test_pickle_is_lossless(self):
+        data = DeepDict.wrap({"a": {"b": {"c": 1}, "d": [1, 2]}, "e": 3})
+        data["a"]["x"] = MyDeepDict(y=1)
+        data[Key((1, 2))] = DeepDict(z=2)
+        data.name = "root"
+        data["a", "b"].name = "b"
+        data["a", "b"].lock()
+
+        for protocol in (2, 5):
+            recreated_obj = pickle.loads(pickle.dumps(data, protocol=protocol))
+            self.assertEqual(recreated_obj, data)
+            self.assertEqual(recreated_obj.name, "root")
+            self.assertEqual(recreated_obj["a", "b"].name, "b")
+            self.assertTrue(recreated_obj["a", "b"].locked)
+            self.assertFalse(recreated_obj["a"].locked)
+            self.assertIsInstance(recreated_obj["a", "x"], MyDeepDict)
+            self.assertEqual(recreated_obj[Key((1, 2))]["z"], 2)
+            self.assertIs(recreated_obj["a", "b"].parent, recreated_obj["a"])
+            self.assertEqual(recreated_obj["a", "b"].address, ["a", "b"])
+            self.assertEqual(
+                list(recreated_obj.keys(deep=True, return_address=True)),
+                list(data.keys(deep=True, return_address=True)),
+            )
+
+    def test_pickle_subtree(self):
+        data = DeepDict.wrap({"a": {"b": {"c": 1}}})
+        recreated_obj = pickle.loads(pickle.dumps(data["a"]))
+        self.assertTrue(recreated_obj.is_root())
+        self.assertEqual(recreated_obj["b", "c"], 1)
+        self.assertIs(data["a"].parent, data)
+
+    def test_pickle_lazy(self):
+        data = DeepDict.wrap({"a": {"b": {"c": 1}}, "d": 2}, lazy=True)
+        recreated_obj = pickle.loads(pickle.dumps(data))
+        self.assertEqual(recreated_obj._lazy, {"a"})
+        self.assertEqual(recreated_obj["a", "b", "c"], 1)
+        self.assertIsNotNone(data._lazy)
+
 
 if __name__ == "__main__":
     unittest.main()
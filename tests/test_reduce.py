@@ -0,0 +1,85 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import operator
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict
+
+
+def count(counts: Counter, value) -> Counter:
+    counts[type(value).__name__] += 1
+    return counts
+
+
+def test_reduce():
+    dd = DeepDict.wrap(
+        {
+            "x": 0.5,
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}, "ac": {}},
+            "b": 3,
+            "c": {"cc": {"ccc": 4.0}},
+            "d": "y",
+        }
+    )
+    numbers = (int, float)
+    assert dd.reduce(operator.add, 0, vtype=numbers) == 10.5
+    assert dd.reduce(operator.add, 0, vtype=numbers, parallel=True) == 10.5
+    assert dd.reduce(min, float("inf"), vtype=numbers) == 0.5
+    assert dd.reduce(max, float("-inf"), vtype=numbers) == 4.0
+    assert dd.reduce(operator.add, "", vtype=str) == "xy"
+
+    expected = Counter({"float": 3, "int": 2, "str": 2})
+    assert dd.reduce(count, Counter()) == expected
+    assert dd.reduce(count, Counter(), combine=operator.add, parallel=True) == expected
+
+    with ThreadPoolExecutor(2) as executor:
+        assert dd.reduce(operator.add, 0, vtype=int, executor=executor) == 4
+        assert dd["a"].reduce(operator.add, 0, vtype=float, executor=executor) == 2.0
+
+    assert DeepDict().reduce(operator.add, 0) == 0
+    assert dd["a", "ac"].reduce(operator.add, 0) == 0
+    assert dd.reduce(operator.add, 0, vtype=bytes) == 0
+
+
+def test_reduce_with_processes():
+    dd = DeepDict.wrap(
+        {
+            "x": 0.5,
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}, "ac": {}},
+            "b": 3,
+            "c": {"cc": {"ccc": 4.0}},
+            "d": "y",
+        },
+        lazy=True,
+    )
+    with ProcessPoolExecutor(2) as executor:
+        result = dd.reduce(count, Counter(), combine=operator.add, executor=executor)
+        assert result == Counter({"float": 3, "int": 2, "str": 2})
+        assert dd.reduce(operator.add, 0, vtype=float, executor=executor) == 6.5
+
+
+def test_reduce_applies_the_initial_value_once():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}}, "b": 3})
+    expected = dd.reduce(operator.add, 10, vtype=int)
+    assert expected == 14
+    assert dd.reduce(operator.add, 10, vtype=int, parallel=True) == expected
+    with ThreadPoolExecutor(2) as executor:
+        assert dd.reduce(operator.add, 10, vtype=int, executor=executor) == expected
+        assert dd.reduce(operator.add, 10, vtype=bytes, executor=executor) == 10
+
+
+def test_reduce_goes_into_plain_dictionaries():
+    dd = DeepDict(a=1)
+    dd["b"] = {"c": 2, "d": {"e": 3}}
+    assert not isinstance(dict.__getitem__(dd, "b"), DeepDict)
+    assert dd.reduce(operator.add, 0) == dd.reduce(operator.add, 0, parallel=True)
+    assert dd.reduce(operator.add, 0) == 6
+
+
+def test_reduce_keeps_the_order():
+    dd = DeepDict.wrap({"a": {"b": "1", "c": "2"}, "d": "3", "e": {"f": "4"}})
+    assert dd.reduce(operator.add, "") == "1234"
+    assert dd.reduce(operator.add, "0", parallel=True) == "01234"
+    with pytest.raises(TypeError):
+        dd.reduce(operator.add, 0)
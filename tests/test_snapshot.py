@@ -0,0 +1,236 @@
+import asyncio
+import copy
+import gc
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Snapshot, Key
+from sigmaepsilon.deepdict.exceptions import DeepDictLockedError
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_snapshot(lazy):
+    d = {
+        "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+        "b": 3,
+        "c": {"cc": {"ccc": "4"}},
+    }
+    dd = DeepDict.wrap(copy.deepcopy(d), lazy=lazy)
+    snapshot = dd.snapshot()
+    assert isinstance(snapshot, Snapshot)
+    assert snapshot.to_dict() == d
+
+    dd["a", "ab", "aba"] = 5.0
+    dd["x", "y", "z"] = 1
+    dd["b"] = 4
+    del dd["c"]
+    del dd["a", "ac"]
+    dd.update({"d": 5})
+
+    assert snapshot.to_dict() == d
+    assert snapshot == d
+    assert dd.to_dict() == {
+        "a": {"aa": 1, "ab": {"abb": [1, 2], "aba": 5.0}},
+        "b": 4,
+        "x": {"y": {"z": 1}},
+        "d": 5,
+    }
+
+    assert snapshot["a", "ab", "aba"] == 2.0
+    assert snapshot[["c", "cc", "ccc"]] == "4"
+    assert isinstance(snapshot["a"], Snapshot)
+    assert len(snapshot) == 3 and list(snapshot) == ["a", "b", "c"]
+    assert "c" in snapshot and ("a", "ac") in snapshot
+    assert "x" not in snapshot and ("a", "aa", "b") not in snapshot
+    with pytest.raises(KeyError):
+        snapshot["x"]
+    with pytest.raises(KeyError):
+        snapshot["a", "aa", "b"]
+
+    assert list(snapshot.items(deep=True, return_address=True, address_type=tuple)) == [
+        (("a", "aa"), 1),
+        (("a", "ab", "aba"), 2.0),
+        (("a", "ab", "abb"), [1, 2]),
+        (("b",), 3),
+        (("c", "cc", "ccc"), "4"),
+    ]
+    assert list(snapshot.values(deep=True)) == [1, 2.0, [1, 2], 3, "4"]
+    assert list(snapshot.keys(deep=True)) == ["aa", "aba", "abb", "b", "ccc"]
+    assert list(snapshot.keys()) == ["a", "b", "c"]
+
+
+def test_snapshot_is_read_only():
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": 3}
+    dd = DeepDict.wrap(copy.deepcopy(d))
+    snapshot = dd.snapshot()
+    assert snapshot.locked
+    assert not dd.locked
+    with pytest.raises(DeepDictLockedError):
+        snapshot["b"] = 1
+    with pytest.raises(DeepDictLockedError):
+        snapshot["a"]["aa"] = 1
+    with pytest.raises(DeepDictLockedError):
+        del snapshot["b"]
+
+    # a locked layout can be snapshotted
+    dd.lock()
+    assert dd.snapshot().to_dict() == d
+
+
+def test_snapshot_versions():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": 3, "c": {"cc": "4"}})
+    first = dd.snapshot()
+    dd["a", "aa"] = 10
+    second = dd.snapshot()
+    dd["a", "aa"] = 20
+    dd["a", "aa"] = 30
+    third = dd.snapshot()
+
+    assert first["a", "aa"] == 1
+    assert second["a", "aa"] == 10
+    assert third["a", "aa"] == 30
+    assert dd.snapshot()["a", "aa"] == 30
+
+    # only the changed instances save their items
+    assert dd._versions is None and dd["c"]._versions is None
+    assert len(dd["a"]._versions) == 2
+
+    # the items saved for released snapshots are dropped on the next change
+    del first
+    gc.collect()
+    dd["a", "aa"] = 40
+    assert list(dd["a"]._versions) == [second._epoch.value, DeepDict._snapshot_epoch]
+    del second, third
+    gc.collect()
+    dd["a", "aa"] = 50
+    assert dd["a"]._versions is None
+
+
+def test_snapshot_of_nested_instance():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}}, "b": 3})
+    snapshot = dd["a"].snapshot()
+    dd["a", "ab", "abc"] = 1
+    dd["a", "ab"] = 0
+    assert snapshot.to_dict() == {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}}
+
+    # instances created after the snapshot don't save their items
+    dd["n", "m"] = 1
+    dd["n", "m"] = 2
+    assert dd["n"]._versions is None
+
+
+def test_snapshot_bulk_writers():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": 3})
+    snapshot = dd.snapshot()
+    dd.scatter([-1, -3], [("a", "aa"), ("b",)])
+    assert snapshot["a", "aa"] == 1 and snapshot["b"] == 3
+
+    snapshot = dd.snapshot()
+    dd.map_leaves(lambda x: x * 2, vtype=int)
+    assert snapshot["a", "aa"] == -1 and dd["a", "aa"] == -2
+
+    async def value():
+        return 7
+
+    dd["a", "aa"] = value()
+    snapshot = dd.snapshot()
+    assert asyncio.run(dd.aresolve()) == 1
+    assert dd["a", "aa"] == 7
+    assert asyncio.iscoroutine(snapshot["a", "aa"])
+    snapshot["a", "aa"].close()
+
+
+def test_snapshot_special_keys():
+    dd = DeepDict()
+    dd[Key(("a", "b"))] = DeepDict.wrap({"c": 1})
+    snapshot = dd.snapshot()
+    dd[Key(("a", "b"))]["c"] = 2
+    assert snapshot[Key(("a", "b"))]["c"] == 1
+    assert Key(("a", "b")) in snapshot
+    assert snapshot.to_dict() == {("a", "b"): {"c": 1}}
+
+
+def test_snapshots_are_scoped_to_their_layouts():
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": 3, "c": {"cc": {"ccc": "4"}}}
+    a, b = DeepDict.wrap(copy.deepcopy(d)), DeepDict.wrap(copy.deepcopy(d))
+    snapshot = b.snapshot()
+    a["a", "aa"] = 10
+    del a["c"]
+    assert a._versions is None and a["a"]._versions is None
+    b["a", "aa"] = 10
+    assert b["a"]._versions is not None and snapshot["a", "aa"] == 1
+
+    # a snapshot of a nested instance doesn't make its parents save their items
+    nested = a["a"].snapshot()
+    a["b"] = 4
+    a["a", "ab", "aba"] = 5.0
+    assert a._versions is None and nested["ab", "aba"] == 2.0
+
+
+def test_snapshot_of_detached_instances():
+    d = {
+        "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+        "b": 3,
+        "c": {"cc": {"ccc": "4"}},
+    }
+    dd = DeepDict.wrap(copy.deepcopy(d))
+    snapshot = dd.snapshot()
+    removed = dd.pop("a")
+    moved = dd["c", "cc"]
+    other = DeepDict()
+    other["x"] = moved
+    removed["aa"] = 10
+    removed["ab", "aba"] = 5.0
+    moved["ccc"] = "5"
+    assert snapshot.to_dict() == d
+
+
+def test_snapshot_with_writes_into_containers():
+    pytest.importorskip("numpy")
+    from sigmaepsilon.deepdict import ColumnarTable
+
+    records = {i: {"E": 210.0 + i, "id": i} for i in range(3)}
+    dd = DeepDict.wrap({"el": ColumnarTable.from_records(records)})
+    dd["p"] = {"q": {"r": 1}}
+    table = dd["el"]
+    snapshot = dd.snapshot()
+    dd["el", 0, "E"] = 99.0
+    dd["p", "q", "r"] = 2
+    assert snapshot["el", 0, "E"] == 210.0 and dd["el", 0, "E"] == 99.0
+    assert snapshot["p"]["q"]["r"] == 1 and dd["p"]["q"]["r"] == 2
+    assert snapshot["el"] is table and dd["el"] is not table
+
+    # the copies are only made once
+    copy = dd["el"]
+    dd["el", 1, "E"] = 98.0
+    assert dd["el"] is copy and snapshot["el", 1, "E"] == 211.0
+
+    snapshot = dd.snapshot()
+    dd.scatter([0.0], [("el", 2, "E")])
+    dd.map_leaves(lambda x: x + 1, vtype=int)
+    assert snapshot["el", 2, "E"] == 212.0 and dd["el", 2, "E"] == 0.0
+    assert snapshot["el", 2, "id"] == 2 and dd["el", 2, "id"] == 3
+    assert snapshot["p"]["q"]["r"] == 2 and dd["p"]["q"]["r"] == 3
+
+
+def test_snapshot_with_writes_into_lists():
+    dd = DeepDict(a=1)
+    dd["b"] = [1, [2, 3]]
+    dd["c"] = {"d": [4]}
+    snapshot = dd.snapshot()
+    dd["b", 0] = 5
+    dd["b", 1, 0] = 6
+    dd["c", "d", 0] = 7
+    assert dd["b"] == [5, [6, 3]] and dd["c"]["d"] == [7]
+    assert snapshot["b"] == [1, [2, 3]] and snapshot["c"]["d"] == [4]
+
+    # containers that are aliased or contain themselves are copied once
+    shared = [0]
+    cyclic = [shared, shared]
+    cyclic.append(cyclic)
+    dd["e"] = cyclic
+    snapshot = dd.snapshot()
+    dd["e", 0, 0] = 1
+    copy = dd["e"]
+    assert copy is not cyclic and copy[2] is copy and copy[0] is copy[1]
+    assert copy[1] == [1] and shared == [0]
@@ -0,0 +1,95 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, SqliteDeepDict, Key
+
+
+def test_layout_survives_reopening(tmp_path):
+    path = tmp_path / "store.db"
+    d = {"a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}}, "b": 3}
+    with SqliteDeepDict(path) as dd:
+        dd["x"] = d
+        dd["y", "z"] = 5
+
+    with SqliteDeepDict(path, cache_size=2) as dd:
+        assert dd["x", "a", "ab", "aba"] == 2.0
+        assert dd["y", "z"] == 5
+        assert dd.to_dict() == {"x": d, "y": {"z": 5}}
+
+    dd = SqliteDeepDict(path)
+    dd["w"] = 1
+    dd.close()
+    dd = SqliteDeepDict(path)
+    assert "w" not in dd
+    dd.close()
+
+
+def test_addressing():
+    dd = SqliteDeepDict(":memory:", cache_size=2)
+    dd["x"] = {"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": 3, "c": {"cc": {"ccc": "4"}}}
+    x = dd["x"]
+    assert isinstance(x, SqliteDeepDict)
+    assert x.key == "x" and x.address == ["x"] and not x.is_root()
+    assert dd["x", "c"].address == ["x", "c"]
+
+    assert ("x", "a", "aa") in dd
+    assert ("x", "a", "zz") not in dd
+    assert ["x", "b"] in dd
+
+    # missing levels are created the same way as with a DeepDict
+    dd["x", "d", "e"] = 6
+    assert dd["x", "d"].to_dict() == {"e": 6}
+    assert dd["x", "f"].to_dict() == {}
+
+    dd[Key((1, 2))] = 7
+    assert dd[Key((1, 2))] == 7 and 1 not in dd
+
+    del dd["x", "a", "ab"]
+    del dd["x", "f"]
+    assert dd.get("missing") is None
+    assert "missing" not in dd
+    with pytest.raises(KeyError):
+        del dd["missing"]
+    with pytest.raises(TypeError):
+        dd["x", "b", "c"] = 1
+
+    dd["x", "b"] = {"replaced": True}
+    assert list(dd["x"]) == ["a", "c", "d", "b"]
+    dd.close()
+
+
+def test_iteration_matches_deepdict():
+    d = {
+        "a": {"aa": 1, "ab": {"aba": 2.0, "abb": [1, 2]}, "ac": {}},
+        "b": 3,
+        "c": {"cc": {"ccc": "4"}},
+    }
+    dd = SqliteDeepDict(":memory:", cache_size=1)
+    for key, value in d.items():
+        dd[key] = value
+    expected = DeepDict.wrap(d)
+
+    assert len(dd) == len(expected)
+    for deep in (True, False):
+        assert list(dd.keys(deep=deep)) == list(expected.keys(deep=deep))
+    assert list(dd.values(deep=True)) == list(expected.values(deep=True))
+    assert list(dd.values(deep=True, vtype=float)) == [2.0]
+    assert list(dd.items(deep=True, return_address=True, address_type=tuple)) == list(
+        expected.items(deep=True, return_address=True, address_type=tuple)
+    )
+    assert [c.address for c in dd.containers()] == [
+        c.address for c in expected.containers()
+    ]
+    assert [c.key for c in dd.containers(inclusive=True, deep=False)] == [
+        None,
+        "a",
+        "c",
+    ]
+    dd.close()
+
+
+def test_cache_is_bounded():
+    dd = SqliteDeepDict(":memory:", cache_size=3)
+    dd["x"] = {i: {"v": i} for i in range(10)}
+    assert sum(dd["x", i, "v"] for i in range(10)) == 45
+    assert len(dd._store.cache) == 3
+    dd.close()
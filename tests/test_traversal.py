@@ -0,0 +1,126 @@
+import pytest
+
+from sigmaepsilon.deepdict import (
+    DeepDict,
+    dictparser,
+    parseitems,
+    parsedicts,
+    parsedicts_addr,
+    parseaddress,
+)
+
+
+def _deep(depth: int) -> dict:
+    d = {}
+    node = d
+    for i in range(depth):
+        node[i] = {"leaf": i}
+        node = node[i]
+    return d
+
+
+def test_dictparser_order():
+    d = {
+        "a": {"aa": 1, "ab": {}, "ac": {"aca": 2}},
+        "b": 3,
+        "c": {"cc": {"ccc": 4}, "cd": 5},
+        "d": {},
+    }
+    assert list(dictparser(d)) == [
+        (["a", "aa"], 1),
+        (["a", "ac", "aca"], 2),
+        (["b"], 3),
+        (["c", "cc", "ccc"], 4),
+        (["c", "cd"], 5),
+    ]
+
+
+def test_parseitems_order():
+    d = {
+        "a": {"aa": 1, "ab": {}, "ac": {"aca": 2}},
+        "b": 3,
+        "c": {"cc": {"ccc": 4}, "cd": 5},
+        "d": {},
+    }
+    assert list(parseitems(d)) == [
+        ("aa", 1),
+        ("aca", 2),
+        ("b", 3),
+        ("ccc", 4),
+        ("cd", 5),
+    ]
+
+
+def test_parsedicts_order():
+    d = {
+        "a": {"aa": 1, "ab": {}, "ac": {"aca": 2}},
+        "b": 3,
+        "c": {"cc": {"ccc": 4}, "cd": 5},
+        "d": {},
+    }
+    expected = [d["a"], d["a"]["ab"], d["a"]["ac"], d["c"], d["c"]["cc"], d["d"]]
+    result = list(parsedicts(d, inclusive=False))
+    assert len(result) == len(expected)
+    assert all(r is e for r, e in zip(result, expected))
+
+    result = list(parsedicts(d, inclusive=False, deep=False))
+    assert [id(r) for r in result] == [id(d["a"]), id(d["c"]), id(d["d"])]
+
+
+def test_parsedicts_addr_order():
+    d = {
+        "a": {"aa": 1, "ab": {}, "ac": {"aca": 2}},
+        "b": 3,
+        "c": {"cc": {"ccc": 4}, "cd": 5},
+        "d": {},
+    }
+    addresses = [addr for addr, _ in parsedicts_addr(d)]
+    assert addresses == [[], ["a"], ["a", "ab"], ["a", "ac"], ["c"], ["c", "cc"], ["d"]]
+
+    addresses = [addr for addr, _ in parsedicts_addr(d, deep=False)]
+    assert addresses == [[], ["a"], ["c"], ["d"]]
+
+
+def test_addresses_are_independent():
+    d = {"a": {"aa": 1, "ab": {}, "ac": {"aca": 2}}, "b": 3}
+    addresses = [addr for addr, _ in dictparser(d)]
+    addresses[0].append("x")
+    assert addresses[1] == ["a", "ac", "aca"]
+
+
+def test_very_deep_layout():
+    depth = 5000
+    d = _deep(depth)
+
+    leaves = list(dictparser(d))
+    assert len(leaves) == depth
+    assert leaves[-1][0] == list(range(depth)) + ["leaf"]
+    assert leaves[-1][1] == depth - 1
+
+    assert [v for _, v in parseitems(d)] == list(range(depth))
+    assert len(list(parsedicts(d, inclusive=False))) == depth
+    assert len(list(parsedicts_addr(d, inclusive=False))) == depth
+    assert parseaddress(d, list(range(depth)) + ["leaf"]) == depth - 1
+
+
+def test_very_deep_deepdict():
+    depth = 5000
+    dd = DeepDict(_deep(depth))
+    assert list(dd.values(deep=True)) == list(range(depth))
+    assert len(list(dd.keys(deep=True, return_address=True))) == depth
+    assert len(list(dd.items(deep=True, return_address=True))) == depth
+
+
+def test_circular_layout():
+    d = {"a": {"b": 1}, "c": 2}
+    d["a"]["d"] = d
+    for parser in (dictparser, parseitems, parsedicts, parsedicts_addr):
+        with pytest.raises(ValueError, match="Circular reference"):
+            list(parser(d))
+    with pytest.raises(ValueError, match="Circular reference"):
+        list(DeepDict(a=1, b=d).values(deep=True))
+
+    # containers that appear more than once are not circular
+    shared = {"x": 1}
+    d = {"a": shared, "b": {"c": shared}}
+    assert list(dictparser(d)) == [(["a", "x"], 1), (["b", "c", "x"], 1)]
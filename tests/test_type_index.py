@@ -0,0 +1,143 @@
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict, Address, LeafTypeIndex
+
+
+def _scan(dd: DeepDict, vtype) -> list:
+    return sorted(
+        (tuple(addr), repr(v))
+        for addr, v in dd.items(deep=True, return_address=True)
+        if isinstance(v, vtype)
+    )
+
+
+def _check(dd: DeepDict, vtype) -> None:
+    index = dd.type_index
+    found = sorted((addr, repr(v)) for addr, v in index.find(vtype))
+    assert found == _scan(dd, vtype)
+
+
+def test_type_index_is_opt_in():
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}},
+            "b": 3.0,
+            "c": {"cc": {"ccc": True}, "cd": [1, 2]},
+        }
+    )
+    assert dd.type_index is None
+    index = dd.enable_type_index()
+    assert isinstance(index, LeafTypeIndex)
+    assert dd.enable_type_index() is index
+    assert index.root is dd
+    assert set(index.types()) == {int, float, str, bool, list}
+    dd.disable_type_index()
+    assert dd.type_index is None
+    dd.disable_type_index()
+
+
+def test_filtered_iteration():
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}},
+            "b": 3.0,
+            "c": {"cc": {"ccc": True}, "cd": [1, 2]},
+        }
+    )
+    expected_values = list(dd.values(deep=True, vtype=float))
+    expected_items = list(dd.items(deep=True, vtype=int))
+    dd.enable_type_index()
+    assert list(dd.values(deep=True, vtype=float)) == expected_values
+    assert list(dd.items(deep=True, vtype=int)) == expected_items
+    assert list(dd.items(deep=True, return_address=True, vtype=(str, list))) == [
+        (["a", "ab", "abb"], "x"),
+        (["c", "cd"], [1, 2]),
+    ]
+    assert list(
+        dd.items(deep=True, return_address=True, vtype=bool, address_type=tuple)
+    ) == [(("c", "cc", "ccc"), True)]
+    addr, _ = next(
+        dd.items(deep=True, return_address=True, vtype=str, address_type=Address)
+    )
+    assert addr == ("a", "ab", "abb")
+    assert list(dd.values(vtype=float)) == [3.0]
+
+
+def test_type_index_follows_changes():
+    dd = DeepDict.wrap(
+        {
+            "a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}},
+            "b": 3.0,
+            "c": {"cc": {"ccc": True}, "cd": [1, 2]},
+        }
+    )
+    dd.enable_type_index()
+    dd["a", "ac"] = 4.0
+    dd["d"] = DeepDict.wrap({"x": {"y": 5.0, "z": 6}})
+    del dd["a", "ab"]
+    dd["b"] = "y"
+    dd["d", "x"].pop("z")
+    for vtype in (int, float, str, bool, list, (int, str)):
+        _check(dd, vtype)
+    # the leaves come in depth-first order
+    assert list(dd.values(deep=True, vtype=float)) == [4.0, 5.0]
+    assert list(dd.values(deep=True, vtype=(int, str))) == [1, True, "y"]
+
+
+def test_type_index_with_plain_dicts():
+    dd = DeepDict.wrap({"a": {"aa": 1, "ab": {"aba": 2.0, "abb": "x"}}, "b": 3.0})
+    index = dd.enable_type_index()
+    dd["e"] = {"f": 7.0}
+    assert not index.complete
+    # the layout is scanned instead
+    assert list(dd.values(deep=True, vtype=float)) == [2.0, 3.0, 7.0]
+    del dd["e"]
+    assert index.complete
+
+
+def test_type_index_with_lazy_layouts():
+    dd = DeepDict.wrap(
+        {"a": {"aa": 1, "ab": {"aba": 2.0}}, "b": 3.0, "c": {"cc": {"ccc": True}}},
+        lazy=True,
+    )
+    index = dd.enable_type_index()
+    assert index.complete
+    _check(dd, float)
+
+
+def test_type_index_on_roots_only():
+    dd = DeepDict.wrap({"a": {"aa": 1}, "b": 3.0})
+    with pytest.raises(ValueError):
+        dd["a"].enable_type_index()
+
+    other = DeepDict.wrap({"x": 1.0})
+    other.enable_type_index()
+    dd["o"] = other
+    assert other.type_index is None
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_type_index_keeps_the_depth_first_order(lazy):
+    d = {"a": {"b": 1.0, "c": 2}, "d": 3.0}
+    indexed, plain = DeepDict.wrap(d, lazy=lazy), DeepDict.wrap(d, lazy=lazy)
+    indexed.enable_type_index()
+
+    def edit(dd: DeepDict) -> None:
+        dd["a", "b"] = 5.0
+        dd["e", "f"] = 6
+        dd["a", "g", "h"] = 7.0
+        del dd["d"]
+        dd["d"] = 8.0
+        dd["a", "c"] = 9.0
+
+    for step in (lambda dd: None, edit):
+        step(indexed)
+        step(plain)
+        for vtype in (float, int, (int, float)):
+            for kwargs in ({}, {"return_address": True, "address_type": tuple}):
+                kwargs = dict(deep=True, vtype=vtype, **kwargs)
+                assert list(indexed.items(**kwargs)) == list(plain.items(**kwargs))
+                assert list(indexed.values(**kwargs)) == list(plain.values(**kwargs))
+        assert indexed.gather()[1] == plain.gather()[1]
+
+    assert list(indexed.values(deep=True, vtype=float)) == [5.0, 7.0, 9.0, 8.0]
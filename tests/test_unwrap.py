@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from sigmaepsilon.deepdict import DeepDict
+
+
+def test_to_dict_roundtrip():
+    d = {"a": {"aa": [1, 2], "ab": {}}, "b": 2, "c": {"cc": {"ccc": 3}, "cd": 4}}
+    result = DeepDict.wrap(d).to_dict()
+    assert result == d
+    assert type(result) is dict
+    assert type(result["c"]["cc"]) is dict
+    assert list(result["c"].keys()) == ["cc", "cd"]
+    assert json.loads(json.dumps(result)) == d
+
+
+def test_unwrap_is_to_dict():
+    dd = DeepDict.wrap({"a": {"aa": [1, 2], "ab": {}}, "b": 2})
+    assert dd.unwrap() == dd.to_dict()
+
+
+def test_shared_and_copied_leaves():
+    d = {"a": {"aa": [1, 2]}, "b": 2}
+    dd = DeepDict.wrap(d)
+    assert dd.to_dict()["a"]["aa"] is d["a"]["aa"]
+    assert dd.to_dict(copy=True)["a"]["aa"] is not d["a"]["aa"]
+    assert dd.to_dict(deepcopy=True)["a"]["aa"] == d["a"]["aa"]
+
+    with pytest.raises(ValueError):
+        dd.to_dict(copy=True, deepcopy=True)
+
+
+def test_deepcopy_keeps_shared_references():
+    shared = [1, 2]
+    dd = DeepDict()
+    dd["a", "x"] = shared
+    dd["b", "y"] = shared
+    result = dd.to_dict(deepcopy=True)
+    assert result["a"]["x"] is not shared
+    assert result["a"]["x"] is result["b"]["y"]
+
+
+def test_drop_empty():
+    d = {
+        "a": {"aa": [1, 2], "ab": {}},
+        "b": 2,
+        "c": {"cc": {"ccc": 3}, "cd": {"cdd": {}}},
+    }
+    result = DeepDict.wrap(d).to_dict(drop_empty=True)
+    assert result == {"a": {"aa": [1, 2]}, "b": 2, "c": {"cc": {"ccc": 3}}}
+    assert DeepDict().to_dict(drop_empty=True) == {}
+
+
+def test_to_dict_with_tables():
+    pytest.importorskip("numpy")
+    from sigmaepsilon.deepdict import ColumnarTable
+
+    records = {0: {"E": 210.0, "id": 1}, 1: {"E": 70.0, "id": 2}}
+    dd = DeepDict.wrap({"model": {"name": "frame"}})
+    dd["model", "elements"] = ColumnarTable.from_records(records)
+    dd["model", "empty"] = ColumnarTable({"E": []})
+    result = dd.to_dict()
+    assert result == {"model": {"name": "frame", "elements": records, "empty": {}}}
+    assert type(result["model"]["elements"][0]) is dict
+    assert type(result["model"]["elements"][0]["id"]) is int
+    assert dd.to_dict(deepcopy=True) == result
+    assert dd.to_dict(drop_empty=True) == {
+        "model": {"name": "frame", "elements": records}
+    }
+    assert dd.snapshot().to_dict() == result
+
+
+def test_to_dict_iter_is_bottom_up():
+    dd = DeepDict.wrap(
+        {"a": {"aa": [1, 2], "ab": {}}, "b": 2, "c": {"cc": {}, "cd": {"cdd": {}}}}
+    )
+    items = list(dd.to_dict_iter())
+    addresses = [address for address, _ in items]
+    assert addresses == [
+        ("a", "ab"),
+        ("a",),
+        ("c", "cc"),
+        ("c", "cd", "cdd"),
+        ("c", "cd"),
+        ("c",),
+        (),
+    ]
+    for address, d in items:
+        assert d == dd[address].to_dict() if address else dd.to_dict()
+
+
+def test_to_dict_of_a_lazy_layout():
+    d = {"a": {"aa": [1, 2], "ab": {}}, "b": 2, "c": {"cc": {"ccc": 3}}}
+    dd = DeepDict.wrap(d, lazy=True)
+    result = dd.to_dict()
+    assert result == d
+    assert result["c"] is not d["c"]
+    assert dd._lazy is not None
+
+
+def test_to_dict_of_a_deep_layout():
+    depth = 5000
+    dd = DeepDict()
+    dd[tuple(range(depth))] = 1
+    result = dd.to_dict()
+    for i in range(depth):
+        result = result[i]
+    assert result == 1
@@ -21,6 +21,59 @@ class TestWrap(SigmaEpsilonTestCase):
 
         self.assertFailsProperly(ValueError, DeepDict.wrap, d, copy=True, deepcopy=True)
 
+    def test_wrap_layout(self):
+        d = {"a": {"aa": [1]}, "b": 2, "c": {"cc": {"ccc": 3}, "cd": {}}}
+        dd = DeepDict.wrap(d)
+        self.assertEqual(dd, d)
+        self.assertEqual(list(dd.keys()), ["a", "b", "c"])
+        self.assertEqual(list(dd["c"].keys()), ["cc", "cd"])
+        self.assertIsInstance(dd["c", "cd"], DeepDict)
+        self.assertIs(dd["c", "cc"].parent, dd["c"])
+        self.assertEqual(dd["c", "cc"].key, "cc")
+        self.assertEqual(dd["c", "cc"].address, ["c", "cc"])
+        self.assertIs(dd["c", "cc"].root, dd)
+        self.assertFalse(dd["c", "cc"].locked)
+        self.assertIs(dd["a", "aa"], d["a"]["aa"])
+
+        self.assertIsNot(DeepDict.wrap(d, copy=True)["a", "aa"], d["a"]["aa"])
+        self.assertIsNot(DeepDict.wrap(d, deepcopy=True)["a", "aa"], d["a"]["aa"])
+
+    def test_wrap_tuple_keys(self):
+        dd = DeepDict.wrap({"a": {(1, 2): {"b": 1}, (3, 4): 2}})
+        self.assertEqual(dd["a", 1, 2, "b"], 1)
+        self.assertEqual(dd["a", 3, 4], 2)
+
+    def test_wrap_calls_overridden_hooks(self):
+        calls = []
+
+        class MyDeepDict(DeepDict):
+            def __before_join_parent__(self, parent, key=None) -> None:
+                calls.append(("before", key))
+                return super().__before_join_parent__(parent, key)
+
+            def __after_join_parent__(self, parent, key=None) -> None:
+                calls.append(("after", key))
+                return super().__after_join_parent__(parent, key)
+
+        dd = MyDeepDict.wrap({"a": {"b": {"c": 1}}})
+        self.assertEqual(
+            calls, [("before", "a"), ("after", "a"), ("before", "b"), ("after", "b")]
+        )
+        self.assertIsInstance(dd["a", "b"], MyDeepDict)
+        self.assertIs(dd["a", "b"].parent, dd["a"])
+        self.assertEqual(dd["a", "b"].address, ["a", "b"])
+
+    def test_wrap_deep_layout(self):
+        depth = 5000
+        d = node = {}
+        for i in range(depth):
+            node[i] = {}
+            node = node[i]
+        node["leaf"] = 1
+        dd = DeepDict.wrap(d)
+        self.assertEqual(dd[tuple(range(depth)) + ("leaf",)], 1)
+        self.assertEqual(dd[tuple(range(depth))].depth, depth)
+
 
 if __name__ == "__main__":
     unittest.main()